@@ -11,132 +11,310 @@ Usage:
 
     # Get cached access token (non-interactive)
     token = get_access_token(account_config, "personal")
+
+Access tokens are also kept in an in-process cache until shortly before
+they expire, so repeated calls within one CLI run are cheap.
 """
 
+import functools
+import hashlib
+import importlib
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
 from courriel.config.schema import AccountConfig
 
-from .ms365 import (
-    authenticate_device_flow as _ms365_auth,
-    get_access_token as _ms365_token,
-    is_authenticated as _ms365_is_auth,
-)
+from .skew import REFRESH_SKEW_SECONDS
 
-from .gmail import (
-    authenticate_loopback_flow as _gmail_auth,
-    get_access_token as _gmail_token,
-    is_authenticated as _gmail_is_auth,
-)
+# Provider modules (.ms365, .gmail) are imported on first use by
+# _provider_module(), only for the provider actually in use. msal and google-auth each pull in
+# dozens of modules (cryptography, oauthlib, httplib2, ...), and importing
+# both up front slowed down every CLI command, including --help.
 
 __all__ = [
     "authenticate",
     "get_access_token",
     "is_authenticated",
+    "invalidate",
 ]
 
+# Process-local access token cache.
+# Maps (provider, *provider fields, account_name) to (access_token, expires_at),
+# e.g. ("ms365", client_id, tenant_id, account_name). Client secrets appear
+# only as a hash.
+# expires_at is a Unix timestamp.
+# Without it, every get_access_token() call re-reads the on-disk token file
+# and rebuilds the MSAL / google-auth objects, even though the token is
+# usually valid for the rest of the CLI invocation.
+_TOKEN_CACHE: dict[tuple[str, ...], tuple[str, float]] = {}
+
+# Successful authenticate() results, keyed like _TOKEN_CACHE. authenticate()
+# returns these (with the current token) while the cached token is fresh,
+# so an already-authenticated account never touches MSAL, google-auth or
+# the token file. Results keep provider claims such as the username.
+_AUTH_RESULTS: dict[tuple[str, ...], dict] = {}
+
+# One lock per token cache key, so concurrent callers with the same stale
+# token trigger a single refresh instead of racing each other. Providers
+# that rotate refresh tokens revoke the old one on refresh, so a second
+# concurrent refresh could fail or invalidate the first one's result.
+# _LOCKS_LOCK guards creation of the per-key locks themselves.
+_REFRESH_LOCKS: dict[tuple[str, ...], threading.Lock] = {}
+_LOCKS_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=8)
+def _hash_secret(secret: str) -> str:
+    """Hash a client secret so it can be used in a cache key.
+
+    The cache key only needs to distinguish secrets, not recover them,
+    so we never keep the plaintext secret around in the cache. Memoized
+    because every get_access_token() call builds a key.
+    """
+    return hashlib.blake2b(secret.encode("utf-8"), digest_size=16).hexdigest()
 
-def authenticate(account: AccountConfig, account_name: str) -> dict:
-    """Authenticate with the configured email provider.
 
-    For Microsoft 365, uses Device Code Flow - displays a code and URL
-    for the user to complete authentication in their browser.
+def _cached_token(key: tuple[str, ...]) -> str | None:
+    """Return the cached token for key if it is not about to expire."""
+    entry = _TOKEN_CACHE.get(key)
+    if entry is None:
+        return None
 
-    For Gmail, uses OAuth 2.0 loopback flow - opens browser automatically
-    and captures the authorization code via local HTTP server.
+    token, expires_at = entry
+    # Tokens within the refresh skew are stale: go back to the provider,
+    # which refreshes them before they can expire mid-request
+    if expires_at - time.time() > REFRESH_SKEW_SECONDS:
+        return token
+
+    return None
+
+
+def _store_token(
+    key: tuple[str, ...], token_and_expiry: tuple[str, float] | None
+) -> str | None:
+    """Cache a (token, expires_at) pair from a provider and return the token."""
+    if token_and_expiry is None:
+        return None
+
+    _TOKEN_CACHE[key] = token_and_expiry
+    return token_and_expiry[0]
+
+
+def _get_or_fetch_token(
+    key: tuple[str, ...],
+    fetch: Callable[[], tuple[str, float] | None],
+) -> str | None:
+    """Return a cached token, or fetch one while holding the key's lock.
+
+    Uses double-checked locking: the cache is checked once without the
+    lock (fast path), then again after acquiring it, because another
+    thread may have refreshed the token while we were waiting.
 
     Args:
-        account: Account configuration from config.toml.
-        account_name: Account key from config (e.g. "personal", "work").
+        key: Token cache key for the account.
+        fetch: Provider call returning (token, expires_at) or None.
 
     Returns:
-        Authentication result dict:
-        - On success: contains 'access_token', plus provider-specific claims
-        - On failure: contains 'error' and 'error_description'
+        Access token string, or None if not authenticated.
     """
-    provider = account.get("provider", "ms365")
+    token = _cached_token(key)
+    if token is not None:
+        return token
 
-    if provider == "ms365":
-        client_id = account.get("client_id")
-        tenant_id = account.get("tenant_id")
+    with _LOCKS_LOCK:
+        lock = _REFRESH_LOCKS.setdefault(key, threading.Lock())
 
-        if not client_id or not tenant_id:
-            return {
-                "error": "missing_config",
-                "error_description": "MS365 account must have 'client_id' and 'tenant_id' configured.",
-            }
+    with lock:
+        token = _cached_token(key)
+        if token is not None:
+            return token
 
-        return _ms365_auth(client_id, tenant_id, account_name)
+        return _store_token(key, fetch())
 
-    elif provider == "gmail":
-        client_id = account.get("client_id")
 
-        if not client_id:
-            return {
-                "error": "missing_config",
-                "error_description": "Gmail account must have 'client_id' configured.",
-            }
+def invalidate(account_name: str) -> None:
+    """Drop any in-memory tokens cached for an account.
 
-        # Get client_secret from environment or config
-        from .gmail import get_client_secret
+    Call this after logging out or replacing credentials, so the next
+    get_access_token() goes back to the provider.
 
-        client_secret = get_client_secret(account)
+    Args:
+        account_name: Account key from config (e.g. "personal", "work").
+    """
+    for key in [k for k in _TOKEN_CACHE if k[-1] == account_name]:
+        del _TOKEN_CACHE[key]
+    for key in [k for k in _AUTH_RESULTS if k[-1] == account_name]:
+        del _AUTH_RESULTS[key]
 
-        if not client_secret:
-            return {
+
+@dataclass(frozen=True)
+class _Provider:
+    """How to call one provider module.
+
+    Every provider module exposes the same three functions, each taking the
+    provider's positional arguments followed by account_name:
+    get_access_token_with_expiry(), is_authenticated() and the interactive
+    flow named by auth_flow.
+    """
+
+    module: str  # Submodule of courriel.auth, imported on first use
+    label: str  # Display name for error messages
+    auth_flow: str  # Name of the interactive authentication function
+    required: tuple[str, ...]  # Account fields passed positionally, in order
+    secret_env: str | None = None  # Set if a client secret is also required
+
+
+# Adding a provider means adding one entry here plus its module.
+_PROVIDERS: dict[str, _Provider] = {
+    "ms365": _Provider(
+        module="ms365",
+        label="MS365",
+        auth_flow="authenticate_device_flow",
+        required=("client_id", "tenant_id"),
+    ),
+    "gmail": _Provider(
+        module="gmail",
+        label="Gmail",
+        auth_flow="authenticate_loopback_flow",
+        required=("client_id",),
+        secret_env="COURRIEL_GMAIL_CLIENT_SECRET",
+    ),
+}
+
+
+def _provider_module(provider: _Provider):
+    """Import and return the provider's module (cached by Python after first use)."""
+    return importlib.import_module(f".{provider.module}", __name__)
+
+
+def _resolve(
+    account: AccountConfig, account_name: str
+) -> tuple[_Provider | None, list[str] | None, tuple[str, ...] | None, dict | None]:
+    """Look up the account's provider and collect its call arguments.
+
+    Args:
+        account: Account configuration from config.toml.
+        account_name: Account key from config (e.g. "personal", "work").
+
+    Returns:
+        (provider, args, cache_key, error). On success error is None and
+        args are the positional arguments for the provider functions
+        (without account_name). Otherwise error is an authenticate()-style
+        error dict and the other fields may be None.
+    """
+    # Each account field is read exactly once per call
+    get = account.get
+    name = get("provider", "ms365")
+    provider = _PROVIDERS.get(name)
+    if provider is None:
+        return (
+            None,
+            None,
+            None,
+            {
+                "error": "unsupported_provider",
+                "error_description": f"Provider '{name}' is not supported. Use 'ms365' or 'gmail'.",
+            },
+        )
+
+    args = [get(field) for field in provider.required]
+    if not all(args):
+        fields = " and ".join(f"'{field}'" for field in provider.required)
+        return (
+            provider,
+            None,
+            None,
+            {
                 "error": "missing_config",
-                "error_description": "Gmail client_secret not found. Set COURRIEL_GMAIL_CLIENT_SECRET environment variable or add 'client_secret' to config.",
-            }
+                "error_description": f"{provider.label} account must have {fields} configured.",
+            },
+        )
 
-        return _gmail_auth(client_id, client_secret, account_name)
+    key_parts = list(args)
+    if provider.secret_env:
+        # Get client_secret from environment or config
+        client_secret = _provider_module(provider).get_client_secret(account)
+        if not client_secret:
+            return (
+                provider,
+                None,
+                None,
+                {
+                    "error": "missing_config",
+                    "error_description": f"{provider.label} client_secret not found. Set {provider.secret_env} environment variable or add 'client_secret' to config.",
+                },
+            )
+        args.append(client_secret)
+        key_parts.append(_hash_secret(client_secret))
+
+    key = (name, *key_parts, account_name)
+    return provider, args, key, None
 
-    else:
-        return {
-            "error": "unsupported_provider",
-            "error_description": f"Provider '{provider}' is not supported. Use 'ms365' or 'gmail'.",
-        }
 
+def authenticate(account: AccountConfig, account_name: str) -> dict:
+    """Authenticate with the configured email provider.
 
-def get_access_token(account: AccountConfig, account_name: str) -> str | None:
-    """Get a valid access token for the account.
+    For Microsoft 365, uses Device Code Flow - displays a code and URL
+    for the user to complete authentication in their browser.
 
-    Uses cached credentials and refreshes if needed.
-    Does not prompt for login - use authenticate() first.
+    For Gmail, uses OAuth 2.0 loopback flow - opens browser automatically
+    and captures the authorization code via local HTTP server.
 
     Args:
         account: Account configuration from config.toml.
         account_name: Account key from config (e.g. "personal", "work").
 
     Returns:
-        Access token string, or None if not authenticated.
+        Authentication result dict:
+        - On success: contains 'access_token', plus provider-specific claims
+        - On failure: contains 'error' and 'error_description'
     """
-    provider = account.get("provider", "ms365")
-
-    if provider == "ms365":
-        client_id = account.get("client_id")
-        tenant_id = account.get("tenant_id")
+    provider, args, key, error = _resolve(account, account_name)
+    if error:
+        return error
 
-        if not client_id or not tenant_id:
-            return None
+    # Already authenticated in this process with a fresh token: skip the
+    # provider entirely
+    token = _cached_token(key)
+    if token is not None and key in _AUTH_RESULTS:
+        return {**_AUTH_RESULTS[key], "access_token": token}
 
-        return _ms365_token(client_id, tenant_id, account_name)
+    flow = getattr(_provider_module(provider), provider.auth_flow)
+    result = flow(*args, account_name)
 
-    elif provider == "gmail":
-        client_id = account.get("client_id")
+    if "access_token" in result:
+        _AUTH_RESULTS[key] = result
+        expires_in = result.get("expires_in")
+        if expires_in:
+            _store_token(key, (result["access_token"], time.time() + expires_in))
 
-        if not client_id:
-            return None
+    return result
 
-        from .gmail import get_client_secret
 
-        client_secret = get_client_secret(account)
+def get_access_token(account: AccountConfig, account_name: str) -> str | None:
+    """Get a valid access token for the account.
 
-        if not client_secret:
-            return None
+    Uses cached credentials and refreshes if needed.
+    Does not prompt for login - use authenticate() first.
 
-        return _gmail_token(client_id, client_secret, account_name)
+    Args:
+        account: Account configuration from config.toml.
+        account_name: Account key from config (e.g. "personal", "work").
 
-    else:
+    Returns:
+        Access token string, or None if not authenticated.
+    """
+    provider, args, key, error = _resolve(account, account_name)
+    if error:
         return None
 
+    module = _provider_module(provider)
+    return _get_or_fetch_token(
+        key, lambda: module.get_access_token_with_expiry(*args, account_name)
+    )
+
 
 def is_authenticated(account: AccountConfig, account_name: str) -> bool:
     """Check if the account has valid cached credentials.
@@ -148,31 +326,12 @@ def is_authenticated(account: AccountConfig, account_name: str) -> bool:
     Returns:
         True if valid credentials exist, False otherwise.
     """
-    provider = account.get("provider", "ms365")
-
-    if provider == "ms365":
-        client_id = account.get("client_id")
-        tenant_id = account.get("tenant_id")
-
-        if not client_id or not tenant_id:
-            return False
-
-        return _ms365_is_auth(client_id, tenant_id, account_name)
-
-    elif provider == "gmail":
-        client_id = account.get("client_id")
-
-        if not client_id:
-            return False
-
-        from .gmail import get_client_secret
-
-        client_secret = get_client_secret(account)
-
-        if not client_secret:
-            return False
+    provider, args, key, error = _resolve(account, account_name)
+    if error:
+        return False
 
-        return _gmail_is_auth(client_id, client_secret, account_name)
+    # A fresh in-memory token already proves we're authenticated
+    if _cached_token(key):
+        return True
 
-    else:
-        return False
+    return _provider_module(provider).is_authenticated(*args, account_name)
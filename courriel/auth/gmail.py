@@ -9,14 +9,24 @@ Token caching is handled by google.oauth2.credentials, which we persist
 to ~/.config/courriel/credentials/gmail_token_<account>.json
 """
 
-import json
+import functools
 import os
+import threading
+import time
+from datetime import datetime, timezone
 
+import requests
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 
-from courriel.config.paths import gmail_token_file, ensure_credentials_dir
+from courriel import fastjson
+from courriel.auth.skew import REFRESH_SKEW_SECONDS
+from courriel.config.paths import (
+    ensure_credentials_dir,
+    gmail_token_file,
+    write_private_file,
+)
 
 # Gmail API scopes required for email operations.
 # - gmail.readonly: Read emails (for sync and search)
@@ -32,32 +42,66 @@ SCOPES = [
 # Using env var is preferred over storing in config.toml for security.
 CLIENT_SECRET_ENV = "COURRIEL_GMAIL_CLIENT_SECRET"
 
+# Shared HTTP transport for token refreshes.
+# A bare Request() creates a new requests.Session each time, so every
+# refresh paid a fresh TCP + TLS handshake to Google's token endpoint.
+# Reusing one session keeps the connection alive across refreshes.
+# The adapter (which owns the connection pool) is also mounted on the
+# OAuth session of interactive flows, see _build_flow().
+_HTTP_ADAPTER = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount("https://", _HTTP_ADAPTER)
+_REFRESH_REQUEST = Request(session=_HTTP_SESSION)
+
+# In-memory cache of loaded credentials, keyed by token file path.
+# Values are (file mtime_ns, Credentials). The token file is only re-parsed
+# when its mtime changes, e.g. after another courriel process refreshed it.
+# The lock keeps the cache consistent if API calls run in worker threads.
+_CREDS_CACHE: dict[str, tuple[int, Credentials]] = {}
+_CREDS_CACHE_LOCK = threading.Lock()
+
 
 def _load_token(account_name: str) -> Credentials | None:
     """Load credentials from disk for a specific account.
 
     Returns None if the token file doesn't exist or is invalid.
     Google's Credentials class handles token refresh automatically.
+    Repeated calls return the same in-memory Credentials object until
+    the token file changes on disk.
 
     Args:
         account_name: Account key from config (e.g. "personal").
     """
     token_path = gmail_token_file(account_name)
-    if not token_path.exists():
+    try:
+        mtime = token_path.stat().st_mtime_ns
+    except FileNotFoundError:
         return None
 
+    key = str(token_path)
+    with _CREDS_CACHE_LOCK:
+        entry = _CREDS_CACHE.get(key)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
     try:
-        creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
-        return creds
+        info = fastjson.loads(token_path.read_bytes())
+        creds = Credentials.from_authorized_user_info(info, SCOPES)
     except Exception:
         # Invalid token file - will re-authenticate
         return None
 
+    with _CREDS_CACHE_LOCK:
+        _CREDS_CACHE[key] = (mtime, creds)
+
+    return creds
+
 
 def _save_token(creds: Credentials, account_name: str) -> None:
     """Persist credentials to disk for a specific account.
 
     Sets file permissions to 600 (owner read/write only) to protect tokens.
+    The write is atomic, so concurrent refreshes can't corrupt the file.
 
     Args:
         creds: Google OAuth credentials to persist.
@@ -77,9 +121,28 @@ def _save_token(creds: Credentials, account_name: str) -> None:
         "scopes": creds.scopes,
     }
 
-    token_path.write_text(json.dumps(token_data, indent=2))
-    # Restrictive permissions: only owner can read/write
-    token_path.chmod(0o600)
+    # Compact JSON, written atomically with owner-only permissions
+    write_private_file(token_path, fastjson.dumps(token_data))
+
+    # Keep the in-memory cache in sync so the next _load_token() doesn't
+    # re-parse the file we just wrote
+    with _CREDS_CACHE_LOCK:
+        _CREDS_CACHE[str(token_path)] = (token_path.stat().st_mtime_ns, creds)
+
+
+def _expires_soon(creds: Credentials) -> bool:
+    """Check whether credentials are expired or within the refresh skew.
+
+    Refreshing a little early means a token never expires in the middle
+    of an API call. Falls back to creds.expired when Google didn't
+    report an expiry time.
+    """
+    if not creds.expiry:
+        return creds.expired
+
+    # google-auth stores expiry as a naive datetime in UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return (creds.expiry - now).total_seconds() < REFRESH_SKEW_SECONDS
 
 
 def get_client_secret(account_config: dict) -> str | None:
@@ -94,9 +157,22 @@ def get_client_secret(account_config: dict) -> str | None:
     Returns:
         Client secret string, or None if not configured.
     """
-    return os.environ.get(CLIENT_SECRET_ENV) or account_config.get("client_secret")
+    return _resolve_client_secret(
+        account_config.get("client_id", ""), account_config.get("client_secret")
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_client_secret(client_id: str, inline_secret: str | None) -> str | None:
+    """Resolve the client secret once per (client_id, inline secret) pair.
+
+    The environment is read on first use only; call
+    _resolve_client_secret.cache_clear() after changing it in-process.
+    """
+    return os.environ.get(CLIENT_SECRET_ENV) or inline_secret
 
 
+@functools.lru_cache(maxsize=4)
 def _build_client_config(client_id: str, client_secret: str) -> dict:
     """Build OAuth client configuration dict.
 
@@ -104,6 +180,9 @@ def _build_client_config(client_id: str, client_secret: str) -> dict:
     normally comes from downloading credentials from Cloud Console.
     We construct it programmatically from our config values.
 
+    The result is cached and shared between callers, so it must not be
+    modified.
+
     Args:
         client_id: Google Cloud OAuth client ID.
         client_secret: Google Cloud OAuth client secret.
@@ -122,6 +201,43 @@ def _build_client_config(client_id: str, client_secret: str) -> dict:
     }
 
 
+def _build_flow(client_id: str, client_secret: str) -> InstalledAppFlow:
+    """Build an InstalledAppFlow that shares our HTTP connection pool.
+
+    A flow holds per-attempt state (PKCE verifier, redirect URI), so we
+    build a new one for each attempt; only the transport is shared.
+
+    Args:
+        client_id: Google Cloud OAuth client ID.
+        client_secret: Google Cloud OAuth client secret.
+    """
+    flow = InstalledAppFlow.from_client_config(
+        _build_client_config(client_id, client_secret),
+        scopes=SCOPES,
+    )
+    # The token exchange then reuses connections opened by token refreshes
+    flow.oauth2session.mount("https://", _HTTP_ADAPTER)
+    return flow
+
+
+def _auth_result(creds: Credentials) -> dict:
+    """Build the authenticate() success dict for a set of credentials.
+
+    Includes 'expires_in' (seconds, like MSAL results) when Google reported
+    an expiry, so courriel.auth can keep the token in its in-memory cache.
+    """
+    result = {
+        "access_token": creds.token,
+        "refresh_token": creds.refresh_token,
+        "email": getattr(creds, "_id_token_jwt", {}).get("email", "Unknown"),
+    }
+    if creds.expiry:
+        result["expires_in"] = int(
+            creds.expiry.replace(tzinfo=timezone.utc).timestamp() - time.time()
+        )
+    return result
+
+
 def authenticate_loopback_flow(
     client_id: str,
     client_secret: str,
@@ -150,33 +266,21 @@ def authenticate_loopback_flow(
 
     if creds and creds.valid:
         # Token is still valid, return it
-        return {
-            "access_token": creds.token,
-            "refresh_token": creds.refresh_token,
-            "email": getattr(creds, "_id_token_jwt", {}).get("email", "Unknown"),
-        }
+        return _auth_result(creds)
 
     if creds and creds.expired and creds.refresh_token:
         # Token expired but we can refresh it
         try:
-            creds.refresh(Request())
+            creds.refresh(_REFRESH_REQUEST)
             _save_token(creds, account_name)
-            return {
-                "access_token": creds.token,
-                "refresh_token": creds.refresh_token,
-                "email": getattr(creds, "_id_token_jwt", {}).get("email", "Unknown"),
-            }
+            return _auth_result(creds)
         except Exception:
             # Refresh failed, fall through to re-authenticate
             pass
 
     # No valid token, start OAuth flow
     try:
-        client_config = _build_client_config(client_id, client_secret)
-        flow = InstalledAppFlow.from_client_config(
-            client_config,
-            scopes=SCOPES,
-        )
+        flow = _build_flow(client_id, client_secret)
 
         # Manual console flow for headless environments (no browser available).
         # Prints the auth URL for the user to open on another device, then
@@ -195,11 +299,7 @@ def authenticate_loopback_flow(
         # Save the credentials for future use
         _save_token(creds, account_name)
 
-        return {
-            "access_token": creds.token,
-            "refresh_token": creds.refresh_token,
-            "email": getattr(creds, "_id_token_jwt", {}).get("email", "Unknown"),
-        }
+        return _auth_result(creds)
 
     except Exception as e:
         return {
@@ -208,13 +308,14 @@ def authenticate_loopback_flow(
         }
 
 
-def get_access_token(
+def get_access_token_with_expiry(
     client_id: str, client_secret: str, account_name: str
-) -> str | None:
-    """Get a valid access token using cached credentials.
+) -> tuple[str, float] | None:
+    """Get a valid access token and its expiry time using cached credentials.
 
     Silently refreshes the token if expired. Does not prompt for login.
-    Use authenticate_loopback_flow() first to establish credentials.
+    The expiry lets callers (see courriel.auth) keep the token in memory
+    and skip reading the token file until it is about to expire.
 
     Args:
         client_id: Google Cloud OAuth client ID.
@@ -222,32 +323,61 @@ def get_access_token(
         account_name: Account key from config (e.g. "personal").
 
     Returns:
-        Access token string, or None if not authenticated.
+        Tuple of (access token, expiry as Unix timestamp), or None if not
+        authenticated. The expiry is 0.0 when Google didn't report one,
+        which callers should treat as "don't cache".
     """
     creds = _load_token(account_name)
 
     if not creds:
         return None
 
-    # Refresh if expired
-    if creds.expired and creds.refresh_token:
+    # Refresh if expired or about to expire
+    if _expires_soon(creds) and creds.refresh_token:
         try:
-            creds.refresh(Request())
+            creds.refresh(_REFRESH_REQUEST)
             _save_token(creds, account_name)
         except Exception:
             # Refresh failed
             return None
 
-    if creds.valid:
-        return creds.token
+    if not creds.valid:
+        return None
+
+    # google-auth stores expiry as a naive datetime in UTC
+    expires_at = 0.0
+    if creds.expiry:
+        expires_at = creds.expiry.replace(tzinfo=timezone.utc).timestamp()
 
-    return None
+    return creds.token, expires_at
+
+
+def get_access_token(
+    client_id: str, client_secret: str, account_name: str
+) -> str | None:
+    """Get a valid access token using cached credentials.
+
+    Silently refreshes the token if expired. Does not prompt for login.
+    Use authenticate_loopback_flow() first to establish credentials.
+
+    Args:
+        client_id: Google Cloud OAuth client ID.
+        client_secret: Google Cloud OAuth client secret (needed for refresh).
+        account_name: Account key from config (e.g. "personal").
+
+    Returns:
+        Access token string, or None if not authenticated.
+    """
+    token = get_access_token_with_expiry(client_id, client_secret, account_name)
+    return token[0] if token else None
 
 
 def is_authenticated(client_id: str, client_secret: str, account_name: str) -> bool:
     """Check if we have valid cached credentials.
 
-    Attempts to refresh if expired, so this may make a network request.
+    Does not attempt to refresh, so this never makes a network request.
+    A stored refresh token is enough: the access token's own expiry doesn't
+    matter, since get_access_token() refreshes it on demand.
 
     Args:
         client_id: Google Cloud OAuth client ID.
@@ -257,4 +387,5 @@ def is_authenticated(client_id: str, client_secret: str, account_name: str) -> b
     Returns:
         True if valid cached credentials exist.
     """
-    return get_access_token(client_id, client_secret, account_name) is not None
+    creds = _load_token(account_name)
+    return creds is not None and creds.refresh_token is not None
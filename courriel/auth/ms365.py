@@ -8,12 +8,21 @@ Token caching is handled by MSAL's SerializableTokenCache, which we
 persist to ~/.config/courriel/credentials/ms365_cache_<account>.json
 """
 
+import functools
 import os
+import re
 import sys
+import time
 
 import msal
 
-from courriel.config.paths import ms365_cache_file, ensure_credentials_dir
+from courriel import fastjson
+from courriel.auth.skew import REFRESH_SKEW_SECONDS
+from courriel.config.paths import (
+    ensure_credentials_dir,
+    ms365_cache_file,
+    write_private_file,
+)
 
 # Microsoft Graph scopes required for email operations.
 # - User.Read: Get user profile info (for displaying logged-in user)
@@ -26,6 +35,32 @@ SCOPES = ["User.Read", "Mail.ReadWrite"]
 CLIENT_SECRET_ENV = "COURRIEL_MS365_CLIENT_SECRET"
 
 
+# Tenant IDs that skip MSAL's authority instance discovery, see _build_msal_app()
+_TENANT_GUID_RE = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE
+)
+_MULTI_TENANT_IDS = frozenset({"common", "organizations", "consumers"})
+
+# Process-lifetime cache of the token cache and MSAL app for each account.
+# Keyed by (client_id, tenant_id, account_name). Building a
+# PublicClientApplication resolves the authority endpoint and sets up an
+# HTTP session, so we do it once per process instead of on every call.
+# Values are (cache file mtime_ns, token cache, app); the mtime lets us
+# notice when another courriel process rewrote the cache file.
+_APP_CACHE: dict[
+    tuple[str, str, str],
+    tuple[int | None, msal.SerializableTokenCache, msal.PublicClientApplication],
+] = {}
+
+
+def _token_cache_mtime(account_name: str) -> int | None:
+    """Return the cache file's mtime in nanoseconds, or None if missing."""
+    try:
+        return ms365_cache_file(account_name).stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
 def _load_token_cache(account_name: str) -> msal.SerializableTokenCache:
     """Load the token cache from disk for a specific account.
 
@@ -36,18 +71,51 @@ def _load_token_cache(account_name: str) -> msal.SerializableTokenCache:
         account_name: Account key from config (e.g. "personal").
     """
     cache = msal.SerializableTokenCache()
-    cache_path = ms365_cache_file(account_name)
 
-    if cache_path.exists():
-        cache.deserialize(cache_path.read_text())
+    # Read bytes in one call (no exists() pre-check, no str decode); the
+    # JSON parser works on bytes directly
+    try:
+        data = ms365_cache_file(account_name).read_bytes()
+    except FileNotFoundError:
+        return cache
 
+    _deserialize(cache, data)
     return cache
 
 
+def _deserialize(cache: msal.SerializableTokenCache, data: bytes | None) -> None:
+    """Load serialized cache contents into an MSAL token cache.
+
+    Equivalent to cache.deserialize(), but parses with courriel.fastjson
+    (orjson when installed) and skips decoding the bytes to str first.
+    Falls back to the public API if MSAL's internals ever change.
+    """
+    try:
+        with cache._lock:
+            cache._cache = fastjson.loads(data) if data else {}
+            cache.has_state_changed = False
+    except AttributeError:
+        cache.deserialize(data.decode("utf-8") if data else None)
+
+
+def _serialize(cache: msal.SerializableTokenCache) -> str:
+    """Serialize an MSAL token cache to compact JSON.
+
+    Equivalent to cache.serialize(), which always indents its output.
+    """
+    try:
+        with cache._lock:
+            cache.has_state_changed = False
+            return fastjson.dumps(cache._cache)
+    except AttributeError:
+        return cache.serialize()
+
+
 def _save_token_cache(cache: msal.SerializableTokenCache, account_name: str) -> None:
     """Persist the token cache to disk for a specific account.
 
     Sets file permissions to 600 (owner read/write only) to protect tokens.
+    The write is atomic, so concurrent refreshes can't corrupt the file.
 
     Args:
         cache: MSAL token cache to persist.
@@ -56,9 +124,15 @@ def _save_token_cache(cache: msal.SerializableTokenCache, account_name: str) ->
     ensure_credentials_dir()
 
     cache_path = ms365_cache_file(account_name)
-    cache_path.write_text(cache.serialize())
-    # Restrictive permissions: only owner can read/write
-    cache_path.chmod(0o600)
+    # Written atomically with owner-only permissions
+    write_private_file(cache_path, _serialize(cache))
+
+    # Record our own write so _get_app() doesn't mistake it for a change
+    # made by another process and reload the file we just wrote.
+    mtime = _token_cache_mtime(account_name)
+    for key, (_, cached, app) in _APP_CACHE.items():
+        if key[2] == account_name and cached is cache:
+            _APP_CACHE[key] = (mtime, cached, app)
 
 
 def get_client_secret(account_config: dict) -> str | None:
@@ -73,7 +147,28 @@ def get_client_secret(account_config: dict) -> str | None:
     Returns:
         Client secret string, or None if not configured.
     """
-    return os.environ.get(CLIENT_SECRET_ENV) or account_config.get("client_secret")
+    return _resolve_client_secret(
+        account_config.get("client_id", ""), account_config.get("client_secret")
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_client_secret(client_id: str, inline_secret: str | None) -> str | None:
+    """Resolve the client secret once per (client_id, inline secret) pair.
+
+    The environment is read on first use only; call
+    _resolve_client_secret.cache_clear() after changing it in-process.
+    """
+    return os.environ.get(CLIENT_SECRET_ENV) or inline_secret
+
+
+@functools.lru_cache(maxsize=8)
+def _authority(tenant_id: str) -> str:
+    """Return the authority URL for a tenant.
+
+    Single place to change for sovereign clouds (e.g. login.microsoftonline.us).
+    """
+    return f"https://login.microsoftonline.com/{tenant_id}"
 
 
 def _build_msal_app(
@@ -95,7 +190,20 @@ def _build_msal_app(
     Returns:
         Configured MSAL application instance.
     """
-    authority = f"https://login.microsoftonline.com/{tenant_id}"
+    authority = _authority(tenant_id)
+
+    # For well-formed tenants on the public cloud there is nothing for
+    # MSAL's instance discovery request to tell us, so skip that round-trip.
+    # Anything else (custom domains, typos) keeps MSAL's default validation.
+    is_guid = bool(_TENANT_GUID_RE.match(tenant_id))
+    if is_guid or tenant_id in _MULTI_TENANT_IDS:
+        return msal.PublicClientApplication(
+            client_id=client_id,
+            authority=authority,
+            token_cache=cache,
+            instance_discovery=False,
+            validate_authority=not is_guid,
+        )
 
     return msal.PublicClientApplication(
         client_id=client_id,
@@ -104,6 +212,47 @@ def _build_msal_app(
     )
 
 
+def _get_app(
+    client_id: str, tenant_id: str, account_name: str
+) -> tuple[msal.SerializableTokenCache, msal.PublicClientApplication]:
+    """Return the process-wide token cache and MSAL app for an account.
+
+    The first call loads the cache file and builds the app; later calls
+    reuse both. If the cache file changed on disk since we loaded it
+    (e.g. another courriel process refreshed the token), the new contents
+    are loaded into the existing cache object so the app stays valid.
+
+    Args:
+        client_id: Azure app registration client/application ID.
+        tenant_id: Azure tenant/directory ID.
+        account_name: Account key from config (e.g. "personal").
+
+    Returns:
+        Tuple of (token cache, MSAL application).
+    """
+    key = (client_id, tenant_id, account_name)
+    mtime = _token_cache_mtime(account_name)
+    entry = _APP_CACHE.get(key)
+
+    if entry is None:
+        cache = _load_token_cache(account_name)
+        app = _build_msal_app(client_id, tenant_id, cache)
+        _APP_CACHE[key] = (mtime, cache, app)
+        return cache, app
+
+    cached_mtime, cache, app = entry
+    if cached_mtime != mtime:
+        # Another process rewrote (or deleted) the file: reload it in place
+        try:
+            data = ms365_cache_file(account_name).read_bytes()
+        except FileNotFoundError:
+            data = None
+        _deserialize(cache, data)
+        _APP_CACHE[key] = (mtime, cache, app)
+
+    return cache, app
+
+
 def authenticate_device_flow(
     client_id: str,
     tenant_id: str,
@@ -126,8 +275,7 @@ def authenticate_device_flow(
         - On success: 'access_token', 'id_token_claims', etc.
         - On failure: 'error' and 'error_description'
     """
-    cache = _load_token_cache(account_name)
-    app = _build_msal_app(client_id, tenant_id, cache)
+    cache, app = _get_app(client_id, tenant_id, account_name)
 
     # Check for existing cached token first
     accounts = app.get_accounts()
@@ -155,8 +303,17 @@ def authenticate_device_flow(
     # MSAL provides a nicely formatted message like:
     # "To sign in, use a web browser to open the page https://microsoft.com/devicelogin
     #  and enter the code XXXXXXXX to authenticate."
-    print(flow["message"])
+    # Written as one pre-encoded chunk to the underlying binary stream;
+    # stdout replaced by a text-only stream (no .buffer) falls back to print().
+    # Flush the text layer first so earlier output stays in order.
+    message = flow["message"]
     sys.stdout.flush()
+    try:
+        sys.stdout.buffer.write((message + "\n").encode("utf-8"))
+        sys.stdout.buffer.flush()
+    except AttributeError:
+        print(message)
+        sys.stdout.flush()
 
     # Block until user completes authentication or timeout
     result = app.acquire_token_by_device_flow(flow)
@@ -168,11 +325,14 @@ def authenticate_device_flow(
     return result
 
 
-def get_access_token(client_id: str, tenant_id: str, account_name: str) -> str | None:
-    """Get a valid access token using cached credentials.
+def get_access_token_with_expiry(
+    client_id: str, tenant_id: str, account_name: str
+) -> tuple[str, float] | None:
+    """Get a valid access token and its expiry time using cached credentials.
 
     Silently refreshes the token if expired. Does not prompt for login.
-    Use authenticate_device_flow() first to establish credentials.
+    The expiry lets callers (see courriel.auth) keep the token in memory
+    and skip MSAL entirely until it is about to expire.
 
     Args:
         client_id: Azure app registration client/application ID.
@@ -180,10 +340,10 @@ def get_access_token(client_id: str, tenant_id: str, account_name: str) -> str |
         account_name: Account key from config (e.g. "personal").
 
     Returns:
-        Access token string, or None if not authenticated.
+        Tuple of (access token, expiry as Unix timestamp), or None if not
+        authenticated.
     """
-    cache = _load_token_cache(account_name)
-    app = _build_msal_app(client_id, tenant_id, cache)
+    cache, app = _get_app(client_id, tenant_id, account_name)
 
     accounts = app.get_accounts()
     if not accounts:
@@ -191,26 +351,77 @@ def get_access_token(client_id: str, tenant_id: str, account_name: str) -> str |
 
     result = app.acquire_token_silent(SCOPES, account=accounts[0])
 
+    # MSAL may hand back a cached token that is seconds from expiring.
+    # Force one refresh so callers get a token that outlives their request.
+    # (An error result has no expires_in; don't mistake it for expiring.)
+    if (
+        result
+        and "access_token" in result
+        and result.get("expires_in", 0) < REFRESH_SKEW_SECONDS
+    ):
+        result = app.acquire_token_silent(
+            SCOPES, account=accounts[0], force_refresh=True
+        )
+
     if result and "access_token" in result:
         # Save cache in case token was refreshed
         if cache.has_state_changed:
             _save_token_cache(cache, account_name)
-        return result["access_token"]
+        # MSAL reports the remaining lifetime in seconds, not an absolute time
+        expires_at = time.time() + int(result.get("expires_in", 0))
+        return result["access_token"], expires_at
 
     return None
 
 
+def get_access_token(client_id: str, tenant_id: str, account_name: str) -> str | None:
+    """Get a valid access token using cached credentials.
+
+    Silently refreshes the token if expired. Does not prompt for login.
+    Use authenticate_device_flow() first to establish credentials.
+
+    Args:
+        client_id: Azure app registration client/application ID.
+        tenant_id: Azure tenant/directory ID.
+        account_name: Account key from config (e.g. "personal").
+
+    Returns:
+        Access token string, or None if not authenticated.
+    """
+    token = get_access_token_with_expiry(client_id, tenant_id, account_name)
+    return token[0] if token else None
+
+
 def is_authenticated(client_id: str, tenant_id: str, account_name: str) -> bool:
     """Check if we have valid cached credentials.
 
-    Does not attempt to refresh - just checks if tokens exist.
+    Does not attempt to refresh - just checks if tokens exist. The token
+    cache file is read directly, without building the MSAL app (whose
+    authority discovery is a network request), so this works offline.
 
     Args:
         client_id: Azure app registration client/application ID.
-        tenant_id: Azure tenant/directory ID.
+        tenant_id: Azure tenant/directory ID. Unused: the cache file
+            already belongs to this account's tenant.
         account_name: Account key from config (e.g. "personal").
 
     Returns:
-        True if valid cached credentials exist.
+        True if the cache holds either an unexpired access token or a
+        refresh token (which get_access_token() can redeem) for client_id.
     """
-    return get_access_token(client_id, tenant_id, account_name) is not None
+    cache = _load_token_cache(account_name)
+
+    now = time.time()
+    for entry in cache.search(
+        msal.TokenCache.CredentialType.ACCESS_TOKEN,
+        query={"client_id": client_id},
+    ):
+        if int(entry.get("expires_on", 0)) > now:
+            return True
+
+    # The access token expired, but a refresh token can silently get a new one
+    refresh_tokens = cache.search(
+        msal.TokenCache.CredentialType.REFRESH_TOKEN,
+        query={"client_id": client_id},
+    )
+    return next(refresh_tokens, None) is not None
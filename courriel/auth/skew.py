@@ -0,0 +1,29 @@
+"""Token refresh skew shared by the auth providers.
+
+A token that expires within REFRESH_SKEW_SECONDS is refreshed up-front
+rather than handed to a caller, so API calls never start with a token
+that expires halfway through the request.
+"""
+
+import os
+
+# Environment variable to override the skew (in seconds).
+# Useful on machines with a drifting clock or very slow API calls.
+REFRESH_SKEW_ENV = "COURRIEL_REFRESH_SKEW"
+
+DEFAULT_REFRESH_SKEW_SECONDS = 60
+
+
+def _read_skew() -> int:
+    """Read the skew from the environment, falling back to the default.
+
+    Runs at import time, so a malformed value (e.g. "60s") must not
+    raise and take every command down with it.
+    """
+    try:
+        return int(os.environ.get(REFRESH_SKEW_ENV, DEFAULT_REFRESH_SKEW_SECONDS))
+    except ValueError:
+        return DEFAULT_REFRESH_SKEW_SECONDS
+
+
+REFRESH_SKEW_SECONDS = _read_skew()
@@ -1,5 +1,19 @@
-"""CLI commands module."""
+"""CLI commands module.
 
-from . import config, draft, list, read, search, sync
+Command modules are imported on first attribute access (PEP 562), so
+importing this package doesn't pull in every command's dependencies.
+"""
+
+import importlib
 
 __all__ = ["sync", "search", "read", "draft", "list", "config"]
+
+
+def __getattr__(name: str):
+    """Import a command module the first time it is accessed."""
+    if name in __all__:
+        module = importlib.import_module(f".{name}", __name__)
+        # Cache on the package so later lookups skip __getattr__
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,10 +6,10 @@ Manages courriel configuration and Microsoft 365 authentication.
 import typer
 from typing_extensions import Annotated
 
-from courriel.auth import authenticate
 from courriel.config import (
     CONFIG_FILE,
     get_account,
+    get_account_name,
     init_config,
     load_config,
     set_config_value,
@@ -63,12 +63,15 @@ def auth(
 
     # Resolve account name: use the explicit --account flag, or fall back
     # to the first configured account key.
-    account_name = account or next(iter(config.get("accounts", {}).keys()), "default")
+    account_name = get_account_name(config, account)
 
     provider = account_config.get("provider", "ms365")
     typer.echo(f"Starting {provider.upper()} authentication...")
     typer.echo()
 
+    # Imported here so other config commands don't load the auth stack
+    from courriel.auth import authenticate
+
     result = authenticate(account_config, account_name)
 
     if "access_token" in result:
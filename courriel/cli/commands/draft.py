@@ -10,10 +10,7 @@ from pathlib import Path
 import typer
 from typing_extensions import Annotated
 
-from courriel.config import get_account, load_config
-from courriel.draft import build_draft_message, create_draft
-from courriel.read import read_message
-from courriel.sync.gmail import GmailClient, get_credentials
+from courriel.config import get_account, get_account_name, load_config
 
 app = typer.Typer(help="Create or reply to email drafts")
 
@@ -57,6 +54,12 @@ def draft(
         # With attachment
         courriel draft --to alice@example.com --subject "Report" --attach report.pdf
     """
+    # Imported here: googleapiclient is slow to import, and the CLI loads
+    # this module to build --help even when no draft is created
+    from courriel.draft import build_draft_message, create_draft
+    from courriel.read import read_message
+    from courriel.sync.gmail import GmailClient, get_credentials
+
     # Read body from stdin if --body not provided and stdin is a pipe
     if body is None and not sys.stdin.isatty():
         body = sys.stdin.read()
@@ -65,7 +68,7 @@ def draft(
     original = None
     if reply_to:
         try:
-            original = read_message(Path(reply_to))
+            original = read_message(Path(reply_to), headers_only=True)
         except FileNotFoundError:
             typer.echo(f"Error: File not found: {reply_to}", err=True)
             raise typer.Exit(1)
@@ -118,7 +121,7 @@ def draft(
         typer.echo("Currently only Gmail is supported.")
         raise typer.Exit(1)
 
-    account_name = account or next(iter(config.get("accounts", {}).keys()), "default")
+    account_name = get_account_name(config, account)
     credentials = get_credentials(account_name)
     if not credentials or not credentials.valid:
         typer.echo("Error: Not authenticated.", err=True)
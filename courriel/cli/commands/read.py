@@ -11,16 +11,23 @@ Usage:
     courriel read /path/to/message --output headers
 """
 
-import json
+import os
+import shutil
+import stat
+import sys
+from html.parser import HTMLParser
 from pathlib import Path
 
 import typer
 from typing_extensions import Annotated
 
-from courriel.read import read_message
-
 app = typer.Typer(help="Display email message(s)")
 
+# Tags whose contents _strip_html() drops entirely
+_SKIP_TAGS = frozenset({"style", "script"})
+# Tags whose end starts a new line in _strip_html() output
+_BLOCK_TAGS = frozenset({"p", "div", "tr", "li", "h1", "h2", "h3", "h4", "h5", "h6"})
+
 
 @app.callback(invoke_without_command=True)
 def read(
@@ -36,118 +43,197 @@ def read(
 ) -> None:
     """Read and display a single email message from a Maildir file."""
     # Validate output format
-    valid_formats = ("text", "json", "raw", "headers")
-    if output not in valid_formats:
+    if output not in _VALID_FORMATS:
         typer.echo(f"Error: Invalid output format '{output}'", err=True)
-        typer.echo(f"Valid formats: {', '.join(valid_formats)}", err=True)
+        typer.echo(f"Valid formats: {', '.join(_FORMAT_NAMES)}", err=True)
         raise typer.Exit(1)
 
     path = Path(file_path).expanduser()
 
-    if not path.exists():
+    # One stat() covers both checks (exists() and is_file() stat separately)
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
         typer.echo(f"Error: File not found: {file_path}", err=True)
         raise typer.Exit(1)
 
-    if not path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         typer.echo(f"Error: Not a file: {file_path}", err=True)
         raise typer.Exit(1)
 
-    # Raw mode: just dump the file contents, no parsing
+    # Raw mode: just dump the file contents, no parsing.
+    # Bytes are copied in chunks straight to stdout's binary buffer, so
+    # large messages are never decoded or held in memory whole.
     if output == "raw":
-        typer.echo(path.read_text(errors="replace"), nl=False)
+        _output_raw(path)
         return
 
-    # Parse the email
+    # Parse the email (parser imported here: raw mode doesn't need it)
+    from courriel.read import read_message
+
     try:
         msg = read_message(path)
     except Exception as e:
         typer.echo(f"Error: Could not parse email: {e}", err=True)
         raise typer.Exit(1)
 
-    if output == "json":
-        _output_json(msg)
-    elif output == "headers":
-        _output_headers(msg)
-    else:
-        _output_text(msg)
+    _FORMATTERS[output](msg)
+
+
+def _output_raw(path: Path) -> None:
+    """Copy the message file to stdout byte for byte."""
+    stdout = sys.stdout
+    buffer = getattr(stdout, "buffer", None)
+    if buffer is None:
+        # Text-only stdout (e.g. some wrappers): decode as before
+        typer.echo(path.read_text(errors="replace"), nl=False)
+        return
+
+    # Flush pending text first so output stays in order
+    stdout.flush()
+    with open(path, "rb") as f:
+        shutil.copyfileobj(f, buffer, length=1 << 16)
+    buffer.flush()
 
 
 def _output_json(msg) -> None:
-    """Output message as JSON."""
-    typer.echo(json.dumps(msg.to_dict(), indent=2))
+    """Output message as JSON (via orjson when it is installed)."""
+    from courriel import fastjson
+
+    fastjson.write(msg.to_dict(), sys.stdout, indent=True)
 
 
 def _output_headers(msg) -> None:
     """Output only the message headers."""
-    typer.echo(f"File: {msg.file}")
-    typer.echo(f"Date: {msg.date.isoformat()}")
-    typer.echo(f"From: {msg.from_addr}")
+    lines = [
+        f"File: {msg.file}",
+        f"Date: {msg.date.isoformat()}",
+        f"From: {msg.from_addr}",
+    ]
     if msg.to_addrs:
-        typer.echo(f"To: {', '.join(msg.to_addrs)}")
+        lines.append(f"To: {', '.join(msg.to_addrs)}")
     if msg.cc_addrs:
-        typer.echo(f"Cc: {', '.join(msg.cc_addrs)}")
+        lines.append(f"Cc: {', '.join(msg.cc_addrs)}")
     if msg.bcc_addrs:
-        typer.echo(f"Bcc: {', '.join(msg.bcc_addrs)}")
-    typer.echo(f"Subject: {msg.subject}")
-    typer.echo(f"Message-ID: {msg.message_id}")
+        lines.append(f"Bcc: {', '.join(msg.bcc_addrs)}")
+    lines.append(f"Subject: {msg.subject}")
+    lines.append(f"Message-ID: {msg.message_id}")
     if msg.in_reply_to:
-        typer.echo(f"In-Reply-To: {msg.in_reply_to}")
+        lines.append(f"In-Reply-To: {msg.in_reply_to}")
     if msg.attachments:
-        typer.echo(f"Attachments: {len(msg.attachments)}")
-        for att in msg.attachments:
-            typer.echo(
-                f"  - {att['filename']} ({att['content_type']}, {att['size']} bytes)"
-            )
+        lines.append(f"Attachments: {len(msg.attachments)}")
+        lines.append(_format_attachments(msg.attachments))
+
+    # One write for the whole block instead of one echo per line
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def _output_text(msg) -> None:
     """Output message in human-readable text format."""
     # Header block
-    typer.echo(f"From: {msg.from_addr}")
+    lines = [f"From: {msg.from_addr}"]
     if msg.to_addrs:
-        typer.echo(f"To: {', '.join(msg.to_addrs)}")
+        lines.append(f"To: {', '.join(msg.to_addrs)}")
     if msg.cc_addrs:
-        typer.echo(f"Cc: {', '.join(msg.cc_addrs)}")
-    typer.echo(f"Date: {msg.date.isoformat()}")
-    typer.echo(f"Subject: {msg.subject}")
-    typer.echo()  # Blank line separating headers from body
+        lines.append(f"Cc: {', '.join(msg.cc_addrs)}")
+    lines.append(f"Date: {msg.date.isoformat()}")
+    lines.append(f"Subject: {msg.subject}")
+    lines.append("")  # Blank line separating headers from body
 
     # Body — prefer plain text, fall back to HTML
     if msg.body_plain:
-        typer.echo(msg.body_plain)
+        lines.append(msg.body_plain)
     elif msg.body_html:
         # Strip HTML tags for readable text output
-        typer.echo(_strip_html(msg.body_html))
+        lines.append(_strip_html(msg.body_html))
     else:
-        typer.echo("(no body)")
+        lines.append("(no body)")
 
     # Attachment summary
     if msg.attachments:
-        typer.echo()
-        typer.echo(f"Attachments ({len(msg.attachments)}):")
-        for att in msg.attachments:
-            typer.echo(
-                f"  - {att['filename']} ({att['content_type']}, {att['size']} bytes)"
-            )
+        lines.append("")
+        lines.append(f"Attachments ({len(msg.attachments)}):")
+        lines.append(_format_attachments(msg.attachments))
+
+    # One write for the whole message instead of one echo per line
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _format_attachments(attachments: list[dict]) -> str:
+    """Format the attachment list, one indented line per attachment."""
+    return "\n".join(
+        f"  - {att['filename']} ({att['content_type']}, {att['size']} bytes)"
+        for att in attachments
+    )
+
+
+class _TextExtractor(HTMLParser):
+    """Single-pass HTML-to-text converter used by _strip_html().
+
+    Drops style/script contents, turns <br> and the end of block-level
+    elements into newlines, decodes entities, and collapses runs of three
+    or more newlines to a blank line as it goes. Output pieces are kept
+    in a list and joined once at the end.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._out: list[str] = []
+        self._skip_depth = 0  # >0 while inside <style> or <script>
+        self._newlines = 0  # Newlines seen but not yet written
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "br":
+            self._emit("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self._emit("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._emit(data)
+
+    def _emit(self, text: str) -> None:
+        """Append text, holding back newlines so long runs can be collapsed."""
+        for i, part in enumerate(text.split("\n")):
+            if i:
+                self._newlines += 1
+            if part:
+                # Leading newlines are dropped; runs of 3+ become 2
+                if self._newlines and self._out:
+                    self._out.append("\n" * min(self._newlines, 2))
+                self._newlines = 0
+                self._out.append(part)
+
+    def text(self) -> str:
+        """Return the extracted text."""
+        self.close()
+        return "".join(self._out).strip()
 
 
 def _strip_html(html: str) -> str:
     """Crude HTML tag stripping for text output.
 
-    Not a full HTML parser — just removes tags and collapses whitespace.
+    Not a full renderer — just removes tags and collapses whitespace.
     Good enough for displaying HTML-only emails as readable text.
     """
-    import re
-
-    # Remove style and script blocks entirely
-    text = re.sub(
-        r"<(style|script)[^>]*>.*?</\1>", "", html, flags=re.DOTALL | re.IGNORECASE
-    )
-    # Replace <br> and block-level tags with newlines
-    text = re.sub(r"<br\s*/?>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"</(p|div|tr|li|h[1-6])>", "\n", text, flags=re.IGNORECASE)
-    # Remove remaining tags
-    text = re.sub(r"<[^>]+>", "", text)
-    # Collapse multiple blank lines
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    return text.strip()
+    parser = _TextExtractor()
+    parser.feed(html)
+    return parser.text()
+
+
+# Output format -> formatter for parsed messages. Raw output bypasses
+# the parser, so it is handled in read() and has no entry here.
+_FORMATTERS = {
+    "text": _output_text,
+    "json": _output_json,
+    "headers": _output_headers,
+}
+# Names in the order shown in error messages
+_FORMAT_NAMES = ("text", "json", "raw", "headers")
+_VALID_FORMATS = frozenset(_FORMAT_NAMES)
@@ -8,23 +8,33 @@ Usage:
     courriel search "date:2024.." --limit 20 --output summary
 """
 
-import json
+import functools
+import heapq
+import itertools
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, NoReturn
 
 import typer
 from typing_extensions import Annotated
 
-from courriel.config import get_account, get_account_names, load_config
-from courriel.search import (
-    NotmuchDatabaseError,
-    NotmuchError,
-    NotmuchNotFoundError,
-    SearchResult,
-    search_local,
-)
-from pathlib import Path
+from courriel.config import load_config, split_config
+
+# The search backend is imported inside search() so that building the CLI
+# (e.g. `courriel --help`) doesn't pay for it
+if TYPE_CHECKING:
+    from courriel.search import SearchResult
 
 app = typer.Typer(help="Search emails locally or remotely")
 
+# Upper bound on accounts searched at the same time
+_MAX_SEARCH_WORKERS = 8
+
+# Output formats that show no snippet or attachments, so notmuch can skip
+# reading message bodies
+_HEADER_ONLY_FORMATS = frozenset({"summary", "files"})
+
 
 @app.command()
 def search(
@@ -59,7 +69,7 @@ def search(
         str,
         typer.Option(
             "--output",
-            help="Output format: json, summary, files",
+            help="Output format: json, ndjson, summary, files",
         ),
     ] = "json",
     remote: Annotated[
@@ -81,10 +91,8 @@ def search(
     Query syntax: https://notmuchmail.org/doc/latest/man7/notmuch-search-terms.html
     """
     # Validate output format
-    if output not in ("json", "summary", "files"):
-        typer.echo(f"Error: Invalid output format '{output}'", err=True)
-        typer.echo("Valid formats: json, summary, files", err=True)
-        raise typer.Exit(1)
+    if output not in _FORMATTERS:
+        _invalid_output(output)
 
     # Remote search not yet implemented
     if remote:
@@ -93,59 +101,90 @@ def search(
         )
         raise typer.Exit(1)
 
+    # Imported after the argument checks so a usage error doesn't pay for them
+    from concurrent.futures import ThreadPoolExecutor
+
+    from courriel.search import (
+        NotmuchDatabaseError,
+        NotmuchError,
+        NotmuchNotFoundError,
+        search_local,
+    )
+
     # Load configuration
     config = load_config()
-    all_account_names = get_account_names(config)
+    try:
+        defaults, all_accounts = split_config(config)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
 
-    if not all_account_names:
+    if not all_accounts:
         typer.echo("Error: No accounts configured.", err=True)
         typer.echo("Run 'courriel config init' and add an account.", err=True)
         raise typer.Exit(1)
 
     # Determine which accounts to search
     if account:
-        if account not in all_account_names:
+        if account not in all_accounts:
             typer.echo(f"Error: Account '{account}' not configured.", err=True)
-            typer.echo(f"Available accounts: {', '.join(all_account_names)}", err=True)
+            typer.echo(f"Available accounts: {', '.join(all_accounts)}", err=True)
             raise typer.Exit(1)
-        accounts_to_search = [account]
+        accounts_to_search = {account: all_accounts[account]}
     else:
         # Default: search all accounts (--all is just for explicitness)
-        accounts_to_search = all_account_names
+        accounts_to_search = all_accounts
 
     # Get config defaults for limit/output if not explicitly set
-    defaults = config.get("defaults", {})
     if limit == 50:  # Default value, check if config has different default
         limit = defaults.get("search_limit", 50)
     if output == "json":  # Default value, check if config has different default
         output = defaults.get("search_output", "json")
+        if output not in _FORMATTERS:
+            _invalid_output(output, source="search_output in config.toml")
+
+    # Resolve each account's mail directory up front, so warnings are
+    # printed in account order before any search starts
+    jobs: list[tuple[str, Path]] = []
+    for acct_name, account_config in accounts_to_search.items():
+        if not account_config:
+            continue
+
+        mail_dir = _expand_mail_dir(account_config.get("mail_dir", "~/Mail"))
+
+        if not mail_dir.exists():
+            typer.echo(
+                f"Warning: Mail directory not found for '{acct_name}': {mail_dir}",
+                err=True,
+            )
+            continue
 
-    # Perform search across accounts
-    all_results: list[SearchResult] = []
+        jobs.append((acct_name, mail_dir))
+
+    # Perform search across accounts.
+    # Accounts are searched concurrently: each search spends its time
+    # waiting on notmuch subprocesses, so threads scale with the number
+    # of accounts.
+    streams: list[Iterable["SearchResult"]] = []
 
     try:
-        for acct_name in accounts_to_search:
-            account_config = get_account(config, acct_name)
-            if not account_config:
-                continue
-
-            mail_dir_str = account_config.get("mail_dir", "~/Mail")
-            mail_dir = Path(mail_dir_str).expanduser()
-
-            if not mail_dir.exists():
-                typer.echo(
-                    f"Warning: Mail directory not found for '{acct_name}': {mail_dir}",
-                    err=True,
-                )
-                continue
-
-            results = search_local(
-                query=query,
-                mail_dir=mail_dir,
-                account_name=acct_name,
-                limit=limit,
-            )
-            all_results.extend(results)
+        if jobs:
+            workers = min(_MAX_SEARCH_WORKERS, len(jobs))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(
+                        search_local,
+                        query=query,
+                        mail_dir=mail_dir,
+                        account_name=acct_name,
+                        limit=limit,
+                        with_body=output not in _HEADER_ONLY_FORMATS,
+                    )
+                    for acct_name, mail_dir in jobs
+                ]
+                # Collect in account order so output stays deterministic;
+                # result() re-raises any notmuch error from the worker
+                streams = [future.result() for future in futures]
 
     except NotmuchNotFoundError as e:
         typer.echo(f"Error: {e}", err=True)
@@ -157,62 +196,113 @@ def search(
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(1)
 
-    # Apply limit across all accounts (results are pre-sorted newest-first by notmuch)
-    all_results = all_results[:limit]
+    # Keep the newest `limit` results across all accounts. Each account's
+    # results are already newest-first, but a plain slice would favour the
+    # first account. nlargest is O(n log limit) and stable on ties; each
+    # account contributes at most `limit` results, already fetched by its
+    # worker. timestamp() because notmuch dates can mix naive and aware
+    # datetimes.
+    all_results = heapq.nlargest(
+        limit,
+        itertools.chain.from_iterable(streams),
+        key=lambda r: r.date.timestamp(),
+    )
 
     # Format and output results
-    if output == "json":
-        _output_json(query, all_results)
-    elif output == "summary":
-        _output_summary(all_results)
-    elif output == "files":
-        _output_files(all_results)
+    _FORMATTERS[output](query, all_results)
+
 
+def _invalid_output(output: str, source: str = "--output") -> NoReturn:
+    """Report an unknown output format and exit."""
+    typer.echo(f"Error: Invalid output format '{output}' ({source})", err=True)
+    typer.echo(f"Valid formats: {', '.join(_FORMATTERS)}", err=True)
+    raise typer.Exit(1)
+
+
+@functools.lru_cache(maxsize=16)
+def _expand_mail_dir(mail_dir: str) -> Path:
+    """Expand a configured mail_dir string to a Path (memoized per string)."""
+    return Path(mail_dir).expanduser()
+
+
+def _output_json(query: str, results: list["SearchResult"]) -> None:
+    """Output results as JSON.
+
+    Written straight to stdout, using orjson when it is installed.
+    """
+    from courriel import fastjson
 
-def _output_json(query: str, results: list[SearchResult]) -> None:
-    """Output results as JSON."""
     output_data = {
         "query": query,
         "total": len(results),
         "results": [r.to_dict() for r in results],
     }
-    typer.echo(json.dumps(output_data, indent=2))
+    fastjson.write(output_data, sys.stdout, indent=True)
 
 
-def _output_summary(results: list[SearchResult]) -> None:
-    """Output results as human-readable summary grouped by account."""
+def _output_ndjson(query: str, results: list["SearchResult"]) -> None:
+    """Output results as newline-delimited JSON, one compact object per line.
+
+    Each result is encoded and written on its own, so memory use doesn't
+    grow with the number of results. Convenient for jq and line-based tools.
+    """
+    from courriel import fastjson
+
+    fastjson.write_lines((r.to_dict() for r in results), sys.stdout)
+
+
+def _output_summary(query: str, results: list["SearchResult"]) -> None:
+    """Output results as human-readable summary grouped by account.
+
+    Lines are collected and written with a single call, which is much
+    faster than one echo per line for large result sets.
+    """
     if not results:
         typer.echo("No results found.")
         return
 
     # Group by account
-    by_account: dict[str, list[SearchResult]] = {}
+    by_account: dict[str, list["SearchResult"]] = {}
     for r in results:
         by_account.setdefault(r.account, []).append(r)
 
+    lines: list[str] = []
     for acct_name, acct_results in by_account.items():
         count_word = "result" if len(acct_results) == 1 else "results"
-        typer.echo(f"{acct_name}: {len(acct_results)} {count_word}")
+        lines.append(f"{acct_name}: {len(acct_results)} {count_word}")
+
+        # One f-string per row: date formatted inline, from_addr and
+        # subject truncated for display
+        lines.extend(
+            f"  {r.date:%Y-%m-%d} {_truncate(r.from_addr, 30):30} "
+            f"{_truncate(r.subject, 40)}"
+            for r in acct_results
+        )
 
-        for r in acct_results:
-            date_str = r.date.strftime("%Y-%m-%d")
-            # Truncate from_addr and subject for display
-            from_display = _truncate(r.from_addr, 30)
-            subject_display = _truncate(r.subject, 40)
-            typer.echo(f"  {date_str} {from_display:30} {subject_display}")
+        lines.append("")  # Blank line between accounts
 
-        typer.echo()  # Blank line between accounts
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def _output_files(results: list[SearchResult]) -> None:
+def _output_files(query: str, results: list["SearchResult"]) -> None:
     """Output results as file paths, one per line."""
-    for r in results:
-        if r.file:
-            typer.echo(r.file)
+    lines = [r.file for r in results if r.file]
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def _truncate(text: str, max_len: int) -> str:
     """Truncate text to max length with ellipsis."""
-    if len(text) <= max_len:
-        return text
-    return text[: max_len - 1] + "..."
+    # Single expression: called twice per row of summary output
+    return text if len(text) <= max_len else text[: max_len - 1] + "..."
+
+
+# Output format -> formatter. Formatters all take (query, results);
+# only JSON output includes the query. Key order is the order shown in
+# error messages.
+_FORMATTERS = {
+    "json": _output_json,
+    "ndjson": _output_ndjson,
+    "summary": _output_summary,
+    "files": _output_files,
+}
@@ -5,13 +5,16 @@ Supports both full and incremental sync modes.
 """
 
 import subprocess
+import sys
+import threading
+import time
 from datetime import date
 from pathlib import Path
 
 import typer
 from typing_extensions import Annotated
 
-from courriel.config import get_account, load_config
+from courriel.config import get_account, get_account_name, load_config
 from courriel.sync.engine import SyncEngine, SyncResult
 from courriel.sync.gmail import GmailClient, get_credentials
 from courriel.sync.state import SyncState
@@ -23,6 +26,31 @@ app = typer.Typer(help="Synchronize emails between remote account and local Mail
 # ALL is a pseudo-label that syncs all mail (including archived emails).
 DEFAULT_LABELS = ["INBOX", "SENT", "DRAFT", "ALL"]
 
+# Labels synced at the same time unless defaults.sync_concurrency says
+# otherwise. Kept small to stay within Gmail's per-user rate limits.
+DEFAULT_SYNC_CONCURRENCY = 3
+
+# Minimum seconds between progress line redraws (about 30 per second)
+PROGRESS_INTERVAL = 1 / 30
+
+
+def _update_notmuch_index() -> None:
+    """Run notmuch new once, after all labels are synced.
+
+    Indexing is notmuch's most expensive step, so it is done in one pass
+    over everything the sync wrote rather than per label or message.
+    Failures only warn: the mail is already saved, and a missing notmuch
+    just means local search isn't set up.
+    """
+    typer.echo("Updating notmuch index...")
+    try:
+        proc = subprocess.run(["notmuch", "new"], capture_output=True, text=True)
+    except FileNotFoundError:
+        typer.echo("Warning: notmuch not found, skipping indexing", err=True)
+        return
+    if proc.returncode != 0:
+        typer.echo(f"Warning: notmuch indexing failed: {proc.stderr.strip()}", err=True)
+
 
 def _parse_date(date_str: str) -> date:
     """Parse a YYYY-MM-DD date string.
@@ -47,27 +75,55 @@ def _parse_date(date_str: str) -> date:
 def _create_progress_callback() -> tuple[callable, dict]:
     """Create a progress callback and state tracker.
 
+    The callback is thread-safe: labels may be synced concurrently, so
+    updates are serialized with a lock. Progress is tracked per label:
+    the labels still syncing share one status line that is redrawn in
+    place, and each label gets a line of its own once it completes.
+
+    The status line is redrawn at most every PROGRESS_INTERVAL seconds
+    (plus when a label completes), however the labels' updates are
+    interleaved; on a slow terminal, writing it for every message can
+    take longer than the sync itself.
+
     Returns:
         Tuple of (callback function, state dict for tracking).
     """
-    state = {"current_label": None, "shown_header": False}
+    state = {
+        "progress": {},  # label -> (current, total), for labels in progress
+        "last_update": 0.0,
+        "width": 0,  # Length of the status line on screen
+    }
+    lock = threading.Lock()
 
     def progress_callback(label: str, current: int, total: int):
-        # Print label header on first message
-        if state["current_label"] != label:
-            if state["shown_header"]:
-                typer.echo()  # Newline after previous label
-            state["current_label"] = label
-            state["shown_header"] = True
-            typer.echo(f"{label}:")
-
-        # Print progress (overwrite line)
-        typer.echo(f"  Syncing: {current}/{total} messages", nl=False)
-        typer.echo("\r", nl=False)
-
-        # Print final status on completion
-        if current == total:
-            typer.echo(f"  Syncing: {total}/{total} messages - done")
+        with lock:
+            now = time.monotonic()
+            progress = state["progress"]
+            output = ""
+            if current == total:
+                # Final status replaces the status line for good
+                progress.pop(label, None)
+                line = f"{label}: {total}/{total} messages - done"
+                output = line.ljust(state["width"]) + "\n"
+                state["width"] = 0
+            else:
+                progress[label] = (current, total)
+                if now - state["last_update"] < PROGRESS_INTERVAL:
+                    return
+            state["last_update"] = now
+
+            # Redraw the status line (padded to cover a longer previous one)
+            if progress:
+                counts = ", ".join(
+                    f"{name} {cur}/{tot}" for name, (cur, tot) in progress.items()
+                )
+                status = f"  Syncing: {counts} messages"
+                output += status.ljust(state["width"]) + "\r"
+                state["width"] = len(status)
+            # Written straight to sys.stdout (not typer.echo, which goes
+            # through click's stream handling) as one write per update
+            sys.stdout.write(output)
+            sys.stdout.flush()
 
     return progress_callback, state
 
@@ -175,7 +231,7 @@ def sync(
         raise typer.Exit(1)
 
     # Get account name for state file and credential lookup
-    account_name = account or next(iter(config.get("accounts", {}).keys()), "default")
+    account_name = get_account_name(config, account)
 
     # Check authentication
     credentials = get_credentials(account_name)
@@ -195,6 +251,7 @@ def sync(
     # Get settings with defaults
     defaults = config.get("defaults", {})
     msg_limit = max_messages or defaults.get("max_messages", 100)
+    concurrency = defaults.get("sync_concurrency", DEFAULT_SYNC_CONCURRENCY)
 
     # Parse date filter
     since_date = _parse_date(since) if since else None
@@ -205,7 +262,7 @@ def sync(
 
     # Create engine components
     gmail_client = GmailClient(credentials)
-    maildir = MaildirStorage(mail_path)
+    maildir = MaildirStorage(mail_path, fsync=defaults.get("sync_fsync", False))
     state = SyncState(account_name)
 
     engine = SyncEngine(gmail_client, maildir, state)
@@ -231,6 +288,7 @@ def sync(
             days=days,
             progress_callback=progress_callback,
             force_full=full,
+            max_workers=concurrency,
         )
     except Exception as e:
         typer.echo()
@@ -242,10 +300,7 @@ def sync(
 
     # Update notmuch index so new messages are searchable
     if result.downloaded > 0:
-        typer.echo("Updating notmuch index...")
-        proc = subprocess.run(["notmuch", "new"], capture_output=True, text=True)
-        if proc.returncode != 0:
-            typer.echo(f"Warning: notmuch indexing failed: {proc.stderr.strip()}", err=True)
+        _update_notmuch_index()
 
     # Exit with error code if there were errors
     if result.errors > 0:
@@ -1,36 +1,97 @@
 """Main CLI entry point for courriel."""
 
 import typer
+from typer.core import TyperCommand, TyperGroup
 
 from courriel import __version__
 from courriel.cli import commands
 from courriel.config import get_account_names, load_config
-from courriel.config.paths import migrate_credential_files
+from courriel.config.paths import legacy_credentials_exist, migrate_credential_files
+
+# Subcommand name -> attribute of courriel.cli.commands.<name> to register.
+# A Typer is added as a command group; a function (search, which has a
+# required argument) as a direct command. Modules are imported only when
+# their command runs or help lists it, so a single invocation doesn't pay
+# for every command's dependencies (e.g. the Gmail API client).
+_LAZY_COMMANDS = {
+    "sync": "app",
+    "read": "app",
+    "draft": "app",
+    "list": "app",
+    "config": "app",
+    "search": "search",
+}
+
+
+def _load_command(name: str) -> TyperCommand | TyperGroup:
+    """Import a command module and build its click command."""
+    target = getattr(getattr(commands, name), _LAZY_COMMANDS[name])
+    # Register on a throwaway Typer so the result matches what
+    # add_typer()/command() on the main app would have produced
+    loader = typer.Typer()
+    if isinstance(target, typer.Typer):
+        loader.add_typer(target, name=name)
+    else:
+        loader.command(name=name)(target)
+    return typer.main.get_group(loader).commands[name]
+
+
+# ctx.meta key set by _LazyGroup.parse_args()
+_HELP_REQUESTED = "courriel.help_requested"
+
+# Commands that never touch credentials, so _startup() has nothing to do
+_NO_STARTUP_COMMANDS = frozenset({"version"})
+
+
+class _LazyGroup(TyperGroup):
+    """Top-level group that loads subcommands on first use."""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        # Unloaded commands are None placeholders, so help listings and
+        # typo suggestions (which read self.commands) see every name
+        self.commands = {**dict.fromkeys(_LAZY_COMMANDS), **self.commands}
+
+    def get_command(
+        self, ctx: typer.Context, cmd_name: str
+    ) -> TyperCommand | TyperGroup | None:
+        cmd = self.commands.get(cmd_name)
+        if cmd is None and cmd_name in _LAZY_COMMANDS:
+            cmd = self.commands[cmd_name] = _load_command(cmd_name)
+        return cmd
+
+    def parse_args(self, ctx: typer.Context, args: list[str]) -> list[str]:
+        # _startup() runs before the subcommand parses its own options, so
+        # note a subcommand --help here to let it skip the config work
+        ctx.meta[_HELP_REQUESTED] = any(arg in ctx.help_option_names for arg in args)
+        return super().parse_args(ctx, args)
+
 
 app = typer.Typer(
     name="courriel",
     help="Personal email CLI tool for Microsoft365 and Gmail",
     no_args_is_help=True,
+    cls=_LazyGroup,
 )
 
-# Register command groups
-app.add_typer(commands.sync.app, name="sync")
-app.add_typer(commands.read.app, name="read")
-app.add_typer(commands.draft.app, name="draft")
-app.add_typer(commands.list.app, name="list")
-app.add_typer(commands.config.app, name="config")
-
-# Register search as a direct command (has a required argument)
-app.command(name="search")(commands.search.search)
-
 
 @app.callback()
-def _startup() -> None:
+def _startup(ctx: typer.Context) -> None:
     """Run once before any command.
 
     Handles one-time migrations (e.g. renaming legacy credential files
     to per-account names) so existing users aren't forced to re-authenticate.
+    Skipped when only help was asked for, for commands that don't use
+    credentials, and (without parsing the config) when no legacy files
+    are left to migrate.
     """
+    if ctx.meta.get(_HELP_REQUESTED) or ctx.invoked_subcommand in _NO_STARTUP_COMMANDS:
+        return
+    if not legacy_credentials_exist():
+        return
+    # No separate cache of account names: this parse happens only until
+    # the legacy files are moved, and load_config() memoizes it for the
+    # command that runs next.
     config = load_config()
     names = get_account_names(config)
     if names:
@@ -10,12 +10,14 @@ Usage:
     account = get_account(config, "work")
 """
 
+import functools
 import tomllib
-
-import tomli_w
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
 
 from .paths import CONFIG_FILE, ensure_config_dir
-from .schema import AccountConfig, CourrielConfig
+from .schema import AccountConfig, CourrielConfig, DefaultsConfig
 from .template import CONFIG_TEMPLATE
 
 # Re-export for convenience
@@ -24,21 +26,45 @@ __all__ = [
     "save_config",
     "init_config",
     "get_account",
+    "get_account_name",
     "get_account_names",
+    "split_config",
     "set_config_value",
+    "invalidate",
     "CONFIG_FILE",
 ]
 
-# Module-level cache for loaded config.
-# Avoids repeated disk reads during a single CLI invocation.
-_cached_config: CourrielConfig | None = None
+
+# Fields that should be integers
+_INT_FIELDS = frozenset({"max_messages", "days", "search_limit", "sync_concurrency"})
+
+# Fields that should be booleans
+_BOOL_FIELDS = frozenset({"sync_fsync"})
+
+
+def _parse_bool(value: str) -> bool:
+    """Convert a CLI string such as "true" or "no" to a bool."""
+    lowered = value.strip().lower()
+    if lowered in ("true", "yes", "on", "1"):
+        return True
+    if lowered in ("false", "no", "off", "0"):
+        return False
+    raise ValueError(f"Expected true or false, got {value!r}")
+
+
+# Field name -> converter from the CLI string; unlisted fields stay str
+_CONVERTERS: dict[str, Callable[[str], Any]] = {
+    **dict.fromkeys(_INT_FIELDS, int),
+    **dict.fromkeys(_BOOL_FIELDS, _parse_bool),
+}
 
 
 def load_config(*, force_reload: bool = False) -> CourrielConfig:
     """Load configuration from disk.
 
     Returns empty dict if config file doesn't exist.
-    Uses module-level caching to avoid repeated disk reads.
+    The parsed config is cached in memory and reused until the file's
+    mtime or size changes.
 
     Args:
         force_reload: Bypass cache and read from disk (useful after saving).
@@ -46,38 +72,49 @@ def load_config(*, force_reload: bool = False) -> CourrielConfig:
     Returns:
         The configuration dictionary.
     """
-    global _cached_config
+    try:
+        stat = CONFIG_FILE.stat()
+    except FileNotFoundError:
+        return {}
+
+    if force_reload:
+        invalidate()
+    return _parse_config(CONFIG_FILE, stat.st_mtime_ns, stat.st_size)
 
-    if _cached_config is not None and not force_reload:
-        return _cached_config
 
-    if not CONFIG_FILE.exists():
-        _cached_config = {}
-        return _cached_config
+# Keyed by the file's stat as well as its path: a stat() per load_config()
+# call is far cheaper than re-parsing TOML, and still picks up edits made
+# to the file (by the user or another courriel process) while we run.
+@functools.lru_cache(maxsize=1)
+def _parse_config(path: Path, mtime_ns: int, size: int) -> CourrielConfig:
+    """Parse the config file (memoized per path, mtime and size)."""
+    # Read the whole file in one call and parse it from memory
+    return tomllib.loads(path.read_bytes().decode("utf-8"))
 
-    with open(CONFIG_FILE, "rb") as f:
-        _cached_config = tomllib.load(f)
 
-    return _cached_config
+def invalidate() -> None:
+    """Drop the cached config so the next load_config() re-reads the file."""
+    _parse_config.cache_clear()
 
 
 def save_config(config: CourrielConfig) -> None:
     """Save configuration to disk.
 
-    Creates config directory if needed. Updates the module cache.
+    Creates config directory if needed. Drops the cached config, so the
+    next load_config() reads what was saved.
 
     Args:
         config: The configuration dictionary to save.
     """
-    global _cached_config
+    # Imported here: every command loads the config, few ever write it
+    import tomli_w
 
     ensure_config_dir()
 
     with open(CONFIG_FILE, "wb") as f:
         tomli_w.dump(config, f)
 
-    # Keep cache in sync with disk
-    _cached_config = config
+    invalidate()
 
 
 def init_config(*, overwrite: bool = False) -> bool:
@@ -98,6 +135,7 @@ def init_config(*, overwrite: bool = False) -> bool:
         return False
 
     CONFIG_FILE.write_text(CONFIG_TEMPLATE)
+    invalidate()
     return True
 
 
@@ -113,6 +151,9 @@ def get_account(
     Returns:
         The account configuration, or None if not found.
     """
+    # Not memoized: this is a single dict lookup on a config that is itself
+    # cached by load_config(), and config dicts are mutable (and their id()
+    # reused), so a cache keyed on them would cost more and could go stale.
     accounts = config.get("accounts", {})
 
     if not accounts:
@@ -125,6 +166,24 @@ def get_account(
     return accounts.get(name)
 
 
+def get_account_name(config: CourrielConfig, name: str | None = None) -> str:
+    """Resolve the account name used for credentials and sync state.
+
+    Pairs with get_account(): the same name=None default picks the
+    first configured account.
+
+    Args:
+        config: The loaded configuration dictionary.
+        name: Account name given on the command line, if any.
+
+    Returns:
+        name if given, else the first account's name, else "default".
+    """
+    if name:
+        return name
+    return next(iter(config.get("accounts", {})), "default")
+
+
 def get_account_names(config: CourrielConfig) -> list[str]:
     """Get list of configured account names.
 
@@ -134,7 +193,35 @@ def get_account_names(config: CourrielConfig) -> list[str]:
     Returns:
         List of account names, may be empty.
     """
-    return list(config.get("accounts", {}).keys())
+    return list(config.get("accounts", {}))
+
+
+def split_config(
+    config: CourrielConfig,
+) -> tuple[DefaultsConfig, dict[str, AccountConfig]]:
+    """Return the defaults and accounts tables of a config in one step.
+
+    Commands that need both (and look up several accounts) can use the
+    returned dicts directly instead of repeated get_account() calls.
+
+    Args:
+        config: The loaded configuration dictionary.
+
+    Returns:
+        Tuple of (defaults, accounts); missing tables are returned empty.
+
+    Raises:
+        ValueError: If either key is present but is not a TOML table.
+    """
+    defaults = config.get("defaults", {})
+    accounts = config.get("accounts", {})
+
+    if not isinstance(defaults, dict):
+        raise ValueError("'defaults' in config.toml must be a table")
+    if not isinstance(accounts, dict):
+        raise ValueError("'accounts' in config.toml must be a table")
+
+    return defaults, accounts
 
 
 def set_config_value(key: str, value: str) -> None:
@@ -151,7 +238,9 @@ def set_config_value(key: str, value: str) -> None:
     Raises:
         ValueError: If value cannot be converted to expected type.
     """
-    config = load_config(force_reload=True)
+    # Start from a fresh parse: the dict is modified in place below
+    invalidate()
+    config = load_config()
 
     parts = key.split(".")
 
@@ -170,25 +259,21 @@ def set_config_value(key: str, value: str) -> None:
     save_config(config)
 
 
-def _convert_value(key: str, value: str) -> str | int:
+def _convert_value(key: str, value: str) -> str | int | bool:
     """Convert string value to appropriate type based on field name.
 
-    Known integer fields are converted to int, everything else stays str.
+    Known integer and boolean fields are converted, everything else
+    stays str.
 
     Args:
         key: The field name (last part of dot notation key).
         value: The string value from CLI.
 
     Returns:
-        Converted value (int for known numeric fields, str otherwise).
+        Converted value (int or bool for known fields, str otherwise).
 
     Raises:
         ValueError: If value cannot be converted to expected type.
     """
-    # Fields that should be integers
-    int_fields = {"max_messages", "days", "search_limit"}
-
-    if key in int_fields:
-        return int(value)
-
-    return value
+    converter = _CONVERTERS.get(key)
+    return converter(value) if converter is not None else value
@@ -5,7 +5,8 @@ Follows the XDG Base Directory specification:
 - Credentials: ~/.config/courriel/credentials/ (with restricted permissions)
 """
 
-import shutil
+import os
+import tempfile
 from pathlib import Path
 
 
@@ -46,13 +47,29 @@ def ms365_cache_file(account_name: str) -> Path:
     return CREDENTIALS_DIR / f"ms365_cache_{account_name}.json"
 
 
+def legacy_credentials_exist() -> bool:
+    """Whether any pre-per-account credential file is still present.
+
+    Lets callers skip loading the config for migrate_credential_files()
+    in the common case where there is nothing to migrate.
+    """
+    return _LEGACY_GMAIL_TOKEN.exists() or _LEGACY_MS365_CACHE.exists()
+
+
 def migrate_credential_files(account_names: list[str]) -> None:
     """One-time migration: rename legacy credential files to per-account names.
 
     If the old ``gmail_token.json`` exists and no per-account files exist yet,
-    copy it to ``gmail_token_{first_account}.json``.  Same for MS365.
+    move it to ``gmail_token_{first_account}.json``.  Same for MS365.
     This avoids forcing re-authentication for existing users.
 
+    Runs on every CLI invocation. Files are renamed rather than copied:
+    the rename is a single metadata operation (both paths are in the
+    credentials directory), and once the legacy file is gone later runs
+    stop at the exists() check. If the per-account file already exists
+    (e.g. left by an earlier copy-based migration), it is kept and the
+    legacy file is removed, so the check doesn't keep firing.
+
     Args:
         account_names: List of account names from config (e.g. ["personal"]).
     """
@@ -61,19 +78,20 @@ def migrate_credential_files(account_names: list[str]) -> None:
 
     first = account_names[0]
 
-    # Migrate Gmail token
-    if _LEGACY_GMAIL_TOKEN.exists():
-        target = gmail_token_file(first)
-        if not target.exists():
-            shutil.copy2(_LEGACY_GMAIL_TOKEN, target)
-            target.chmod(0o600)
+    _migrate_file(_LEGACY_GMAIL_TOKEN, gmail_token_file(first))
+    _migrate_file(_LEGACY_MS365_CACHE, ms365_cache_file(first))
 
-    # Migrate MS365 cache
-    if _LEGACY_MS365_CACHE.exists():
-        target = ms365_cache_file(first)
-        if not target.exists():
-            shutil.copy2(_LEGACY_MS365_CACHE, target)
-            target.chmod(0o600)
+
+def _migrate_file(legacy: Path, target: Path) -> None:
+    """Move legacy to target, or drop legacy if target already exists."""
+    if not legacy.exists():
+        return
+    if target.exists():
+        # The per-account file is the one in use; never overwrite it
+        legacy.unlink()
+    else:
+        os.replace(legacy, target)
+        os.chmod(target, 0o600)
 
 
 def ensure_config_dir() -> Path:
@@ -85,15 +103,60 @@ def ensure_config_dir() -> Path:
     return CONFIG_DIR
 
 
+# Directories already created with the right permissions in this process
+_ENSURED_DIRS: set[Path] = set()
+
+
 def ensure_credentials_dir() -> Path:
     """Create credentials directory with restricted permissions.
 
     Sets directory permissions to 700 (owner read/write/execute only)
     to protect sensitive token data.
 
+    Only touches the filesystem once per process: token saves call this
+    on every refresh, and the directory doesn't go away while we run.
+
     Returns the credentials directory path.
     """
+    # Keyed by path rather than a bool so a relocated CREDENTIALS_DIR
+    # (e.g. in tests) is still created
+    if CREDENTIALS_DIR in _ENSURED_DIRS:
+        return CREDENTIALS_DIR
+
     CREDENTIALS_DIR.mkdir(parents=True, exist_ok=True)
     # Restrictive permissions: only owner can read/write/execute
     CREDENTIALS_DIR.chmod(0o700)
+    _ENSURED_DIRS.add(CREDENTIALS_DIR)
     return CREDENTIALS_DIR
+
+
+def write_private_file(path: Path, data: str) -> None:
+    """Atomically write a file readable only by its owner (mode 600).
+
+    Writes to a uniquely named temporary file next to the target, fsyncs
+    it, then renames it over the target with os.replace (atomic on POSIX
+    and Windows). Each writer has its own temporary file, so two courriel
+    processes refreshing the same token at once each replace the target
+    with a complete file; the last rename wins.
+
+    Args:
+        path: Destination file path.
+        data: Text content to write (UTF-8).
+    """
+    # mkstemp creates the file with mode 600, so the secret is never
+    # world-readable, and O_EXCL with a random name, so no other writer
+    # shares it
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        # Don't leave the partial temporary file behind
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
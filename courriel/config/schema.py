@@ -14,13 +14,18 @@ class DefaultsConfig(TypedDict, total=False):
         max_messages: Maximum number of messages to sync per folder.
         days: Number of days of history to sync.
         search_limit: Maximum number of search results (default: 50).
-        search_output: Default search output format: json, summary, files.
+        search_output: Default search output format: json, ndjson, summary, files.
+        sync_concurrency: Number of labels synced at the same time (default: 3).
+        sync_fsync: fsync each downloaded message before filing it
+            (default: false).
     """
 
     max_messages: int
     days: int
     search_limit: int
     search_output: str
+    sync_concurrency: int
+    sync_fsync: bool
 
 
 class AccountConfig(TypedDict, total=False):
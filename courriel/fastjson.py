@@ -0,0 +1,96 @@
+"""JSON helpers that use orjson when it is installed.
+
+orjson is an optional dependency (pip install "courriel[fast]"). It parses
+and serializes several times faster than the stdlib json module, which
+matters for large token caches and JSON output. Without it we fall back
+to the stdlib; the data is the same, only whitespace and escaping of
+non-ASCII characters in command output may differ.
+
+dumps() produces compact output (no indentation or spaces after
+separators) unless asked to indent. write() is for command output and
+can indent too.
+"""
+
+import json
+from collections.abc import Iterable
+from typing import TextIO
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def loads(data: str | bytes):
+    """Parse a JSON document from str or bytes.
+
+    Raises:
+        ValueError: If data is not valid JSON (json.JSONDecodeError and
+            orjson.JSONDecodeError are both ValueError subclasses).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, *, indent: bool = False) -> str:
+    """Serialize obj to a JSON string.
+
+    Args:
+        obj: JSON-serializable object.
+        indent: Indent nested structures by two spaces instead of
+            producing compact output.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def write(obj, stream: TextIO, *, indent: bool = False) -> None:
+    """Write obj to a text stream as JSON, followed by a newline.
+
+    See write_lines() for the formatting rules.
+
+    Args:
+        obj: JSON-serializable object.
+        stream: Text stream, usually sys.stdout.
+        indent: Indent nested structures by two spaces.
+    """
+    write_lines((obj,), stream, indent=indent)
+
+
+def write_lines(objs: Iterable, stream: TextIO, *, indent: bool = False) -> None:
+    """Write each object as JSON followed by a newline (e.g. NDJSON).
+
+    Objects are encoded one at a time, so memory use doesn't depend on
+    how many there are. With orjson, each document is encoded to UTF-8
+    bytes and written to the stream's binary buffer. Without it, the
+    stdlib encoder writes text: indented output keeps json.dump()'s usual
+    formatting, and unindented output is compact.
+
+    Args:
+        objs: Iterable of JSON-serializable objects.
+        stream: Text stream, usually sys.stdout.
+        indent: Indent nested structures by two spaces.
+    """
+    buffer = getattr(stream, "buffer", None)
+    if orjson is not None and buffer is not None:
+        option = orjson.OPT_APPEND_NEWLINE
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        # Flush pending text first so output stays in order
+        stream.flush()
+        for obj in objs:
+            buffer.write(orjson.dumps(obj, option=option))
+        return
+
+    if indent:
+        kwargs = {"indent": 2}
+    else:
+        kwargs = {"separators": (",", ":")}
+    for obj in objs:
+        json.dump(obj, stream, **kwargs)
+        stream.write("\n")
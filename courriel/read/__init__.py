@@ -5,23 +5,35 @@ EmailMessage objects. Uses Python's email.parser module directly —
 no notmuch dependency needed for reading.
 """
 
+import functools
+import re
 from datetime import datetime, timezone
 from email import policy
 from email.header import decode_header, make_header
-from email.parser import BytesParser
-from email.utils import parsedate_to_datetime
+from email.message import Message
+from email.parser import BytesHeaderParser, BytesParser
+from email.utils import getaddresses, parsedate_to_datetime, quote
 from pathlib import Path
 
 from courriel.read.models import EmailMessage
 
 __all__ = ["EmailMessage", "read_message"]
 
+# Display names containing these must be quoted to stay one address
+_NAME_SPECIALS = re.compile(r'[][\\()<>@,:;".]')
 
-def read_message(path: Path) -> EmailMessage:
+# Read size for headers_only parsing; enough for almost any header block
+_HEADER_CHUNK_SIZE = 16384
+
+
+def read_message(path: Path, *, headers_only: bool = False) -> EmailMessage:
     """Parse a Maildir email file into an EmailMessage.
 
     Args:
         path: Path to the RFC 2822 email file.
+        headers_only: Parse only the header block. The body is never
+            read, so body_plain and body_html are None and attachments
+            is empty.
 
     Returns:
         EmailMessage with parsed headers, body, and attachment metadata.
@@ -30,17 +42,61 @@ def read_message(path: Path) -> EmailMessage:
         FileNotFoundError: If the file doesn't exist.
         ValueError: If the file can't be parsed as an email.
     """
-    raw_bytes = path.read_bytes()
+    # The compat32 policy handles real-world malformed emails better
+    # than the "email" policy.
+    if headers_only:
+        parser = BytesHeaderParser(policy=policy.compat32)
+        msg = parser.parsebytes(_read_header_block(path))
+        body_plain, body_html, attachments = None, None, []
+    else:
+        parser = BytesParser(policy=policy.compat32)
+        msg = parser.parsebytes(path.read_bytes())
+        body_plain, body_html, attachments = _extract_bodies(msg)
+
+    return EmailMessage(
+        file=str(path),
+        # Parse date — fall back to epoch if missing/malformed
+        date=_parse_date(msg.get("Date", "")),
+        from_addr=_decode_header_value(msg.get("From", "")),
+        to_addrs=_parse_address_list(_decode_header_value(msg.get("To", ""))),
+        cc_addrs=_parse_address_list(_decode_header_value(msg.get("Cc", ""))),
+        bcc_addrs=_parse_address_list(_decode_header_value(msg.get("Bcc", ""))),
+        subject=_decode_header_value(msg.get("Subject", "")),
+        message_id=msg.get("Message-ID", ""),
+        in_reply_to=msg.get("In-Reply-To"),
+        body_plain=body_plain,
+        body_html=body_html,
+        attachments=attachments,
+    )
 
-    # BytesParser with the default (compat32) policy handles
-    # real-world malformed emails better than the "email" policy.
-    parser = BytesParser(policy=policy.compat32)
-    msg = parser.parsebytes(raw_bytes)
 
-    # Parse date — fall back to epoch if missing/malformed
-    date = _parse_date(msg.get("Date", ""))
+def _read_header_block(path: Path) -> bytes:
+    """Read a message file up to the blank line that ends its headers.
 
-    # Walk MIME parts to extract bodies and attachment metadata
+    Headers are usually a few KB while bodies and attachments can be
+    megabytes, so the file is read in chunks and the rest is never
+    loaded. A file with no blank line is returned whole.
+    """
+    data = b""
+    with open(path, "rb") as f:
+        while chunk := f.read(_HEADER_CHUNK_SIZE):
+            # Re-scan a few bytes before the chunk: the separator may
+            # straddle two reads
+            scan_from = max(len(data) - 3, 0)
+            data += chunk
+            for separator in (b"\n\n", b"\r\n\r\n"):
+                end = data.find(separator, scan_from)
+                if end != -1:
+                    return data[: end + len(separator)]
+    return data
+
+
+def _extract_bodies(msg: Message) -> tuple[str | None, str | None, list[dict]]:
+    """Walk MIME parts to extract bodies and attachment metadata.
+
+    Returns:
+        (body_plain, body_html, attachments) tuple.
+    """
     body_plain = None
     body_html = None
     attachments: list[dict] = []
@@ -59,12 +115,11 @@ def read_message(path: Path) -> EmailMessage:
             if "attachment" in disposition or (
                 part.get_filename() and content_type not in ("text/plain", "text/html")
             ):
-                payload = part.get_payload(decode=True)
                 attachments.append(
                     {
                         "filename": part.get_filename() or "unnamed",
                         "content_type": content_type,
-                        "size": len(payload) if payload else 0,
+                        "size": _attachment_size(part),
                     }
                 )
             elif content_type == "text/plain" and body_plain is None:
@@ -89,20 +144,28 @@ def read_message(path: Path) -> EmailMessage:
             else:
                 body_plain = text
 
-    return EmailMessage(
-        file=str(path),
-        date=date,
-        from_addr=_decode_header_value(msg.get("From", "")),
-        to_addrs=_parse_address_list(_decode_header_value(msg.get("To", ""))),
-        cc_addrs=_parse_address_list(_decode_header_value(msg.get("Cc", ""))),
-        bcc_addrs=_parse_address_list(_decode_header_value(msg.get("Bcc", ""))),
-        subject=_decode_header_value(msg.get("Subject", "")),
-        message_id=msg.get("Message-ID", ""),
-        in_reply_to=msg.get("In-Reply-To"),
-        body_plain=body_plain,
-        body_html=body_html,
-        attachments=attachments,
-    )
+    return body_plain, body_html, attachments
+
+
+def _attachment_size(part: Message) -> int:
+    """Decoded size of an attachment part in bytes.
+
+    Only the size is shown, so base64 payloads (nearly all attachments)
+    are measured from their encoded length instead of being decoded,
+    which for a large attachment costs a copy of every byte. Other
+    transfer encodings are rare and decoded as before.
+    """
+    payload = part.get_payload()
+    encoding = str(part.get("Content-Transfer-Encoding", "")).strip().lower()
+    if encoding != "base64" or not isinstance(payload, str):
+        decoded = part.get_payload(decode=True)
+        return len(decoded) if decoded else 0
+
+    # Every 4 base64 characters encode 3 bytes, less trailing padding
+    chars = len(payload) - sum(payload.count(ws) for ws in "\r\n\t ")
+    tail = payload[-8:].rstrip()
+    padding = len(tail) - len(tail.rstrip("="))
+    return max(chars * 3 // 4 - padding, 0)
 
 
 def _decode_header_value(value: str) -> str:
@@ -112,8 +175,13 @@ def _decode_header_value(value: str) -> str:
     return str(make_header(decode_header(value)))
 
 
+@functools.lru_cache(maxsize=1024)
 def _parse_date(date_str: str) -> datetime:
-    """Parse an RFC 2822 date string, falling back to epoch on failure."""
+    """Parse an RFC 2822 date string, falling back to epoch on failure.
+
+    Cached because messages in a thread often repeat Date headers, and
+    datetimes are immutable so sharing them is safe.
+    """
     if not date_str:
         return datetime(1970, 1, 1, tzinfo=timezone.utc)
     try:
@@ -123,12 +191,36 @@ def _parse_date(date_str: str) -> datetime:
 
 
 def _parse_address_list(header: str) -> list[str]:
-    """Split a comma-separated address header into individual addresses.
+    """Split an address header into individual addresses.
 
     Keeps the full "Name <email>" format for each address.
     Returns an empty list for empty/missing headers.
     """
     if not header:
         return []
-    # Split on commas, but respect quoted strings and angle brackets
-    return [addr.strip() for addr in header.split(",") if addr.strip()]
+    return list(_split_addresses(header))
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_addresses(header: str) -> tuple[str, ...]:
+    """Parse an address header into formatted addresses.
+
+    getaddresses() understands quoting, so '"Doe, Jane" <j@x>' stays a
+    single address. The same To/Cc headers recur across a thread, so
+    results are cached; a tuple keeps callers from mutating the cache.
+    """
+    addresses = []
+    for name, addr in getaddresses([header]):
+        if not addr:
+            # Unparseable entries keep whatever name was found
+            if name:
+                addresses.append(name)
+            continue
+        if not name:
+            addresses.append(addr)
+            continue
+        # Not formataddr(): it would MIME-encode non-ASCII names
+        if _NAME_SPECIALS.search(name):
+            name = f'"{quote(name)}"'
+        addresses.append(f"{name} <{addr}>")
+    return tuple(addresses)
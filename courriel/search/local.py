@@ -5,10 +5,13 @@ in Maildir format. We use subprocess instead of Python bindings for
 easier installation and maintenance.
 """
 
+import html as html_lib
 import json
 import re
 import shutil
 import subprocess
+import threading
+from collections.abc import Iterator
 from datetime import datetime
 from email.utils import parsedate_to_datetime
 from pathlib import Path
@@ -16,6 +19,27 @@ from pathlib import Path
 from .models import SearchResult
 
 
+# Message IDs per notmuch show call. Keeps the OR query well under the
+# command-line length limit, and caps the notmuch output (bodies
+# included) held at once to one batch's worth.
+_SHOW_BATCH_SIZE = 100
+
+# Characters of body text kept in SearchResult.snippet
+_SNIPPET_LENGTH = 200
+
+# Used by _strip_html(): <script>/<style> blocks with their contents,
+# then any remaining tag
+_HIDDEN_BLOCK_RE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", re.DOTALL | re.I)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Set once check_notmuch_available() has succeeded in this process
+_notmuch_checked = False
+# Absolute path of the notmuch binary, found by check_notmuch_available().
+# Spawning by full path spares every notmuch call the $PATH search.
+_notmuch_bin = "notmuch"
+_notmuch_check_lock = threading.Lock()
+
+
 class NotmuchError(Exception):
     """Error from notmuch command."""
 
@@ -37,27 +61,45 @@ class NotmuchDatabaseError(NotmuchError):
 def check_notmuch_available() -> None:
     """Check if notmuch is installed and database exists.
 
+    The check searches $PATH and spawns notmuch, so it only runs until
+    it first succeeds; later calls in the same process (e.g. one search
+    per account) return immediately. The binary's path found here is
+    used for every later notmuch call.
+
     Raises:
         NotmuchNotFoundError: If notmuch binary is not found.
         NotmuchDatabaseError: If notmuch database is not initialized.
     """
-    if not shutil.which("notmuch"):
-        raise NotmuchNotFoundError(
-            "notmuch not found. Install with: apt install notmuch"
+    global _notmuch_checked, _notmuch_bin
+    if _notmuch_checked:
+        return
+
+    # Accounts are searched from several threads; check only once
+    with _notmuch_check_lock:
+        if _notmuch_checked:
+            return
+
+        notmuch_bin = shutil.which("notmuch")
+        if not notmuch_bin:
+            raise NotmuchNotFoundError(
+                "notmuch not found. Install with: apt install notmuch"
+            )
+
+        # Check if database exists (notmuch stores it in the mail root)
+        # We check by running notmuch count which fails if no database
+        result = subprocess.run(
+            [notmuch_bin, "count", "*"],
+            capture_output=True,
+            text=True,
         )
+        if result.returncode != 0:
+            stderr = result.stderr.lower()
+            if "database" in stderr or "no mail" in stderr:
+                raise NotmuchDatabaseError("Run 'notmuch new' to index your mail")
+            # Other error - might still be usable
 
-    # Check if database exists (notmuch stores it in the mail root)
-    # We check by running notmuch count which fails if no database
-    result = subprocess.run(
-        ["notmuch", "count", "*"],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        if "database" in result.stderr.lower() or "no mail" in result.stderr.lower():
-            raise NotmuchDatabaseError("Run 'notmuch new' to index your mail")
-        # Other error - might still be usable
-        pass
+        _notmuch_bin = notmuch_bin
+        _notmuch_checked = True
 
 
 def search_local(
@@ -65,17 +107,23 @@ def search_local(
     mail_dir: Path,
     account_name: str,
     limit: int = 50,
-) -> list[SearchResult]:
+    with_body: bool = True,
+) -> Iterator[SearchResult]:
     """Search local mail using notmuch.
 
+    The notmuch calls run before this returns, so errors are raised here.
+
     Args:
         query: notmuch query string (e.g., "from:alice@example.com")
         mail_dir: Path to account's mail directory (e.g., ~/Mail/Gmail-capcor)
         account_name: Account name for result attribution
         limit: Maximum number of results to return
+        with_body: Read message bodies for snippet and attachments. Without
+            them notmuch skips the MIME decoding and the results have an
+            empty snippet and no attachments.
 
     Returns:
-        List of SearchResult objects matching the query.
+        Iterator over matching SearchResult objects, newest first.
 
     Raises:
         NotmuchNotFoundError: If notmuch is not installed.
@@ -94,10 +142,10 @@ def search_local(
     message_ids = _get_message_ids(scoped_query, limit)
 
     if not message_ids:
-        return []
+        return iter(())
 
-    # Step 2: Fetch all message data in a single batched call
-    return _get_messages_batch(message_ids, account_name)
+    # Step 2: Fetch all message data in batched calls
+    return _get_messages_batch(message_ids, account_name, with_body)
 
 
 def _get_message_ids(query: str, limit: int) -> list[str]:
@@ -107,7 +155,7 @@ def _get_message_ids(query: str, limit: int) -> list[str]:
     """
     result = subprocess.run(
         [
-            "notmuch",
+            _notmuch_bin,
             "search",
             "--format=json",
             "--output=messages",
@@ -116,54 +164,93 @@ def _get_message_ids(query: str, limit: int) -> list[str]:
             query,
         ],
         capture_output=True,
-        text=True,
     )
 
     if result.returncode != 0:
-        raise NotmuchError(result.stderr.strip() or "notmuch search failed")
+        raise NotmuchError(_error_message(result.stderr, "notmuch search failed"))
 
-    try:
-        # Output is a JSON array of message IDs
-        return json.loads(result.stdout) if result.stdout.strip() else []
-    except json.JSONDecodeError as e:
-        raise NotmuchError(f"Failed to parse notmuch output: {e}")
+    return _load_json(result.stdout)
 
 
 def _get_messages_batch(
-    message_ids: list[str], account_name: str
-) -> list[SearchResult]:
-    """Fetch all messages in a single notmuch show call via OR query.
-
-    Collapses N per-message subprocess calls into one, keeping the
-    order that notmuch returns (which matches the sorted ID list from
+    message_ids: list[str], account_name: str, with_body: bool = True
+) -> Iterator[SearchResult]:
+    """Fetch messages with one notmuch show call per batch of IDs.
+
+    Each batch is a single OR query, so N messages cost one subprocess
+    (and one database open) per _SHOW_BATCH_SIZE IDs instead of one per
+    message. notmuch returns matches grouped by thread, so results are
+    put back in the order of message_ids (newest first, from
     _get_message_ids).
+
+    Each batch is parsed into SearchResults before the next one runs, so
+    the decoded JSON (with full message bodies) of only one batch is in
+    memory at a time. The results themselves, which keep just a short
+    snippet, are all built before this returns: search_local() runs in a
+    worker thread per account, and the notmuch calls must happen there
+    rather than in whoever consumes the iterator.
+    """
+    results: dict[str, SearchResult] = {}
+    for start in range(0, len(message_ids), _SHOW_BATCH_SIZE):
+        batch = message_ids[start : start + _SHOW_BATCH_SIZE]
+        for message in _iter_thread_messages(_show(batch, with_body)):
+            result = _parse_message(message, account_name)
+            results[result.id] = result
+
+    return _iter_results(message_ids, results)
+
+
+def _show(message_ids: list[str], with_body: bool = True) -> list:
+    """Run notmuch show for the given message IDs and parse its JSON.
+
+    --entire-thread=false limits the output to the requested messages;
+    by default JSON output includes every message of their threads.
     """
-    # Build an OR query so notmuch fetches all messages at once
-    id_query = " OR ".join(f"id:{mid}" for mid in message_ids)
+    id_query = " OR ".join(_id_term(mid) for mid in message_ids)
     result = subprocess.run(
-        ["notmuch", "show", "--format=json", "--body=true", id_query],
+        [
+            _notmuch_bin,
+            "show",
+            "--format=json",
+            "--entire-thread=false",
+            f"--body={'true' if with_body else 'false'}",
+            id_query,
+        ],
         capture_output=True,
-        text=True,
     )
     if result.returncode != 0:
-        raise NotmuchError(result.stderr.strip() or "notmuch show failed")
+        raise NotmuchError(_error_message(result.stderr, "notmuch show failed"))
+    return _load_json(result.stdout)
+
+
+def _load_json(stdout: bytes) -> list:
+    """Parse notmuch JSON output, kept as bytes.
+
+    notmuch writes UTF-8 and json.loads() accepts bytes, so output (with
+    full message bodies for show) isn't first decoded into a str copy.
+    """
     try:
-        data = json.loads(result.stdout)
-    except json.JSONDecodeError as e:
+        # Output is a JSON array (of message IDs for search, threads for show)
+        return json.loads(stdout) if stdout.strip() else []
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
         raise NotmuchError(f"Failed to parse notmuch output: {e}")
 
-    results = []
-    for thread in data:  # data is a list of threads
-        msg = _parse_message_json([thread], account_name)
-        if msg:
-            results.append(msg)
-    return results
+
+def _error_message(stderr: bytes, default: str) -> str:
+    """Decode notmuch's stderr for an error message."""
+    return stderr.decode("utf-8", "replace").strip() or default
+
+
+def _id_term(message_id: str) -> str:
+    """Build an id: query term, quoted so any Message-ID is matched exactly."""
+    return 'id:"{}"'.format(message_id.replace('"', '""'))
 
 
-def _parse_message_json(data: list, account_name: str) -> SearchResult | None:
-    """Parse notmuch show JSON output into a SearchResult.
+def _iter_thread_messages(threads: list) -> Iterator[dict]:
+    """Yield every message in notmuch show output.
 
-    notmuch show returns a nested structure:
+    notmuch show returns a list of threads, each a list of
+    [message, replies] pairs where replies has the same shape:
     [
       [
         [
@@ -172,14 +259,29 @@ def _parse_message_json(data: list, account_name: str) -> SearchResult | None:
         ]
       ]
     ]
+    Messages left out by --entire-thread=false appear as null.
     """
-    # Navigate the nested structure to get the message
-    # Structure: list of threads -> list of messages -> (message, replies)
-    if not data or not data[0] or not data[0][0]:
-        return None
-
-    message = data[0][0][0]  # First thread, first message pair, message itself
-
+    pending = list(threads)
+    while pending:
+        for message, replies in pending.pop():
+            if message:
+                yield message
+            if replies:
+                pending.append(replies)
+
+
+def _iter_results(
+    message_ids: list[str], results: dict[str, SearchResult]
+) -> Iterator[SearchResult]:
+    """Yield the SearchResult of each found message, in message_ids order."""
+    for message_id in message_ids:
+        result = results.get(message_id)
+        if result is not None:
+            yield result
+
+
+def _parse_message(message: dict, account_name: str) -> SearchResult:
+    """Parse one message from notmuch show JSON output into a SearchResult."""
     headers = message.get("headers", {})
     body_parts = message.get("body", [])
 
@@ -224,6 +326,11 @@ def _parse_email_date(date_str: str) -> datetime:
     Examples:
         "Mon, 15 Jan 2024 10:00:00 +0000"
         "15 Jan 2024 10:00:00 -0500"
+
+    parsedate_to_datetime() uses the lightweight tokenizer in
+    email._parseaddr, not the slow email._header_value_parser, so a
+    hand-written regex parser for the common layout isn't meaningfully
+    faster and would need a fallback for everything else.
     """
     return parsedate_to_datetime(date_str)
 
@@ -235,65 +342,83 @@ def _extract_body_and_attachments(
 
     Walks through MIME parts to find text content and attachments.
     Returns a ~200 char snippet of the body text.
+
+    Text parts stop being collected once there is enough for the
+    snippet, and HTML parts are only stripped when there is no plain
+    text at all; attachments are always listed in full.
     """
-    text_content = []
+    text_content: list[str] = []
+    text_length = 0
+    html_parts: list[str] = []
     attachments = []
 
-    def walk_parts(parts: list) -> None:
-        for part in parts:
-            content_type = part.get("content-type", "")
-
-            # Handle nested multipart
-            if "content" in part and isinstance(part["content"], list):
-                walk_parts(part["content"])
-                continue
-
-            # Check for attachment
-            filename = part.get("filename")
-            if filename:
-                attachments.append(filename)
-                continue
-
-            # Extract text content
-            if content_type.startswith("text/plain"):
-                content = part.get("content", "")
-                if isinstance(content, str):
-                    text_content.append(content)
-            elif content_type.startswith("text/html") and not text_content:
-                # Use HTML only if no plain text available
-                content = part.get("content", "")
-                if isinstance(content, str):
-                    text_content.append(_strip_html(content))
-
-    walk_parts(body_parts)
+    # Explicit stack instead of recursion; parts are pushed in reverse
+    # so they are visited in document order
+    pending = list(reversed(body_parts))
+    while pending:
+        part = pending.pop()
+        content = part.get("content", "")
+
+        # Handle nested multipart
+        if isinstance(content, list):
+            pending.extend(reversed(content))
+            continue
+
+        # Check for attachment
+        filename = part.get("filename")
+        if filename:
+            attachments.append(filename)
+            continue
+
+        if not isinstance(content, str):
+            continue
+
+        # Extract text content
+        content_type = part.get("content-type", "")
+        if content_type.startswith("text/plain"):
+            if text_length < _SNIPPET_LENGTH:
+                text_content.append(content)
+                text_length += len(content)
+        elif content_type.startswith("text/html") and not text_content:
+            html_parts.append(content)
+
+    # Use HTML only if no plain text available
+    if not text_content:
+        for html in html_parts:
+            text = _strip_html(html)
+            text_content.append(text)
+            text_length += len(text)
+            if text_length >= _SNIPPET_LENGTH:
+                break
 
     # Combine text and create snippet
     full_text = " ".join(text_content)
-    snippet = _create_snippet(full_text, max_length=200)
+    snippet = _create_snippet(full_text, max_length=_SNIPPET_LENGTH)
 
     return snippet, attachments
 
 
 def _strip_html(html: str) -> str:
     """Remove HTML tags from a string."""
-    # Remove script and style content entirely
-    html = re.sub(r"<script[^>]*>.*?</script>", "", html, flags=re.DOTALL | re.I)
-    html = re.sub(r"<style[^>]*>.*?</style>", "", html, flags=re.DOTALL | re.I)
-    # Remove all remaining tags
-    html = re.sub(r"<[^>]+>", " ", html)
-    # Decode common HTML entities
-    html = html.replace("&nbsp;", " ")
-    html = html.replace("&amp;", "&")
-    html = html.replace("&lt;", "<")
-    html = html.replace("&gt;", ">")
-    html = html.replace("&quot;", '"')
-    return html
+    # Remove script and style content entirely, then all remaining tags
+    text = _HIDDEN_BLOCK_RE.sub("", html)
+    text = _TAG_RE.sub(" ", text)
+    # Decode all named and numeric entities in one pass (&nbsp; becomes
+    # U+00A0, which _create_snippet() treats as whitespace)
+    return html_lib.unescape(text)
 
 
 def _create_snippet(text: str, max_length: int = 200) -> str:
     """Create a text snippet, truncating at word boundary."""
-    # Normalize whitespace
-    text = " ".join(text.split())
+    # Normalize whitespace in a bounded prefix only: bodies can be
+    # megabytes and all but the first few hundred characters are dropped.
+    # If the prefix was mostly whitespace and normalizes too short,
+    # normalize the whole text after all.
+    head = text[: max_length * 4]
+    normalized = " ".join(head.split())
+    if len(normalized) <= max_length and len(head) < len(text):
+        normalized = " ".join(text.split())
+    text = normalized
 
     if len(text) <= max_length:
         return text
@@ -4,12 +4,14 @@ from dataclasses import dataclass, field
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """A single search result from local or remote search.
 
     Represents an email message with metadata and a body snippet.
     Used by both local (notmuch) and remote (Gmail API) search backends.
+    Slotted: searches can hold thousands of these, and slots make each
+    one smaller and its attribute reads cheaper.
     """
 
     id: str  # Message ID (e.g., "abc123@example.com")
@@ -24,7 +26,13 @@ class SearchResult:
     attachments: list[str] = field(default_factory=list)  # Attachment filenames
 
     def to_dict(self) -> dict:
-        """Convert to dictionary for JSON serialization."""
+        """Convert to dictionary for JSON serialization.
+
+        A literal dict rather than dataclasses.asdict() or orjson's
+        dataclass support: the output renames from_addr/to_addrs to
+        "from"/"to" and formats the date with isoformat(), and a literal
+        is already the cheapest way to build that per result.
+        """
         return {
             "id": self.id,
             "account": self.account,
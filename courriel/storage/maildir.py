@@ -19,9 +19,12 @@ Flags are single uppercase letters (alphabetically sorted):
 - T: Trashed
 """
 
+import functools
 import os
 import socket
+import threading
 import time
+from collections.abc import Iterator
 from pathlib import Path
 
 
@@ -53,6 +56,23 @@ LABEL_FLAG_MAP = {
 # INBOX takes precedence over SENT, which takes precedence over DRAFT
 FOLDER_PRIORITY = ["INBOX", "SENT", "DRAFT", "TRASH", "SPAM"]
 
+# Gmail labels that never decide a message's folder
+_VIRTUAL_LABELS = frozenset(
+    {
+        "UNREAD",
+        "STARRED",
+        "IMPORTANT",
+        "CATEGORY_PERSONAL",
+        "CATEGORY_SOCIAL",
+        "CATEGORY_PROMOTIONS",
+        "CATEGORY_UPDATES",
+        "CATEGORY_FORUMS",
+    }
+)
+
+# Subdirectories every Maildir folder has
+_MAILDIR_SUBDIRS = frozenset({"cur", "new", "tmp"})
+
 
 class MaildirStorage:
     """Storage backend for Maildir format.
@@ -70,15 +90,28 @@ class MaildirStorage:
         )
     """
 
-    def __init__(self, base_path: Path):
+    def __init__(self, base_path: Path, fsync: bool = False):
         """Initialize Maildir storage.
 
         Args:
             base_path: Base directory for Maildir storage (e.g., ~/Mail/Personal).
                        Will be created if it doesn't exist.
+            fsync: Flush each message to disk before moving it out of tmp/,
+                so a crash can't leave a renamed but empty file. Slower;
+                off by default since messages can be downloaded again.
         """
         self._base_path = base_path.expanduser().resolve()
-        self._hostname = socket.gethostname()
+        self._fsync = fsync
+        # Maildir spec: "/" and ":" in the hostname are written as octal
+        # escapes, since they'd break the path or the info separator
+        self._hostname = (
+            socket.gethostname().replace("/", r"\057").replace(":", r"\072")
+        )
+        # Folder name -> path of folders ensure_folder() has created
+        self._ensured_folders: dict[str, Path] = {}
+        # Message ID -> path, built on first lookup (see _index)
+        self._id_index: dict[str, Path] | None = None
+        self._index_lock = threading.Lock()
 
     @property
     def base_path(self) -> Path:
@@ -89,7 +122,8 @@ class MaildirStorage:
         """Create a Maildir folder structure.
 
         Creates the folder with cur/, new/, tmp/ subdirectories as required
-        by the Maildir specification. Safe to call multiple times.
+        by the Maildir specification. Safe to call multiple times; only
+        the first call for a folder touches the disk.
 
         Args:
             folder_name: Folder name (e.g., "INBOX", "Sent", "Labels/MyLabel").
@@ -97,12 +131,18 @@ class MaildirStorage:
         Returns:
             Path to the folder directory.
         """
+        folder_path = self._ensured_folders.get(folder_name)
+        if folder_path is not None:
+            # Created earlier: skip the mkdir() calls for every message
+            return folder_path
+
         folder_path = self._base_path / folder_name
 
         # Create Maildir subdirectories
-        for subdir in ("cur", "new", "tmp"):
+        for subdir in _MAILDIR_SUBDIRS:
             (folder_path / subdir).mkdir(parents=True, exist_ok=True)
 
+        self._ensured_folders[folder_name] = folder_path
         return folder_path
 
     def label_to_folder(self, label_id: str) -> str:
@@ -117,13 +157,7 @@ class MaildirStorage:
         Returns:
             Maildir folder name (e.g., "INBOX", "Sent", "Labels/MyLabel").
         """
-        # Check if it's a known system label
-        if label_id in LABEL_FOLDER_MAP:
-            return LABEL_FOLDER_MAP[label_id]
-
-        # User labels go under Labels/ directory
-        # Strip any leading/trailing whitespace and use as-is
-        return f"Labels/{label_id}"
+        return _label_to_folder(label_id)
 
     def get_primary_folder(self, label_ids: list[str]) -> str:
         """Determine the primary folder for a message with multiple labels.
@@ -138,29 +172,7 @@ class MaildirStorage:
         Returns:
             The primary folder name for storing the message.
         """
-        # Check system labels in priority order
-        for label in FOLDER_PRIORITY:
-            if label in label_ids:
-                return self.label_to_folder(label)
-
-        # Fall back to first user label (excluding virtual labels like UNREAD)
-        virtual_labels = {
-            "UNREAD",
-            "STARRED",
-            "IMPORTANT",
-            "CATEGORY_PERSONAL",
-            "CATEGORY_SOCIAL",
-            "CATEGORY_PROMOTIONS",
-            "CATEGORY_UPDATES",
-            "CATEGORY_FORUMS",
-        }
-
-        for label in label_ids:
-            if label not in virtual_labels and label not in LABEL_FOLDER_MAP:
-                return self.label_to_folder(label)
-
-        # Ultimate fallback: archived emails (no standard folder label) belong in Archive
-        return "Archive"
+        return _primary_folder(tuple(label_ids))
 
     def labels_to_flags(self, label_ids: list[str]) -> str:
         """Convert Gmail labels to Maildir flags.
@@ -174,24 +186,7 @@ class MaildirStorage:
         Returns:
             Alphabetically sorted flag string (e.g., "FS" for Flagged+Seen).
         """
-        flags = set()
-
-        # Check for Seen flag (absence of UNREAD label)
-        if "UNREAD" not in label_ids:
-            flags.add("S")
-
-        # Check for other flags
-        if "STARRED" in label_ids:
-            flags.add("F")
-
-        if "DRAFT" in label_ids:
-            flags.add("D")
-
-        if "TRASH" in label_ids:
-            flags.add("T")
-
-        # Return alphabetically sorted flags
-        return "".join(sorted(flags))
+        return _labels_to_flags(tuple(label_ids))
 
     def generate_filename(self, message_id: str, flags: str) -> str:
         """Generate a Maildir-compliant filename for a message.
@@ -201,6 +196,12 @@ class MaildirStorage:
         The "2," prefix before flags indicates Maildir info2 format,
         which is the standard for storing flags in filenames.
 
+        Uniqueness comes from the message ID, which Gmail never reuses
+        within a mailbox, so the timestamp only needs second precision
+        and no per-delivery counter is added. The ID must stay the second
+        dot-separated field: the message index (see _index) reads it
+        from there.
+
         Args:
             message_id: Gmail message ID (used as unique identifier).
             flags: Maildir flags string (e.g., "FS").
@@ -224,6 +225,11 @@ class MaildirStorage:
         either new/ (unread) or cur/ (read). This prevents corruption
         if the process is interrupted.
 
+        That is four syscalls per message (open, write, close, rename;
+        plus fsync if enabled). The sync engine calls this while the next
+        batches download on other threads, so the writes overlap network
+        waits rather than adding to them.
+
         Args:
             folder: Target folder name (e.g., "INBOX").
             message_bytes: Raw RFC 2822 message content.
@@ -240,9 +246,23 @@ class MaildirStorage:
         flags = self.labels_to_flags(label_ids)
         filename = self.generate_filename(message_id, flags)
 
-        # Write to tmp first (atomic write pattern)
-        tmp_path = folder_path / "tmp" / filename
-        tmp_path.write_bytes(message_bytes)
+        # Write to tmp first (atomic write pattern). Paths are joined as
+        # strings, which is cheaper than pathlib's "/" once per message;
+        # only the returned destination is made a Path.
+        tmp_path = os.path.join(folder_path, "tmp", filename)
+        # O_EXCL: never write over another delivery's tmp file. Raw fd
+        # writes skip the buffered file object, which would only copy
+        # the message once more.
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            view = memoryview(message_bytes)
+            while view:
+                # os.write() may write less than asked for
+                view = view[os.write(fd, view) :]
+            if self._fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
 
         # Determine destination: new/ for unread, cur/ for read
         if "UNREAD" in label_ids:
@@ -250,19 +270,23 @@ class MaildirStorage:
         else:
             dest_dir = "cur"
 
-        dest_path = folder_path / dest_dir / filename
+        dest_path = Path(os.path.join(folder_path, dest_dir, filename))
 
         # Atomic move from tmp to destination
-        # os.rename is atomic on POSIX systems when src and dest are on same filesystem
-        os.rename(tmp_path, dest_path)
+        # os.replace is atomic when src and dest are on the same filesystem
+        os.replace(tmp_path, dest_path)
 
+        with self._index_lock:
+            if self._id_index is not None:
+                self._id_index[message_id] = dest_path
         return dest_path
 
     def message_exists(self, message_id: str) -> bool:
         """Check if a message already exists in storage.
 
-        Searches all folders for a file containing the message_id.
-        Used to skip already-synced messages during full sync.
+        Looks the ID up in an index of all folders, built with a single
+        scan on first use and kept current by write_message(). Used to
+        skip already-synced messages during full sync.
 
         Args:
             message_id: Gmail message ID to search for.
@@ -270,14 +294,7 @@ class MaildirStorage:
         Returns:
             True if a message with this ID exists in any folder.
         """
-        # Search all directories recursively for the message ID
-        # Message ID appears in filename: <timestamp>.<message_id>.<hostname>:2,<flags>
-        for path in self._base_path.rglob(f"*.{message_id}.*"):
-            # Verify it's in cur/ or new/ (not tmp/)
-            if path.parent.name in ("cur", "new"):
-                return True
-
-        return False
+        return message_id in self._index()
 
     def get_message_path(self, message_id: str) -> Path | None:
         """Get the path to a specific message if it exists.
@@ -288,8 +305,127 @@ class MaildirStorage:
         Returns:
             Path to the message file, or None if not found.
         """
-        for path in self._base_path.rglob(f"*.{message_id}.*"):
-            if path.parent.name in ("cur", "new"):
-                return path
+        path = self._index().get(message_id)
+        if path is not None and not path.exists():
+            # Renamed since the scan (mail clients rename files when
+            # flags change, or move them from new/ to cur/)
+            path = self._index(rebuild=True).get(message_id)
+        return path
+
+    def load_index(self) -> None:
+        """Scan the folders for stored messages now instead of on first lookup.
+
+        Lets a caller start the scan early, e.g. on another thread while
+        it waits on the network, so the first message_exists() doesn't
+        pay for it.
+        """
+        self._index()
+
+    def _index(self, rebuild: bool = False) -> dict[str, Path]:
+        """Map of message ID to path for every message in storage.
 
-        return None
+        Built by one walk of the tree the first time it's needed (or when
+        rebuild is set), so lookups don't rescan the folders each time.
+        Messages added by other programs after the scan aren't seen;
+        write_message() adds its own.
+        """
+        with self._index_lock:
+            if self._id_index is None or rebuild:
+                index = {}
+                for entry in self._iter_message_entries():
+                    # <timestamp>.<message_id>.<hostname>:2,<flags>; the
+                    # hostname may itself contain dots
+                    parts = entry.name.split(".", 2)
+                    if len(parts) == 3:
+                        index[parts[1]] = Path(entry.path)
+                self._id_index = index
+            return self._id_index
+
+    def _iter_message_entries(self) -> Iterator[os.DirEntry]:
+        """Yield directory entries for delivered messages in every folder.
+
+        Walks the tree with os.scandir(), whose entries carry the file
+        type from the directory listing, so telling folders from messages
+        costs no stat() per file. Only cur/ and new/ are listed; tmp/
+        holds deliveries still in progress.
+        """
+        pending = [str(self._base_path)]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    subdirs = {
+                        entry.name: entry.path
+                        for entry in entries
+                        if entry.is_dir(follow_symlinks=False)
+                    }
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+
+            # A Maildir folder has all three; anything else (e.g. Labels/)
+            # only groups folders, even if a label is named "new"
+            if _MAILDIR_SUBDIRS <= subdirs.keys():
+                for name in ("cur", "new"):
+                    with os.scandir(subdirs.pop(name)) as messages:
+                        for message in messages:
+                            if message.is_file(follow_symlinks=False):
+                                yield message
+                del subdirs["tmp"]
+            pending.extend(subdirs.values())
+
+
+# The label mappings below are pure functions of the label IDs, and most
+# messages in a sync share a handful of label sets (e.g. INBOX+UNREAD),
+# so they are cached. Label IDs are passed as tuples to be hashable, in
+# Gmail's order rather than sorted: the first user label decides the
+# folder of a message without a system folder label.
+
+
+def _label_to_folder(label_id: str) -> str:
+    """See MaildirStorage.label_to_folder()."""
+    # Check if it's a known system label
+    if label_id in LABEL_FOLDER_MAP:
+        return LABEL_FOLDER_MAP[label_id]
+
+    # User labels go under Labels/ directory
+    # Strip any leading/trailing whitespace and use as-is
+    return f"Labels/{label_id}"
+
+
+@functools.lru_cache(maxsize=256)
+def _primary_folder(label_ids: tuple[str, ...]) -> str:
+    """See MaildirStorage.get_primary_folder()."""
+    # Check system labels in priority order
+    for label in FOLDER_PRIORITY:
+        if label in label_ids:
+            return _label_to_folder(label)
+
+    # Fall back to first user label (excluding virtual labels like UNREAD)
+    for label in label_ids:
+        if label not in _VIRTUAL_LABELS and label not in LABEL_FOLDER_MAP:
+            return _label_to_folder(label)
+
+    # Ultimate fallback: archived emails (no standard folder label) belong in Archive
+    return "Archive"
+
+
+@functools.lru_cache(maxsize=256)
+def _labels_to_flags(label_ids: tuple[str, ...]) -> str:
+    """See MaildirStorage.labels_to_flags()."""
+    flags = set()
+
+    # Check for Seen flag (absence of UNREAD label)
+    if "UNREAD" not in label_ids:
+        flags.add("S")
+
+    # Check for other flags
+    if "STARRED" in label_ids:
+        flags.add("F")
+
+    if "DRAFT" in label_ids:
+        flags.add("D")
+
+    if "TRASH" in label_ids:
+        flags.add("T")
+
+    # Return alphabetically sorted flags
+    return "".join(sorted(flags))
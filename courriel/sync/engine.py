@@ -4,7 +4,9 @@ Coordinates fetching emails from Gmail and storing them in Maildir.
 Supports both full sync (initial) and incremental sync (subsequent).
 """
 
-from collections.abc import Callable
+import threading
+from collections.abc import Callable, Collection
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, timedelta
 
@@ -35,8 +37,20 @@ class SyncResult:
         self.errors += 1
         self.error_details.append(f"{message_id}: {error}")
 
+    def merge(self, other: "SyncResult") -> None:
+        """Add the counts and errors of another result to this one.
+
+        Args:
+            other: Result to fold in (e.g. from syncing one label).
+        """
+        self.downloaded += other.downloaded
+        self.skipped += other.skipped
+        self.errors += other.errors
+        self.error_details.extend(other.error_details)
+
 
 # Type for progress callback: (label, current, total) -> None
+# With concurrent label syncs it may be called from several threads.
 ProgressCallback = Callable[[str, int, int], None]
 
 
@@ -73,6 +87,42 @@ class SyncEngine:
         self._gmail = gmail_client
         self._maildir = maildir
         self._state = state
+        # Message IDs being downloaded by the current sync. Labels overlap
+        # (ALL contains everything), so concurrent label syncs claim each
+        # ID here first to avoid fetching and writing a message twice.
+        self._claimed: set[str] = set()
+        self._claimed_lock = threading.Lock()
+        self._index_scan: threading.Thread | None = None
+
+    def _start_index_scan(self) -> None:
+        """Build the Maildir's message index in the background.
+
+        A sync first lists message IDs from Gmail and only then checks
+        which are stored, so the one-off scan of the Maildir can run
+        while the listing requests are in flight. message_exists() waits
+        for it to finish.
+
+        Started once per engine: the index stays current afterwards
+        (write_message() adds to it), and a second scan, e.g. when an
+        incremental sync falls back to a full sync, would only queue
+        behind the first one for the index lock.
+        """
+        if self._index_scan is not None:
+            return
+
+        def scan() -> None:
+            try:
+                self._maildir.load_index()
+            except Exception:
+                # The index is left unbuilt, so the first message_exists()
+                # scans again on the syncing thread and raises the error
+                # there; reporting it here too would show it twice
+                pass
+
+        self._index_scan = threading.Thread(
+            target=scan, name="maildir-index", daemon=True
+        )
+        self._index_scan.start()
 
     def _build_query(
         self,
@@ -89,22 +139,147 @@ class SyncEngine:
             Gmail query string (e.g., "after:2024/01/01"), or None if no filter.
         """
         if since is not None:
-            # Gmail query format: after:YYYY/MM/DD
-            return f"after:{since.year}/{since.month:02d}/{since.day:02d}"
+            return _after_query(since)
 
         if days is not None:
             # Calculate date from today
-            target_date = date.today() - timedelta(days=days)
-            return f"after:{target_date.year}/{target_date.month:02d}/{target_date.day:02d}"
+            return _after_query(date.today() - timedelta(days=days))
 
         return None
 
+    def _fetch_and_store(
+        self,
+        message_ids: Collection[str],
+        label: str,
+        result: SyncResult,
+        progress_callback: ProgressCallback | None = None,
+    ) -> None:
+        """Download the given messages that aren't stored yet.
+
+        Messages already in the Maildir are counted as skipped. The rest
+        are fetched in batches (see GmailClient.get_messages) and written
+        as each batch arrives. Per-message failures are recorded in
+        result rather than raised.
+
+        Args:
+            message_ids: Gmail message IDs to sync. Iterated twice, so a
+                set or list rather than a one-shot iterator.
+            label: Label reported to progress_callback.
+            result: SyncResult updated in place.
+            progress_callback: Optional callback, called once per message
+                with (label, current, total).
+        """
+        total = len(message_ids)
+
+        # Check local storage up front so only missing messages are fetched.
+        # message_exists() is a lookup in the Maildir's in-memory ID index,
+        # so this costs one dict probe per listed ID rather than a copy of
+        # every stored ID for each label.
+        missing = [mid for mid in message_ids if not self._maildir.message_exists(mid)]
+        # Leave messages another label is already downloading to that label
+        with self._claimed_lock:
+            missing = [mid for mid in missing if mid not in self._claimed]
+            self._claimed.update(missing)
+        fetched = self._gmail.get_messages(missing)
+        missing_set = set(missing)
+
+        for idx, message_id in enumerate(message_ids):
+            # Report progress
+            if progress_callback:
+                progress_callback(label, idx + 1, total)
+
+            # Skip if already synced
+            if message_id not in missing_set:
+                result.skipped += 1
+                continue
+
+            # get_messages() yields in request order, fetching lazily
+            _, message = next(fetched)
+            if isinstance(message, Exception):
+                result.add_error(message_id, str(message))
+                continue
+
+            # Determine target folder and write message
+            try:
+                folder = self._maildir.get_primary_folder(message["labelIds"])
+                self._maildir.write_message(
+                    folder=folder,
+                    message_bytes=message["raw"],
+                    label_ids=message["labelIds"],
+                    message_id=message_id,
+                )
+                result.downloaded += 1
+            except Exception as e:
+                result.add_error(message_id, str(e))
+
+    def sync_label(
+        self,
+        label: str,
+        max_messages: int = 100,
+        query: str | None = None,
+        progress_callback: ProgressCallback | None = None,
+    ) -> SyncResult:
+        """Download the messages of one label (the full sync of one label).
+
+        Doesn't save sync state; full_sync() does that once all labels
+        are done. Safe to run for several labels at once on one engine.
+
+        Args:
+            label: Gmail label ID to sync (or ALL for all mail).
+            max_messages: Maximum messages to sync.
+            query: Optional Gmail search query (e.g., "after:2024/01/01").
+            progress_callback: Optional callback for progress updates.
+
+        Returns:
+            SyncResult for this label.
+        """
+        result = SyncResult()
+
+        # ALL is a pseudo-label meaning "all mail" — pass None to the API
+        # so it returns messages regardless of label (Gmail's "All Mail").
+        api_label = None if label == ALL_MAIL_LABEL else label
+
+        # Get message IDs for this label
+        message_ids = self._gmail.list_messages(
+            label_id=api_label,
+            query=query,
+            max_results=max_messages,
+        )
+
+        self._fetch_and_store(message_ids, label, result, progress_callback)
+        return result
+
+    def _sync_labels(
+        self,
+        labels: list[str],
+        max_messages: int,
+        query: str | None,
+        progress_callback: ProgressCallback | None,
+        max_workers: int,
+    ) -> list[SyncResult]:
+        """Run sync_label() for each label, up to max_workers at a time.
+
+        Returns:
+            One SyncResult per label, in label order.
+        """
+
+        def run(label: str) -> SyncResult:
+            return self.sync_label(label, max_messages, query, progress_callback)
+
+        workers = min(max_workers, len(labels))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # map() keeps label order, so results merge deterministically
+                return list(pool.map(run, labels))
+        return [run(label) for label in labels]
+
     def full_sync(
         self,
         labels: list[str],
         max_messages: int = 100,
         query: str | None = None,
         progress_callback: ProgressCallback | None = None,
+        max_workers: int = 1,
     ) -> SyncResult:
         """Perform a full sync of specified labels.
 
@@ -117,68 +292,29 @@ class SyncEngine:
             query: Optional Gmail search query (e.g., "after:2024/01/01").
             progress_callback: Optional callback for progress updates.
                                Called with (label, current, total).
+            max_workers: Number of labels to sync at the same time. Each
+                label spends most of its time waiting on the Gmail API,
+                so a few threads cut wall-clock time; keep it small to
+                stay within Gmail's per-user rate limits.
 
         Returns:
             SyncResult with counts of downloaded, skipped, and errored messages.
         """
         result = SyncResult()
-        highest_history_id: str | None = None
-
-        for label in labels:
-            # ALL is a pseudo-label meaning "all mail" — pass None to the API
-            # so it returns messages regardless of label (Gmail's "All Mail").
-            api_label = None if label == ALL_MAIL_LABEL else label
-
-            # Get message IDs for this label
-            message_ids = self._gmail.list_messages(
-                label_id=api_label,
-                query=query,
-                max_results=max_messages,
-            )
-
-            total = len(message_ids)
-
-            for idx, message_id in enumerate(message_ids):
-                # Report progress
-                if progress_callback:
-                    progress_callback(label, idx + 1, total)
-
-                # Skip if already synced
-                if self._maildir.message_exists(message_id):
-                    result.skipped += 1
-                    continue
-
-                # Fetch full message
-                try:
-                    message = self._gmail.get_message(message_id)
-                except Exception as e:
-                    result.add_error(message_id, str(e))
-                    continue
-
-                # Track highest history ID for incremental sync
-                msg_history_id = message.get("historyId")
-                if msg_history_id:
-                    if highest_history_id is None:
-                        highest_history_id = msg_history_id
-                    elif int(msg_history_id) > int(highest_history_id):
-                        highest_history_id = msg_history_id
-
-                # Determine target folder and write message
-                try:
-                    folder = self._maildir.get_primary_folder(message["labelIds"])
-                    self._maildir.write_message(
-                        folder=folder,
-                        message_bytes=message["raw"],
-                        label_ids=message["labelIds"],
-                        message_id=message_id,
-                    )
-                    result.downloaded += 1
-                except Exception as e:
-                    result.add_error(message_id, str(e))
+        self._claimed.clear()
+        self._start_index_scan()
+        # Taken before listing, so the next incremental sync sees every
+        # change made since. The newest message of a label can be months
+        # old, past the ~1 week of history Gmail keeps.
+        history_id = self._gmail.get_history_id()
+
+        for label_result in self._sync_labels(
+            labels, max_messages, query, progress_callback, max_workers
+        ):
+            result.merge(label_result)
 
         # Save state for future incremental sync
-        if highest_history_id:
-            self._state.save(highest_history_id, labels)
+        self._state.save(history_id, labels)
 
         return result
 
@@ -186,19 +322,26 @@ class SyncEngine:
         self,
         labels: list[str],
         progress_callback: ProgressCallback | None = None,
+        max_workers: int = 1,
+        max_messages: int = 100,
     ) -> SyncResult:
         """Perform an incremental sync using Gmail History API.
 
         Only fetches messages added since the last sync, based on the
-        stored historyId. This is much more efficient than full sync
-        for regular updates.
+        historyId stored for each label. This is much more efficient
+        than full sync for regular updates. Labels with no stored
+        historyId (e.g. newly added to sync_labels) get a full sync of
+        their own.
 
-        If the historyId is expired (older than ~1 week), falls back
+        If a historyId is expired (older than ~1 week), falls back
         to full sync automatically.
 
         Args:
             labels: List of Gmail label IDs to sync.
             progress_callback: Optional callback for progress updates.
+            max_workers: Labels whose history (or, for a full sync, messages)
+                are listed at the same time.
+            max_messages: Message limit for labels that need a full sync.
 
         Returns:
             SyncResult with counts of downloaded, skipped, and errored messages.
@@ -208,71 +351,89 @@ class SyncEngine:
 
         if not start_history_id:
             # No previous sync - shouldn't happen, but fall back to full sync
-            return self.full_sync(labels, progress_callback=progress_callback)
+            return self.full_sync(
+                labels,
+                max_messages=max_messages,
+                progress_callback=progress_callback,
+                max_workers=max_workers,
+            )
+
+        self._claimed.clear()
+        self._start_index_scan()
 
         # Collect all new message IDs from history
         new_message_ids: set[str] = set()
-        current_history_id = start_history_id
-
-        for label in labels:
+        label_history_ids: dict[str, str] = {}
+        # Each label resumes from its own history ID, so a label that lags
+        # behind the others doesn't miss changes (see SyncState)
+        start_ids = {label: self._state.get_history_id(label) for label in labels}
+        history_labels = [label for label in labels if start_ids[label] is not None]
+        unsynced_labels = [label for label in labels if start_ids[label] is None]
+
+        def list_history(label: str) -> dict:
             # ALL is a pseudo-label — pass None so history isn't filtered by label
             api_label = None if label == ALL_MAIL_LABEL else label
+            return self._gmail.list_history(
+                start_history_id=start_ids[label],
+                label_id=api_label,
+            )
 
-            try:
-                history_result = self._gmail.list_history(
-                    start_history_id=start_history_id,
-                    label_id=api_label,
+        # Each label's history is listed with its own requests (paginated),
+        # so with several labels they are listed concurrently, like
+        # full_sync() does for message lists
+        try:
+            workers = min(max_workers, len(history_labels))
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    histories = list(pool.map(list_history, history_labels))
+            else:
+                histories = [list_history(label) for label in history_labels]
+        except HttpError as e:
+            # HTTP 404 means historyId is expired - fall back to full sync
+            if e.resp.status == 404:
+                return self.full_sync(
+                    labels,
+                    max_messages=max_messages,
+                    progress_callback=progress_callback,
+                    max_workers=max_workers,
                 )
-            except HttpError as e:
-                # HTTP 404 means historyId is expired - fall back to full sync
-                if e.resp.status == 404:
-                    return self.full_sync(labels, progress_callback=progress_callback)
-                raise
+            raise
 
+        for label, history_result in zip(history_labels, histories):
             # Extract message IDs from messagesAdded
-            for record in history_result.get("history", []):
-                for added in record.get("messagesAdded", []):
-                    msg = added.get("message", {})
-                    msg_id = msg.get("id")
-                    if msg_id:
-                        new_message_ids.add(msg_id)
-
-            # Track latest history ID
-            new_history_id = history_result.get("historyId")
-            if new_history_id:
-                if int(new_history_id) > int(current_history_id):
-                    current_history_id = new_history_id
-
-        # Download new messages
-        message_list = list(new_message_ids)
-        total = len(message_list)
+            new_message_ids.update(
+                msg_id
+                for record in history_result.get("history", ())
+                for added in record.get("messagesAdded", ())
+                if (msg_id := added.get("message", {}).get("id"))
+            )
 
-        for idx, message_id in enumerate(message_list):
-            # Report progress
-            if progress_callback:
-                progress_callback("incremental", idx + 1, total)
+            # Track latest history ID for this label
+            label_history_ids[label] = _newest_history_id(
+                start_ids[label], history_result.get("historyId")
+            )
 
-            # Skip if already exists (possible if interrupted mid-sync)
-            if self._maildir.message_exists(message_id):
-                result.skipped += 1
-                continue
+        # Labels never synced before: list them in full, resuming next
+        # time from the mailbox's history ID before the listing (see
+        # full_sync)
+        if unsynced_labels:
+            history_id = self._gmail.get_history_id()
+            for label_result in self._sync_labels(
+                unsynced_labels, max_messages, None, progress_callback, max_workers
+            ):
+                result.merge(label_result)
+            label_history_ids.update(dict.fromkeys(unsynced_labels, history_id))
 
-            # Fetch and store message
-            try:
-                message = self._gmail.get_message(message_id)
-                folder = self._maildir.get_primary_folder(message["labelIds"])
-                self._maildir.write_message(
-                    folder=folder,
-                    message_bytes=message["raw"],
-                    label_ids=message["labelIds"],
-                    message_id=message_id,
-                )
-                result.downloaded += 1
-            except Exception as e:
-                result.add_error(message_id, str(e))
+        # Download new messages
+        self._fetch_and_store(new_message_ids, "incremental", result, progress_callback)
 
-        # Update state with new history ID
-        self._state.save(current_history_id, labels)
+        # Update state with new history IDs
+        current_history_id = start_history_id
+        for label_history_id in label_history_ids.values():
+            current_history_id = _newest_history_id(
+                current_history_id, label_history_id
+            )
+        self._state.save(current_history_id, labels, label_history_ids)
 
         return result
 
@@ -284,6 +445,7 @@ class SyncEngine:
         days: int | None = None,
         progress_callback: ProgressCallback | None = None,
         force_full: bool = False,
+        max_workers: int = 1,
     ) -> SyncResult:
         """Main sync entry point.
 
@@ -302,6 +464,7 @@ class SyncEngine:
             days: Optional days filter (sync messages from last N days).
             progress_callback: Optional callback for progress updates.
             force_full: Force a full sync even if incremental is available.
+            max_workers: Number of labels to sync concurrently in full sync.
 
         Returns:
             SyncResult with sync statistics.
@@ -321,6 +484,8 @@ class SyncEngine:
             return self.incremental_sync(
                 labels=labels,
                 progress_callback=progress_callback,
+                max_workers=max_workers,
+                max_messages=max_messages,
             )
         else:
             return self.full_sync(
@@ -328,4 +493,19 @@ class SyncEngine:
                 max_messages=max_messages,
                 query=query,
                 progress_callback=progress_callback,
+                max_workers=max_workers,
             )
+
+
+def _after_query(day: date) -> str:
+    """Gmail query for messages after a date (after:YYYY/MM/DD)."""
+    return f"after:{day.year}/{day.month:02d}/{day.day:02d}"
+
+
+def _newest_history_id(current: str | None, candidate: str | None) -> str | None:
+    """Return the newer of two Gmail history IDs (numeric strings or None)."""
+    if not candidate:
+        return current
+    if current is None or int(candidate) > int(current):
+        return candidate
+    return current
@@ -5,13 +5,40 @@ Handles authentication, pagination, and data transformation.
 """
 
 import base64
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 
-from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError  # noqa: F401 - re-exported for callers
+from googleapiclient.errors import HttpError
 
-from courriel.auth.gmail import _load_token, _save_token
+from courriel.auth.gmail import _REFRESH_REQUEST, _load_token, _save_token
+
+# Requests per batch HTTP call. Gmail accepts up to 100, but documents that
+# batches larger than 50 are likely to be rate limited.
+_BATCH_SIZE = 50
+
+# Fields requested with format="raw": what _parse_raw_message() reads.
+# Leaves out snippet, sizeEstimate and internalDate.
+_RAW_FIELDS = "id,threadId,labelIds,historyId,raw"
+
+# Retries for rate-limited (429) and transient (5xx) API errors. Single
+# requests use googleapiclient's num_retries, which backs off
+# exponentially with jitter; batches are retried in _execute_batch().
+_NUM_RETRIES = 5
+
+# Batches get_messages() fetches ahead of the caller. More would mostly
+# run into Gmail's per-user rate limit.
+_BATCHES_IN_FLIGHT = 2
+
+# Worker threads that prefetch batches for get_messages(). Enough for
+# _BATCHES_IN_FLIGHT per label synced concurrently; more just sit idle.
+_PREFETCH_WORKERS = 8
 
 
 def get_credentials(account_name: str) -> Credentials | None:
@@ -35,7 +62,7 @@ def get_credentials(account_name: str) -> Credentials | None:
     # If token is expired but we have a refresh token, try to refresh
     if creds.expired and creds.refresh_token:
         try:
-            creds.refresh(Request())
+            creds.refresh(_REFRESH_REQUEST)
             _save_token(creds, account_name)  # Persist refreshed token
         except Exception:
             # Refresh failed - token is no longer valid
@@ -66,8 +93,37 @@ class GmailClient:
         """
         self._credentials = credentials
         # Build the Gmail API service
-        # The service is the main entry point for all Gmail API calls
-        self._service = build("gmail", "v1", credentials=credentials)
+        # The service is the main entry point for all Gmail API calls.
+        # Its httplib2 transport isn't thread-safe, so each thread that
+        # uses the client gets its own service (see _service).
+        self._local = threading.local()
+        self._local.service = build("gmail", "v1", credentials=credentials)
+        self._prefetch_pool: ThreadPoolExecutor | None = None
+        self._prefetch_lock = threading.Lock()
+
+    @property
+    def _service(self):
+        """Gmail API service for the calling thread."""
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = build("gmail", "v1", credentials=self._credentials)
+            self._local.service = service
+        return service
+
+    def _prefetcher(self) -> ThreadPoolExecutor:
+        """Executor shared by every get_messages() call on this client.
+
+        Its threads outlive a single call, so their services keep their
+        HTTPS connections open between batches and labels instead of
+        paying a new TCP and TLS handshake each time.
+        """
+        with self._prefetch_lock:
+            if self._prefetch_pool is None:
+                self._prefetch_pool = ThreadPoolExecutor(
+                    max_workers=_PREFETCH_WORKERS,
+                    thread_name_prefix="gmail-prefetch",
+                )
+            return self._prefetch_pool
 
     def list_labels(self) -> list[dict]:
         """List all labels in the user's mailbox.
@@ -76,7 +132,12 @@ class GmailClient:
             List of label dicts with keys: id, name, type.
             System labels have type='system', user labels have type='user'.
         """
-        result = self._service.users().labels().list(userId="me").execute()
+        result = (
+            self._service.users()
+            .labels()
+            .list(userId="me")
+            .execute(num_retries=_NUM_RETRIES)
+        )
         labels = result.get("labels", [])
 
         # Return simplified label info
@@ -107,27 +168,26 @@ class GmailClient:
         Returns:
             List of message ID strings.
         """
-        message_ids = []
-        page_token = None
+        # Parameters shared by every page, built once. fields trims the
+        # response to what we read (each entry also carries a threadId,
+        # plus a resultSizeEstimate per page).
+        params = {"userId": "me", "fields": "messages/id,nextPageToken"}
+        if label_id:
+            params["labelIds"] = [label_id]
+        if query:
+            params["q"] = query
 
+        message_ids = []
         while len(message_ids) < max_results:
             # Calculate how many more we need (API max per page is 500)
-            remaining = max_results - len(message_ids)
-            page_size = min(remaining, 500)
+            params["maxResults"] = min(max_results - len(message_ids), 500)
 
-            # Build request parameters
-            params = {
-                "userId": "me",
-                "maxResults": page_size,
-            }
-            if label_id:
-                params["labelIds"] = [label_id]
-            if query:
-                params["q"] = query
-            if page_token:
-                params["pageToken"] = page_token
-
-            result = self._service.users().messages().list(**params).execute()
+            result = (
+                self._service.users()
+                .messages()
+                .list(**params)
+                .execute(num_retries=_NUM_RETRIES)
+            )
 
             # Extract message IDs from response
             messages = result.get("messages", [])
@@ -140,6 +200,7 @@ class GmailClient:
             page_token = result.get("nextPageToken")
             if not page_token:
                 break
+            params["pageToken"] = page_token
 
         return message_ids
 
@@ -163,22 +224,136 @@ class GmailClient:
         result = (
             self._service.users()
             .messages()
-            .get(userId="me", id=message_id, format="raw")
-            .execute()
+            .get(userId="me", id=message_id, format="raw", fields=_RAW_FIELDS)
+            .execute(num_retries=_NUM_RETRIES)
         )
+        return _parse_raw_message(result)
 
-        # Decode the raw message from base64url to bytes
-        # Gmail uses URL-safe base64 encoding
-        raw_base64 = result.get("raw", "")
-        raw_bytes = base64.urlsafe_b64decode(raw_base64)
+    def get_messages(
+        self, message_ids: list[str]
+    ) -> Iterator[tuple[str, dict | Exception]]:
+        """Fetch several messages, batching the API calls.
 
-        return {
-            "id": result["id"],
-            "threadId": result["threadId"],
-            "labelIds": result.get("labelIds", []),
-            "historyId": result["historyId"],
-            "raw": raw_bytes,
-        }
+        Uses Gmail's batch endpoint so each HTTP round trip fetches up to
+        _BATCH_SIZE messages instead of one. Batches are fetched as the
+        iterator is consumed, a few batches ahead of the caller, so
+        storing a batch overlaps with downloading the next ones.
+
+        Args:
+            message_ids: Message IDs to fetch.
+
+        Yields:
+            (message_id, message) pairs in the order of message_ids, where
+            message is the dict get_message() would return, or the
+            exception raised while fetching it. A failed message doesn't
+            stop the others.
+        """
+        chunks = [
+            message_ids[start : start + _BATCH_SIZE]
+            for start in range(0, len(message_ids), _BATCH_SIZE)
+        ]
+        if len(chunks) <= 1:
+            for chunk in chunks:
+                yield from self._fetch_chunk(chunk)
+            return
+
+        # Pipeline: while the caller stores one batch, the next
+        # _BATCHES_IN_FLIGHT are already being fetched on worker threads,
+        # overlapping round trips with each other and with disk writes.
+        # Each worker uses its own service (see _service).
+        pool = self._prefetcher()
+        remaining = iter(chunks)
+        pending = deque(
+            pool.submit(self._fetch_chunk, chunk)
+            for chunk in itertools.islice(remaining, _BATCHES_IN_FLIGHT)
+        )
+        while pending:
+            results = pending.popleft().result()
+            next_chunk = next(remaining, None)
+            if next_chunk is not None:
+                pending.append(pool.submit(self._fetch_chunk, next_chunk))
+            yield from results
+
+    def _fetch_chunk(
+        self, message_ids: list[str]
+    ) -> list[tuple[str, dict | Exception]]:
+        """Fetch one batch of messages; see get_messages() for the result."""
+        try:
+            responses = self._execute_batch(message_ids)
+        except Exception as e:
+            # The whole round trip failed: report it for every message
+            return [(message_id, e) for message_id in message_ids]
+
+        results = []
+        for message_id in message_ids:
+            # Popped so each base64 payload can be freed once decoded,
+            # rather than the whole batch staying alive in both forms
+            response = responses.pop(message_id, None)
+            if response is None:
+                response = RuntimeError("missing from batch response")
+            elif not isinstance(response, Exception):
+                try:
+                    response = _parse_raw_message(response)
+                except Exception as e:
+                    response = e
+            results.append((message_id, response))
+        return results
+
+    def _execute_batch(self, message_ids: list[str]) -> dict[str, dict | Exception]:
+        """Send one batch of messages.get requests, retrying failed ones.
+
+        Batch calls have no num_retries, so requests that come back
+        rate limited or with a 5xx error (each sub-request of a batch
+        succeeds or fails on its own) are re-sent in a smaller batch
+        after an exponential backoff with jitter, up to _NUM_RETRIES times.
+
+        Returns:
+            Dict mapping message ID to the API response or its exception.
+        """
+        responses: dict[str, dict | Exception] = {}
+
+        def collect(request_id, response, exception):
+            responses[request_id] = exception or response
+
+        pending = message_ids
+        for attempt in range(_NUM_RETRIES + 1):
+            if attempt:
+                time.sleep(min(2**attempt, 32) * (0.5 + random.random()))
+
+            service = self._service
+            messages = service.users().messages()
+            batch = service.new_batch_http_request(callback=collect)
+            for message_id in pending:
+                batch.add(
+                    messages.get(
+                        userId="me", id=message_id, format="raw", fields=_RAW_FIELDS
+                    ),
+                    request_id=message_id,
+                )
+            batch.execute()
+
+            pending = [mid for mid in pending if _is_retryable(responses.get(mid))]
+            if not pending:
+                break
+
+        return responses
+
+    def get_history_id(self) -> str:
+        """Get the mailbox's current history ID.
+
+        Taken before listing a label in full, it is where the label's next
+        incremental sync resumes: every change made after the listing
+        started is in the history from this ID on.
+
+        Returns:
+            Current history ID of the mailbox.
+        """
+        profile = (
+            self._service.users()
+            .getProfile(userId="me", fields="historyId")
+            .execute(num_retries=_NUM_RETRIES)
+        )
+        return str(profile["historyId"])
 
     def list_history(
         self,
@@ -212,6 +387,8 @@ class GmailClient:
                 "userId": "me",
                 "startHistoryId": start_history_id,
                 "maxResults": 500,
+                # Sync only looks at added messages; skip the other records
+                "historyTypes": "messageAdded",
             }
             if label_id:
                 params["labelId"] = label_id
@@ -219,7 +396,12 @@ class GmailClient:
                 params["pageToken"] = page_token
 
             # This may raise HttpError 404 if historyId is too old (~1 week)
-            result = self._service.users().history().list(**params).execute()
+            result = (
+                self._service.users()
+                .history()
+                .list(**params)
+                .execute(num_retries=_NUM_RETRIES)
+            )
 
             # Collect history records
             records = result.get("history", [])
@@ -246,5 +428,42 @@ class GmailClient:
         """
         raw_b64 = base64.urlsafe_b64encode(mime_message.as_bytes()).decode("utf-8")
         body = {"message": {"raw": raw_b64}}
-        result = self._service.users().drafts().create(userId="me", body=body).execute()
+        # Only the draft ID is used; fields drops the echoed message
+        # resource (IDs, labels) from the response
+        result = (
+            self._service.users()
+            .drafts()
+            .create(userId="me", body=body, fields="id")
+            .execute()
+        )
         return result["id"]
+
+
+def _parse_raw_message(result: dict) -> dict:
+    """Convert a messages.get(format="raw") response for storage.
+
+    Decodes the base64url "raw" field to the RFC 2822 message bytes and
+    keeps the fields the sync engine uses. See GmailClient.get_message().
+    """
+    # Gmail uses URL-safe base64 encoding. Popped so the encoded copy
+    # (4/3 the message size) isn't kept alongside the decoded one.
+    raw_bytes = base64.urlsafe_b64decode(result.pop("raw", ""))
+
+    return {
+        "id": result["id"],
+        "threadId": result["threadId"],
+        "labelIds": result.get("labelIds", []),
+        "historyId": result["historyId"],
+        "raw": raw_bytes,
+    }
+
+
+def _is_retryable(response) -> bool:
+    """Whether a batch response is a rate-limit or server error worth retrying."""
+    if not isinstance(response, HttpError):
+        return False
+    status = response.resp.status
+    if status == 429 or status >= 500:
+        return True
+    # Gmail also reports per-user rate limits as 403 rateLimitExceeded
+    return status == 403 and b"ateLimitExceeded" in (response.content or b"")
@@ -6,16 +6,19 @@ incremental syncs. Each account has its own state file.
 State is stored in ~/.config/courriel/sync-state/<account>.json
 """
 
-import json
 from datetime import datetime, timezone
 from pathlib import Path
 
-from courriel.config.paths import CONFIG_DIR
+from courriel import fastjson
+from courriel.config.paths import CONFIG_DIR, write_private_file
 
 
 # Sync state directory
 SYNC_STATE_DIR = CONFIG_DIR / "sync-state"
 
+# Directories already created with the right permissions in this process
+_ENSURED_DIRS: set[Path] = set()
+
 
 def ensure_sync_state_dir() -> Path:
     """Create sync state directory with restricted permissions.
@@ -23,11 +26,20 @@ def ensure_sync_state_dir() -> Path:
     Sets directory permissions to 700 (owner read/write/execute only)
     to protect sync state data.
 
+    Only touches the filesystem once per process, so a long-running
+    caller that syncs repeatedly doesn't redo the mkdir and chmod.
+
     Returns:
         Path to the sync state directory.
     """
+    # Keyed by path so a relocated SYNC_STATE_DIR (e.g. in tests) is
+    # still created
+    if SYNC_STATE_DIR in _ENSURED_DIRS:
+        return SYNC_STATE_DIR
+
     SYNC_STATE_DIR.mkdir(parents=True, exist_ok=True)
     SYNC_STATE_DIR.chmod(0o700)
+    _ENSURED_DIRS.add(SYNC_STATE_DIR)
     return SYNC_STATE_DIR
 
 
@@ -42,9 +54,16 @@ class SyncState:
     {
         "history_id": "12345678",
         "last_sync": "2024-01-15T10:30:00Z",
-        "synced_labels": ["INBOX", "SENT", "DRAFT"]
+        "synced_labels": ["INBOX", "SENT", "DRAFT"],
+        "label_history_ids": {"INBOX": "12345678", "SENT": "12345601", ...}
     }
 
+    history_id is the newest ID across labels. label_history_ids records
+    where each label's incremental sync should resume, so a label that
+    was never synced can be fully synced without re-listing the others.
+    Files written before label_history_ids existed are still read: the
+    account-wide history_id then applies to each of synced_labels.
+
     Example:
         state = SyncState("personal")
         history_id = state.get_history_id()  # None on first run
@@ -61,6 +80,8 @@ class SyncState:
         self._account_name = account_name
         self._state_file = SYNC_STATE_DIR / f"{account_name}.json"
         self._state: dict | None = None
+        # (mtime_ns, size) of the file _state was read from or saved to
+        self._state_stat: tuple[int, int] | None = None
 
     @property
     def state_file(self) -> Path:
@@ -70,51 +91,87 @@ class SyncState:
     def load(self) -> dict | None:
         """Load sync state from disk.
 
+        The file is parsed again only if its mtime or size changed since
+        it was last read or saved, so a process that syncs repeatedly
+        doesn't re-read its own state each time.
+
         Returns:
             State dict with history_id, last_sync, synced_labels,
             or None if no state file exists.
         """
-        if not self._state_file.exists():
+        try:
+            stat = self._state_file.stat()
+        except OSError:
             self._state = None
+            self._state_stat = None
             return None
 
+        file_stat = (stat.st_mtime_ns, stat.st_size)
+        if self._state is not None and file_stat == self._state_stat:
+            return self._state
+
         try:
-            self._state = json.loads(self._state_file.read_text())
+            self._state = fastjson.loads(self._state_file.read_bytes())
+            self._state_stat = file_stat
             return self._state
-        except (json.JSONDecodeError, OSError):
+        except (ValueError, OSError):
             # Corrupted or unreadable file - treat as no state
             self._state = None
+            self._state_stat = None
             return None
 
-    def save(self, history_id: str, synced_labels: list[str]) -> None:
+    def save(
+        self,
+        history_id: str,
+        synced_labels: list[str],
+        label_history_ids: dict[str, str] | None = None,
+    ) -> None:
         """Save sync state to disk.
 
         Updates the state file with the new historyId and records
-        the current timestamp as last_sync.
+        the current timestamp as last_sync. Per-label history IDs of
+        labels not synced this time are kept.
 
         Args:
             history_id: Gmail History API ID from latest sync.
             synced_labels: List of labels that were synced.
+            label_history_ids: History ID to resume from for each synced
+                label. Defaults to history_id for all of synced_labels.
         """
         ensure_sync_state_dir()
 
+        if label_history_ids is None:
+            label_history_ids = dict.fromkeys(synced_labels, history_id)
+
+        previous = self._state if self._state is not None else self.load()
+        merged = dict((previous or {}).get("label_history_ids", {}))
+        merged.update(label_history_ids)
+
         self._state = {
             "history_id": history_id,
             "last_sync": datetime.now(timezone.utc).isoformat(),
             "synced_labels": synced_labels,
+            "label_history_ids": merged,
         }
 
-        self._state_file.write_text(json.dumps(self._state, indent=2))
-        # Restrictive permissions for state file
-        self._state_file.chmod(0o600)
+        # Written once per sync: a temp file renamed over the old state,
+        # so an interrupted sync leaves the previous state intact instead
+        # of a truncated file that load() would discard
+        write_private_file(self._state_file, fastjson.dumps(self._state, indent=True))
+        stat = self._state_file.stat()
+        self._state_stat = (stat.st_mtime_ns, stat.st_size)
 
-    def get_history_id(self) -> str | None:
+    def get_history_id(self, label: str | None = None) -> str | None:
         """Get the stored history ID for incremental sync.
 
         Loads state from disk if not already loaded.
 
+        Args:
+            label: Label to get the resume point for. If None, returns
+                the account-wide (newest) history ID.
+
         Returns:
-            History ID string, or None if no previous sync.
+            History ID string, or None if no previous sync (of that label).
         """
         if self._state is None:
             self.load()
@@ -122,7 +179,17 @@ class SyncState:
         if self._state is None:
             return None
 
-        return self._state.get("history_id")
+        if label is None:
+            return self._state.get("history_id")
+
+        label_history_ids = self._state.get("label_history_ids")
+        if label_history_ids is not None:
+            return label_history_ids.get(label)
+
+        # State saved before per-label IDs were recorded
+        if label in self._state.get("synced_labels", []):
+            return self._state.get("history_id")
+        return None
 
     def get_last_sync(self) -> datetime | None:
         """Get the timestamp of the last sync.
@@ -150,3 +217,4 @@ class SyncState:
         if self._state_file.exists():
             self._state_file.unlink()
         self._state = None
+        self._state_stat = None
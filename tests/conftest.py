@@ -0,0 +1,33 @@
+"""Shared fixtures for the sync engine tests."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+
+def _batch_from(client: MagicMock):
+    """Implement GmailClient.get_messages() on top of client.get_message."""
+
+    def get_messages(message_ids):
+        for message_id in message_ids:
+            try:
+                yield message_id, client.get_message(message_id)
+            except Exception as e:
+                yield message_id, e
+
+    return get_messages
+
+
+@pytest.fixture
+def gmail_client() -> MagicMock:
+    """Create a mock Gmail client.
+
+    get_messages() is backed by the get_message() mock, so tests can
+    set per-message responses and errors there. get_history_id() returns
+    the mailbox's history ID full syncs resume from. (test_gmail_client.py
+    overrides this with a real client on a mocked service.)
+    """
+    client = MagicMock()
+    client.get_messages.side_effect = _batch_from(client)
+    client.get_history_id.return_value = "1000"
+    return client
@@ -0,0 +1,478 @@
+"""Tests for the provider-agnostic auth module.
+
+Provider calls are mocked; these tests cover the in-process token cache.
+"""
+
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+import courriel.auth as auth
+
+
+MS365_ACCOUNT = {
+    "provider": "ms365",
+    "client_id": "client-123",
+    "tenant_id": "tenant-456",
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Start every test with empty in-process token and result caches."""
+    auth._TOKEN_CACHE.clear()
+    auth._AUTH_RESULTS.clear()
+    yield
+    auth._TOKEN_CACHE.clear()
+    auth._AUTH_RESULTS.clear()
+
+
+class TestTokenCache:
+    """Tests for the in-process access token cache."""
+
+    def test_reuses_cached_token(self):
+        """A fresh token is served from memory without calling the provider."""
+        expires_at = time.time() + 3600
+        with patch(
+            "courriel.auth.ms365.get_access_token_with_expiry",
+            return_value=("tok", expires_at),
+        ) as mock_token:
+            first = auth.get_access_token(MS365_ACCOUNT, "work")
+            second = auth.get_access_token(MS365_ACCOUNT, "work")
+
+        assert first == second == "tok"
+        mock_token.assert_called_once()
+
+    def test_refetches_token_close_to_expiry(self):
+        """Tokens about to expire are fetched again from the provider."""
+        expires_at = time.time() + 10
+        with patch(
+            "courriel.auth.ms365.get_access_token_with_expiry",
+            return_value=("tok", expires_at),
+        ) as mock_token:
+            auth.get_access_token(MS365_ACCOUNT, "work")
+            auth.get_access_token(MS365_ACCOUNT, "work")
+
+        assert mock_token.call_count == 2
+
+    def test_does_not_cache_missing_token(self):
+        """A None result (not authenticated) is not cached."""
+        with patch(
+            "courriel.auth.ms365.get_access_token_with_expiry", return_value=None
+        ) as mock_token:
+            assert auth.get_access_token(MS365_ACCOUNT, "work") is None
+            assert auth.get_access_token(MS365_ACCOUNT, "work") is None
+
+        assert mock_token.call_count == 2
+
+    def test_concurrent_callers_share_one_refresh(self):
+        """Threads racing on a cold cache trigger a single provider call."""
+        import threading
+
+        def slow_token(*args):
+            time.sleep(0.05)
+            return ("tok", time.time() + 3600)
+
+        with patch(
+            "courriel.auth.ms365.get_access_token_with_expiry", side_effect=slow_token
+        ) as mock_token:
+            threads = [
+                threading.Thread(
+                    target=auth.get_access_token, args=(MS365_ACCOUNT, "work")
+                )
+                for _ in range(4)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        mock_token.assert_called_once()
+
+    def test_invalidate_drops_account_tokens(self):
+        """invalidate() forces the next call back to the provider."""
+        expires_at = time.time() + 3600
+        with patch(
+            "courriel.auth.ms365.get_access_token_with_expiry",
+            return_value=("tok", expires_at),
+        ) as mock_token:
+            auth.get_access_token(MS365_ACCOUNT, "work")
+            auth.invalidate("work")
+            auth.get_access_token(MS365_ACCOUNT, "work")
+
+        assert mock_token.call_count == 2
+
+    def test_gmail_cache_key_does_not_hold_secret(self):
+        """The Gmail cache key stores a hash of the client secret."""
+        account = {
+            "provider": "gmail",
+            "client_id": "gid",
+            "client_secret": "s3cret",
+        }
+        expires_at = time.time() + 3600
+        with patch(
+            "courriel.auth.gmail.get_access_token_with_expiry",
+            return_value=("tok", expires_at),
+        ):
+            auth.get_access_token(account, "personal")
+
+        (key,) = auth._TOKEN_CACHE
+        assert "s3cret" not in key
+
+    def test_authenticate_reuses_fresh_result(self):
+        """A second authenticate() with a fresh token skips the device flow."""
+        result = {
+            "access_token": "tok",
+            "expires_in": 3600,
+            "id_token_claims": {"preferred_username": "me@example.com"},
+        }
+        with patch(
+            "courriel.auth.ms365.authenticate_device_flow", return_value=result
+        ) as mock_flow:
+            auth.authenticate(MS365_ACCOUNT, "work")
+            second = auth.authenticate(MS365_ACCOUNT, "work")
+
+        mock_flow.assert_called_once()
+        assert second["access_token"] == "tok"
+        assert second["id_token_claims"]["preferred_username"] == "me@example.com"
+
+    def test_authenticate_failure_not_cached(self):
+        """Failed authentications always go back to the provider."""
+        with patch(
+            "courriel.auth.ms365.authenticate_device_flow",
+            return_value={"error": "denied"},
+        ) as mock_flow:
+            auth.authenticate(MS365_ACCOUNT, "work")
+            auth.authenticate(MS365_ACCOUNT, "work")
+
+        assert mock_flow.call_count == 2
+
+
+class TestMs365AppCache:
+    """Tests for the process-wide MSAL app cache in auth.ms365."""
+
+    @pytest.fixture(autouse=True)
+    def isolated_app_cache(self, tmp_path):
+        """Point the cache file at tmp_path and start with no cached apps."""
+        from courriel.auth import ms365
+
+        ms365._APP_CACHE.clear()
+        with (
+            patch(
+                "courriel.auth.ms365.ms365_cache_file",
+                return_value=tmp_path / "ms365_cache_work.json",
+            ),
+            patch("courriel.auth.ms365._build_msal_app") as mock_build,
+        ):
+            yield mock_build
+        ms365._APP_CACHE.clear()
+
+    def test_builds_app_once(self, isolated_app_cache):
+        """Repeated lookups reuse the same token cache and app."""
+        from courriel.auth import ms365
+
+        first = ms365._get_app("cid", "tid", "work")
+        second = ms365._get_app("cid", "tid", "work")
+
+        assert first == second
+        isolated_app_cache.assert_called_once()
+
+    def test_reloads_cache_when_file_changes(self, isolated_app_cache, tmp_path):
+        """A cache file rewritten by another process is reloaded in place."""
+        from courriel.auth import ms365
+
+        cache, _ = ms365._get_app("cid", "tid", "work")
+        (tmp_path / "ms365_cache_work.json").write_text('{"AccessToken": {}}')
+
+        reloaded, _ = ms365._get_app("cid", "tid", "work")
+
+        assert reloaded is cache
+        assert json.loads(cache.serialize()) == {"AccessToken": {}}
+        isolated_app_cache.assert_called_once()
+
+    def test_serialize_round_trip_is_compact(self):
+        """Serialized caches are compact and load back unchanged."""
+        import msal
+
+        from courriel.auth import ms365
+
+        cache = msal.SerializableTokenCache()
+        ms365._deserialize(cache, b'{"AccessToken": {"k": {"secret": "t"}}}')
+        text = ms365._serialize(cache)
+
+        assert text == '{"AccessToken":{"k":{"secret":"t"}}}'
+        assert not cache.has_state_changed
+
+
+class TestMs365AccessToken:
+    """Tests for the refresh skew in ms365.get_access_token_with_expiry()."""
+
+    def _get(self, *results):
+        """Call get_access_token_with_expiry() with a stub app."""
+        from unittest.mock import MagicMock
+
+        from courriel.auth import ms365
+
+        cache = MagicMock(has_state_changed=False)
+        app = MagicMock()
+        app.get_accounts.return_value = [{"home_account_id": "uid.tid"}]
+        app.acquire_token_silent.side_effect = results
+        with patch("courriel.auth.ms365._get_app", return_value=(cache, app)):
+            token = ms365.get_access_token_with_expiry("cid", "tid", "work")
+        return token, app.acquire_token_silent.call_count
+
+    def test_refreshes_token_about_to_expire(self):
+        """A cached token inside the skew is refreshed once."""
+        token, calls = self._get(
+            {"access_token": "old", "expires_in": 5},
+            {"access_token": "new", "expires_in": 3600},
+        )
+
+        assert token[0] == "new"
+        assert calls == 2
+
+    def test_error_result_not_retried(self):
+        """An error result has no expires_in and isn't taken as expiring."""
+        token, calls = self._get({"error": "invalid_grant"})
+
+        assert token is None
+        assert calls == 1
+
+
+class TestRefreshSkew:
+    """Tests for reading the refresh skew from the environment."""
+
+    @pytest.mark.parametrize("value, expected", [("120", 120), ("60s", 60), ("", 60)])
+    def test_reads_env_with_fallback(self, monkeypatch, value, expected):
+        """Valid values are used; malformed ones fall back to the default."""
+        from courriel.auth import skew
+
+        monkeypatch.setenv(skew.REFRESH_SKEW_ENV, value)
+
+        assert skew._read_skew() == expected
+
+
+class TestBuildMsalApp:
+    """Tests for MSAL app construction options."""
+
+    @pytest.mark.parametrize(
+        "tenant_id, expected",
+        [
+            (
+                "0d3a8f52-6b1e-4c39-9f0e-2a7b5c4d1e90",
+                {"instance_discovery": False, "validate_authority": False},
+            ),
+            ("common", {"instance_discovery": False, "validate_authority": True}),
+            ("contoso.onmicrosoft.com", {}),
+        ],
+    )
+    def test_instance_discovery_skipped_for_known_tenants(self, tenant_id, expected):
+        """GUID and multi-tenant authorities skip instance discovery."""
+        from courriel.auth import ms365
+
+        with patch("courriel.auth.ms365.msal.PublicClientApplication") as mock_app:
+            ms365._build_msal_app("cid", tenant_id)
+
+        kwargs = mock_app.call_args.kwargs
+        assert kwargs["authority"] == f"https://login.microsoftonline.com/{tenant_id}"
+        for name in ("instance_discovery", "validate_authority"):
+            assert kwargs.get(name) == expected.get(name)
+
+
+class TestGmailCredentialsCache:
+    """Tests for the mtime-keyed credentials cache in auth.gmail."""
+
+    @pytest.fixture
+    def token_path(self, tmp_path):
+        """Write a minimal authorized-user token file and point gmail at it."""
+        from courriel.auth import gmail
+
+        path = tmp_path / "gmail_token_personal.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "token": "access",
+                    "refresh_token": "refresh",
+                    "client_id": "gid",
+                    "client_secret": "secret",
+                }
+            )
+        )
+        gmail._CREDS_CACHE.clear()
+        with patch("courriel.auth.gmail.gmail_token_file", return_value=path):
+            yield path
+        gmail._CREDS_CACHE.clear()
+
+    def test_returns_same_credentials_until_file_changes(self, token_path):
+        """The token file is parsed once and reused while unchanged."""
+        import os
+
+        from courriel.auth import gmail
+
+        first = gmail._load_token("personal")
+        assert gmail._load_token("personal") is first
+
+        # Simulate another process rewriting the file
+        token_path.write_text(token_path.read_text().replace("access", "new"))
+        stat = token_path.stat()
+        os.utime(token_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        reloaded = gmail._load_token("personal")
+        assert reloaded is not first
+        assert reloaded.token == "new"
+
+    def test_save_token_writes_compact_private_file(self, token_path):
+        """Saved tokens are compact JSON, mode 600, with no tmp file left over."""
+        from courriel.auth import gmail
+
+        creds = gmail._load_token("personal")
+        gmail._save_token(creds, "personal")
+
+        text = token_path.read_text()
+        assert "\n" not in text and ": " not in text
+        assert json.loads(text)["refresh_token"] == "refresh"
+        assert token_path.stat().st_mode & 0o777 == 0o600
+        assert list(token_path.parent.glob("*.tmp")) == []
+
+    def test_is_authenticated_without_refresh(self, token_path):
+        """A stored refresh token is enough; no refresh request is made."""
+        from courriel.auth import gmail
+
+        with patch.object(gmail, "_REFRESH_REQUEST") as mock_request:
+            assert gmail.is_authenticated("gid", "secret", "personal") is True
+
+        mock_request.assert_not_called()
+
+
+class TestClientSecret:
+    """Tests for memoized client secret resolution."""
+
+    @pytest.fixture(autouse=True)
+    def clear_secret_cache(self):
+        """Reset the memoized secrets around each test."""
+        from courriel.auth import gmail
+
+        gmail._resolve_client_secret.cache_clear()
+        yield
+        gmail._resolve_client_secret.cache_clear()
+
+    def test_env_var_takes_precedence(self, monkeypatch):
+        """The environment secret wins over the inline config value."""
+        from courriel.auth import gmail
+
+        monkeypatch.setenv(gmail.CLIENT_SECRET_ENV, "from-env")
+        account = {"client_id": "gid", "client_secret": "inline"}
+
+        assert gmail.get_client_secret(account) == "from-env"
+
+    def test_env_var_read_once_per_client(self, monkeypatch):
+        """The resolved secret is memoized per client_id."""
+        from courriel.auth import gmail
+
+        monkeypatch.delenv(gmail.CLIENT_SECRET_ENV, raising=False)
+        account = {"client_id": "gid", "client_secret": "inline"}
+        assert gmail.get_client_secret(account) == "inline"
+
+        monkeypatch.setenv(gmail.CLIENT_SECRET_ENV, "from-env")
+        assert gmail.get_client_secret(account) == "inline"
+
+
+class TestProviderDispatch:
+    """Tests for the provider registry used by the public functions."""
+
+    def test_unsupported_provider(self):
+        """Unknown providers are reported without importing anything."""
+        result = auth.authenticate({"provider": "imap"}, "other")
+
+        assert result["error"] == "unsupported_provider"
+        assert auth.get_access_token({"provider": "imap"}, "other") is None
+        assert auth.is_authenticated({"provider": "imap"}, "other") is False
+
+    def test_missing_required_fields(self):
+        """Missing provider fields are listed in the error description."""
+        result = auth.authenticate({"provider": "ms365", "client_id": "c"}, "work")
+
+        assert result["error"] == "missing_config"
+        assert "'client_id' and 'tenant_id'" in result["error_description"]
+
+    def test_dispatches_with_secret(self):
+        """Gmail functions receive the resolved client secret positionally."""
+        account = {"provider": "gmail", "client_id": "gid", "client_secret": "s"}
+        with (
+            patch("courriel.auth.gmail.get_client_secret", return_value="s"),
+            patch(
+                "courriel.auth.gmail.is_authenticated", return_value=True
+            ) as mock_is_auth,
+        ):
+            assert auth.is_authenticated(account, "personal") is True
+
+        mock_is_auth.assert_called_once_with("gid", "s", "personal")
+
+
+class TestMs365IsAuthenticated:
+    """Tests for the offline MS365 is_authenticated() check."""
+
+    def _cache(self, expires_on: float, with_refresh_token: bool):
+        """Build a token cache holding one account's tokens."""
+        import msal
+
+        from courriel.auth import ms365
+
+        data = {
+            "AccessToken": {
+                "at": {
+                    "credential_type": "AccessToken",
+                    "client_id": "cid",
+                    "home_account_id": "uid.tid",
+                    "secret": "tok",
+                    "expires_on": str(int(expires_on)),
+                }
+            }
+        }
+        if with_refresh_token:
+            data["RefreshToken"] = {
+                "rt": {
+                    "credential_type": "RefreshToken",
+                    "client_id": "cid",
+                    "home_account_id": "uid.tid",
+                    "secret": "refresh",
+                }
+            }
+        cache = msal.SerializableTokenCache()
+        ms365._deserialize(cache, json.dumps(data).encode())
+        return cache
+
+    def _check(self, cache) -> bool:
+        """Run is_authenticated() against cache, checking no app is built."""
+        from courriel.auth import ms365
+
+        with (
+            patch("courriel.auth.ms365._load_token_cache", return_value=cache),
+            patch("courriel.auth.ms365._build_msal_app") as mock_build,
+        ):
+            result = ms365.is_authenticated("cid", "tid", "work")
+
+        mock_build.assert_not_called()
+        return result
+
+    def test_unexpired_access_token(self):
+        """An unexpired cached access token means authenticated."""
+        assert self._check(self._cache(time.time() + 3600, False)) is True
+
+    def test_expired_token_with_refresh_token(self):
+        """An expired access token is fine if a refresh token is cached."""
+        assert self._check(self._cache(time.time() - 60, True)) is True
+
+    def test_expired_token_without_refresh_token(self):
+        """Nothing usable in the cache means not authenticated."""
+        assert self._check(self._cache(time.time() - 60, False)) is False
+
+    def test_tokens_of_other_client(self):
+        """Tokens issued to a different client ID don't count."""
+        from courriel.auth import ms365
+
+        cache = self._cache(time.time() + 3600, True)
+        with patch("courriel.auth.ms365._load_token_cache", return_value=cache):
+            assert ms365.is_authenticated("other", "tid", "work") is False
@@ -0,0 +1,56 @@
+"""Tests for the top-level CLI startup hook."""
+
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from courriel.cli.main import app
+
+
+@pytest.fixture
+def runner() -> CliRunner:
+    """Create a CLI runner for testing."""
+    return CliRunner()
+
+
+class TestStartup:
+    """Tests for the credential migration run before each command."""
+
+    def test_version_skips_startup(self, runner: CliRunner):
+        """version doesn't look for legacy credentials or load the config."""
+        with (
+            patch("courriel.cli.main.legacy_credentials_exist") as mock_exists,
+            patch("courriel.cli.main.load_config") as mock_load,
+        ):
+            result = runner.invoke(app, ["version"])
+
+        assert result.exit_code == 0
+        mock_exists.assert_not_called()
+        mock_load.assert_not_called()
+
+    def test_no_legacy_files_skips_config(self, runner: CliRunner):
+        """Without legacy files the config isn't parsed for migration."""
+        with (
+            patch("courriel.cli.main.legacy_credentials_exist", return_value=False),
+            patch("courriel.cli.main.load_config") as mock_load,
+            patch("courriel.cli.main.migrate_credential_files") as mock_migrate,
+            patch("courriel.cli.commands.config.load_config", return_value={}),
+        ):
+            runner.invoke(app, ["config", "show"])
+
+        mock_load.assert_not_called()
+        mock_migrate.assert_not_called()
+
+    def test_migrates_legacy_files(self, runner: CliRunner):
+        """Legacy files are migrated to the first configured account."""
+        config = {"accounts": {"personal": {}, "work": {}}}
+        with (
+            patch("courriel.cli.main.legacy_credentials_exist", return_value=True),
+            patch("courriel.cli.main.load_config", return_value=config),
+            patch("courriel.cli.main.migrate_credential_files") as mock_migrate,
+            patch("courriel.cli.commands.config.load_config", return_value=config),
+        ):
+            runner.invoke(app, ["config", "show"])
+
+        mock_migrate.assert_called_once_with(["personal", "work"])
@@ -0,0 +1,189 @@
+"""Tests for search CLI command.
+
+Uses typer.testing.CliRunner; notmuch is mocked via search_local.
+"""
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from courriel.cli.main import app
+from courriel.search import SearchResult
+
+
+@pytest.fixture
+def runner() -> CliRunner:
+    """Create a CLI runner for testing."""
+    return CliRunner()
+
+
+@pytest.fixture
+def mock_config(tmp_path):
+    """Configuration with two accounts whose mail dirs exist."""
+    (tmp_path / "personal").mkdir()
+    (tmp_path / "work").mkdir()
+    return {
+        "accounts": {
+            "personal": {"provider": "gmail", "mail_dir": str(tmp_path / "personal")},
+            "work": {"provider": "gmail", "mail_dir": str(tmp_path / "work")},
+        },
+    }
+
+
+def _result(msg_id: str, account: str, day: int) -> SearchResult:
+    """Build a search result dated January `day`, 2024."""
+    return SearchResult(
+        id=msg_id,
+        account=account,
+        file=f"/mail/{account}/{msg_id}",
+        date=datetime(2024, 1, day, tzinfo=timezone.utc),
+        from_addr="Alice <alice@example.com>",
+        subject=f"Subject {msg_id}",
+    )
+
+
+def _fake_search(query, mail_dir, account_name, limit, with_body=True):
+    """Return an iterator over two results per account, newest first."""
+    day = 10 if account_name == "personal" else 20
+    return iter(
+        [
+            _result(f"{account_name}-new", account_name, day + 1),
+            _result(f"{account_name}-old", account_name, day),
+        ]
+    )
+
+
+class TestSearchCommand:
+    """Tests for search command output."""
+
+    def test_json_output(self, runner: CliRunner, mock_config):
+        """JSON output is a single indented document."""
+        with (
+            patch("courriel.cli.commands.search.load_config", return_value=mock_config),
+            patch("courriel.search.search_local", side_effect=_fake_search),
+        ):
+            result = runner.invoke(app, ["search", "x", "--account", "personal"])
+
+        assert result.exit_code == 0
+        data = json.loads(result.output)
+        assert data["query"] == "x"
+        assert data["total"] == 2
+        assert result.output.startswith('{\n  "query"')
+
+    def test_ndjson_output(self, runner: CliRunner, mock_config):
+        """NDJSON output has one result object per line."""
+        with (
+            patch("courriel.cli.commands.search.load_config", return_value=mock_config),
+            patch("courriel.search.search_local", side_effect=_fake_search),
+        ):
+            result = runner.invoke(
+                app, ["search", "x", "--account", "personal", "--output", "ndjson"]
+            )
+
+        assert result.exit_code == 0
+        lines = result.output.splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [
+            "personal-new",
+            "personal-old",
+        ]
+
+    def test_rejects_unknown_output(self, runner: CliRunner):
+        """Unknown output formats are rejected."""
+        result = runner.invoke(app, ["search", "x", "--output", "xml"])
+
+        assert result.exit_code == 1
+        assert "Invalid output format" in result.output
+
+    def test_rejects_unknown_config_output(self, runner: CliRunner, mock_config):
+        """An unknown search_output default in config.toml is rejected."""
+        mock_config["defaults"] = {"search_output": "xml"}
+        with patch(
+            "courriel.cli.commands.search.load_config", return_value=mock_config
+        ):
+            result = runner.invoke(app, ["search", "x"])
+
+        assert result.exit_code == 1
+        assert "search_output" in result.output
+
+    def test_searches_all_accounts(self, runner: CliRunner, mock_config):
+        """Every account is searched and results are merged newest-first."""
+        with (
+            patch("courriel.cli.commands.search.load_config", return_value=mock_config),
+            patch("courriel.search.search_local", side_effect=_fake_search) as mock,
+        ):
+            result = runner.invoke(app, ["search", "x", "--output", "ndjson"])
+
+        assert result.exit_code == 0
+        assert mock.call_count == 2
+        ids = [json.loads(line)["id"] for line in result.output.splitlines()]
+        assert ids == ["work-new", "work-old", "personal-new", "personal-old"]
+
+    def test_limit_keeps_newest_across_accounts(self, runner: CliRunner, mock_config):
+        """--limit keeps the newest results overall, not the first account's."""
+        with (
+            patch("courriel.cli.commands.search.load_config", return_value=mock_config),
+            patch("courriel.search.search_local", side_effect=_fake_search),
+        ):
+            result = runner.invoke(
+                app, ["search", "x", "--output", "ndjson", "--limit", "2"]
+            )
+
+        ids = [json.loads(line)["id"] for line in result.output.splitlines()]
+        assert ids == ["work-new", "work-old"]
+
+    def test_notmuch_error_exits(self, runner: CliRunner, mock_config):
+        """A notmuch failure in any account aborts with an error."""
+        from courriel.search import NotmuchDatabaseError
+
+        with (
+            patch("courriel.cli.commands.search.load_config", return_value=mock_config),
+            patch(
+                "courriel.search.search_local",
+                side_effect=NotmuchDatabaseError("no database"),
+            ),
+        ):
+            result = runner.invoke(app, ["search", "x"])
+
+        assert result.exit_code == 1
+        assert "no database" in result.output
+
+    def test_summary_output(self, runner: CliRunner, mock_config):
+        """Summary output groups results by account with a blank line after each."""
+        with (
+            patch("courriel.cli.commands.search.load_config", return_value=mock_config),
+            patch("courriel.search.search_local", side_effect=_fake_search),
+        ):
+            result = runner.invoke(
+                app, ["search", "x", "--account", "personal", "--output", "summary"]
+            )
+
+        assert result.exit_code == 0
+        assert result.output.splitlines() == [
+            "personal: 2 results",
+            f"  2024-01-11 {'Alice <alice@example.com>':30} Subject personal-new",
+            f"  2024-01-10 {'Alice <alice@example.com>':30} Subject personal-old",
+            "",
+        ]
+
+    def test_file_output_skips_bodies(self, runner: CliRunner, mock_config):
+        """Formats without snippets ask search_local not to read bodies."""
+        with (
+            patch("courriel.cli.commands.search.load_config", return_value=mock_config),
+            patch("courriel.search.search_local", side_effect=_fake_search) as mock,
+        ):
+            runner.invoke(app, ["search", "x", "--output", "files"])
+            assert mock.call_args.kwargs["with_body"] is False
+
+            runner.invoke(app, ["search", "x", "--output", "ndjson"])
+            assert mock.call_args.kwargs["with_body"] is True
+
+    def test_help_skips_config(self, runner: CliRunner):
+        """search --help is answered without loading the config."""
+        with patch("courriel.cli.main.load_config") as mock_load:
+            result = runner.invoke(app, ["search", "--help"])
+
+        assert result.exit_code == 0
+        mock_load.assert_not_called()
@@ -349,3 +349,106 @@ class TestSyncCommand:
 
         assert result.exit_code != 0
         assert "Invalid date format" in result.output
+
+
+class TestProgressCallback:
+    """Tests for the sync progress display."""
+
+    def test_rate_limits_updates(self, capsys):
+        """Rapid updates are coalesced; the first and final ones always show."""
+        from courriel.cli.commands.sync import _create_progress_callback
+
+        callback, _ = _create_progress_callback()
+        with patch("courriel.cli.commands.sync.time.monotonic", return_value=100.0):
+            for current in range(1, 101):
+                callback("INBOX", current, 100)
+
+        output = capsys.readouterr().out
+        status = "  Syncing: INBOX 1/100 messages"
+        done = "INBOX: 100/100 messages - done"
+        assert output == f"{status}\r{done.ljust(len(status))}\n"
+
+    def test_rate_limits_interleaved_labels(self, capsys):
+        """Updates alternating between labels are coalesced too."""
+        from courriel.cli.commands.sync import _create_progress_callback
+
+        callback, _ = _create_progress_callback()
+        with patch("courriel.cli.commands.sync.time.monotonic", return_value=100.0):
+            for current in range(1, 51):
+                callback("INBOX", current, 50)
+                callback("SENT", current, 50)
+
+        status = "  Syncing: INBOX 1/50 messages"
+        sent = "  Syncing: SENT 49/50 messages"
+        assert capsys.readouterr().out == (
+            f"{status}\r"
+            f"{'INBOX: 50/50 messages - done'.ljust(len(status))}\n"
+            f"{sent}\r"
+            f"{'SENT: 50/50 messages - done'.ljust(len(sent))}\n"
+        )
+
+    def test_completed_labels_get_own_line(self, capsys):
+        """Each completed label is reported once, on its own line."""
+        from courriel.cli.commands.sync import _create_progress_callback
+
+        callback, _ = _create_progress_callback()
+        callback("INBOX", 1, 1)
+        callback("SENT", 1, 1)
+
+        assert capsys.readouterr().out == (
+            "INBOX: 1/1 messages - done\nSENT: 1/1 messages - done\n"
+        )
+
+    def test_concurrent_labels_share_status_line(self, capsys):
+        """Interleaved labels are shown together instead of switching back and forth."""
+        from courriel.cli.commands.sync import _create_progress_callback
+
+        callback, _ = _create_progress_callback()
+        with patch(
+            "courriel.cli.commands.sync.time.monotonic", side_effect=range(100, 200)
+        ):
+            callback("INBOX", 1, 2)
+            callback("SENT", 1, 3)
+            callback("INBOX", 2, 2)
+            callback("SENT", 2, 3)
+            callback("SENT", 3, 3)
+
+        both = "  Syncing: INBOX 1/2, SENT 1/3 messages"
+        sent = "  Syncing: SENT 2/3 messages"
+        assert capsys.readouterr().out == (
+            "  Syncing: INBOX 1/2 messages\r"
+            f"{both}\r"
+            f"{'INBOX: 2/2 messages - done'.ljust(len(both))}\n"
+            "  Syncing: SENT 1/3 messages\r"
+            f"{sent}\r"
+            f"{'SENT: 3/3 messages - done'.ljust(len(sent))}\n"
+        )
+
+
+class TestUpdateNotmuchIndex:
+    """Tests for the notmuch new run after a sync."""
+
+    def test_runs_notmuch_new(self):
+        """notmuch new is run once."""
+        from courriel.cli.commands.sync import _update_notmuch_index
+
+        with patch(
+            "courriel.cli.commands.sync.subprocess.run",
+            return_value=MagicMock(returncode=0, stderr=""),
+        ) as mock_run:
+            _update_notmuch_index()
+
+        mock_run.assert_called_once()
+        assert mock_run.call_args.args[0] == ["notmuch", "new"]
+
+    def test_missing_notmuch_only_warns(self, capsys):
+        """Without notmuch installed the sync still succeeds."""
+        from courriel.cli.commands.sync import _update_notmuch_index
+
+        with patch(
+            "courriel.cli.commands.sync.subprocess.run",
+            side_effect=FileNotFoundError,
+        ):
+            _update_notmuch_index()
+
+        assert "notmuch not found" in capsys.readouterr().err
@@ -0,0 +1,236 @@
+"""Tests for configuration loading and caching."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+import courriel.config as config_module
+from courriel.config import paths
+from courriel.config import (
+    get_account,
+    get_account_name,
+    get_account_names,
+    invalidate,
+    load_config,
+    save_config,
+    set_config_value,
+    split_config,
+)
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    """Point CONFIG_FILE at a temp file and start with an empty cache."""
+    path = tmp_path / "config.toml"
+    path.write_text("[defaults]\nmax_messages = 100\n")
+    invalidate()
+    with (
+        patch("courriel.config.CONFIG_FILE", path),
+        patch("courriel.config.ensure_config_dir"),
+    ):
+        yield path
+    invalidate()
+
+
+class TestLoadConfig:
+    """Tests for load_config() caching."""
+
+    def test_missing_file_returns_empty(self, tmp_path):
+        """A missing config file yields an empty dict."""
+        with patch("courriel.config.CONFIG_FILE", tmp_path / "missing.toml"):
+            assert load_config() == {}
+
+    def test_reuses_parsed_config(self, config_file):
+        """Unchanged files are parsed once."""
+        with patch(
+            "courriel.config.tomllib.loads", wraps=config_module.tomllib.loads
+        ) as mock_load:
+            first = load_config()
+            second = load_config()
+
+        assert first is second
+        mock_load.assert_called_once()
+
+    def test_reloads_when_file_changes(self, config_file):
+        """Edits to the file are picked up on the next call."""
+        assert load_config()["defaults"]["max_messages"] == 100
+
+        config_file.write_text("[defaults]\nmax_messages = 250\n")
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert load_config()["defaults"]["max_messages"] == 250
+
+    def test_save_invalidates_cache(self, config_file):
+        """The next load after a save returns what was saved."""
+        first = load_config()
+        config = {"defaults": {"max_messages": 5}}
+        save_config(config)
+
+        loaded = load_config()
+        assert loaded == config
+        assert loaded is not first
+
+    def test_set_config_value(self, config_file):
+        """set_config_value() writes through and converts known int fields."""
+        set_config_value("defaults.days", "7")
+
+        invalidate()
+        assert load_config()["defaults"] == {"max_messages": 100, "days": 7}
+
+    def test_set_bool_config_value(self, config_file):
+        """Known boolean fields accept true/false words and reject others."""
+        set_config_value("defaults.sync_fsync", "yes")
+
+        invalidate()
+        assert load_config()["defaults"]["sync_fsync"] is True
+        with pytest.raises(ValueError):
+            set_config_value("defaults.sync_fsync", "maybe")
+
+
+class TestGetAccount:
+    """Tests for the account lookup helpers."""
+
+    CONFIG = {"accounts": {"personal": {"provider": "gmail"}, "work": {}}}
+
+    def test_by_name_and_default(self):
+        """Accounts are found by name; no name means the first account."""
+        assert get_account(self.CONFIG, "work") == {}
+        assert get_account(self.CONFIG) == {"provider": "gmail"}
+        assert get_account(self.CONFIG, "missing") is None
+        assert get_account({}) is None
+
+    def test_resolves_name(self):
+        """An explicit name wins; otherwise the first account, then "default"."""
+        assert get_account_name(self.CONFIG, "work") == "work"
+        assert get_account_name(self.CONFIG) == "personal"
+        assert get_account_name({}) == "default"
+
+    def test_names_follow_config_order(self):
+        """Names are returned as a new list in config order."""
+        names = get_account_names(self.CONFIG)
+
+        assert names == ["personal", "work"]
+        names.append("other")
+        assert get_account_names(self.CONFIG) == ["personal", "work"]
+
+
+class TestSplitConfig:
+    """Tests for split_config()."""
+
+    def test_returns_tables(self):
+        """Defaults and accounts are returned as-is, missing ones empty."""
+        accounts = {"work": {"provider": "ms365"}}
+
+        assert split_config({"accounts": accounts}) == ({}, accounts)
+
+    def test_rejects_non_table(self):
+        """A scalar where a table is expected is reported clearly."""
+        with pytest.raises(ValueError, match="'accounts'"):
+            split_config({"accounts": "work"})
+
+
+class TestMigrateCredentialFiles:
+    """Tests for migrate_credential_files()."""
+
+    @pytest.fixture
+    def credentials_dir(self, tmp_path):
+        """Point the credential paths at a temp directory."""
+        with (
+            patch.object(paths, "CREDENTIALS_DIR", tmp_path),
+            patch.object(paths, "_LEGACY_GMAIL_TOKEN", tmp_path / "gmail_token.json"),
+            patch.object(paths, "_LEGACY_MS365_CACHE", tmp_path / "ms365_cache.json"),
+        ):
+            yield tmp_path
+
+    def test_moves_legacy_files(self, credentials_dir):
+        """Legacy files are renamed to the first account's names."""
+        (credentials_dir / "gmail_token.json").write_text("gmail")
+        (credentials_dir / "ms365_cache.json").write_text("ms365")
+
+        paths.migrate_credential_files(["personal", "work"])
+
+        assert not (credentials_dir / "gmail_token.json").exists()
+        assert (credentials_dir / "gmail_token_personal.json").read_text() == "gmail"
+        assert (credentials_dir / "ms365_cache_personal.json").read_text() == "ms365"
+        mode = (credentials_dir / "gmail_token_personal.json").stat().st_mode
+        assert mode & 0o777 == 0o600
+
+    def test_keeps_existing_account_file(self, credentials_dir):
+        """An existing per-account file is never overwritten."""
+        (credentials_dir / "gmail_token.json").write_text("legacy")
+        (credentials_dir / "gmail_token_personal.json").write_text("current")
+
+        paths.migrate_credential_files(["personal"])
+
+        assert (credentials_dir / "gmail_token_personal.json").read_text() == "current"
+
+    def test_removes_legacy_file_when_both_exist(self, credentials_dir):
+        """A legacy file left next to its migrated copy is cleaned up."""
+        (credentials_dir / "ms365_cache.json").write_text("cache")
+        (credentials_dir / "ms365_cache_personal.json").write_text("cache")
+
+        paths.migrate_credential_files(["personal"])
+
+        assert not (credentials_dir / "ms365_cache.json").exists()
+        assert (credentials_dir / "ms365_cache_personal.json").read_text() == "cache"
+        assert not paths.legacy_credentials_exist()
+
+
+class TestWritePrivateFile:
+    """Tests for write_private_file()."""
+
+    def test_writes_owner_only_file(self, tmp_path):
+        """The file gets the data, mode 600, and no temp file is left."""
+        target = tmp_path / "token.json"
+
+        paths.write_private_file(target, "secret")
+
+        assert target.read_text() == "secret"
+        assert target.stat().st_mode & 0o777 == 0o600
+        assert os.listdir(tmp_path) == ["token.json"]
+
+    def test_concurrent_writers_never_mix(self, tmp_path):
+        """Two writers racing on one file leave one payload whole."""
+        import threading
+
+        target = tmp_path / "token.json"
+        payloads = ["a" * 100_000, "b" * 50_000]
+        errors = []
+        # Hold both writers at fsync so their writes overlap
+        barrier = threading.Barrier(2, timeout=5)
+        real_fsync = os.fsync
+
+        def fsync(fd):
+            barrier.wait()
+            real_fsync(fd)
+
+        def write(data):
+            try:
+                paths.write_private_file(target, data)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(p,)) for p in payloads]
+        with patch("courriel.config.paths.os.fsync", side_effect=fsync):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert errors == []
+        assert target.read_text() in payloads
+        assert os.listdir(tmp_path) == ["token.json"]
+
+    def test_failed_write_removes_temp_file(self, tmp_path):
+        """A write that fails leaves the target untouched and no temp file."""
+        target = tmp_path / "token.json"
+        target.write_text("old")
+
+        with patch("courriel.config.paths.os.replace", side_effect=OSError):
+            with pytest.raises(OSError):
+                paths.write_private_file(target, "new")
+
+        assert target.read_text() == "old"
+        assert os.listdir(tmp_path) == ["token.json"]
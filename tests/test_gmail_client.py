@@ -29,10 +29,11 @@ def mock_service():
 @pytest.fixture
 def gmail_client(mock_credentials, mock_service):
     """Create a GmailClient with mocked service."""
+    # Kept patched for the whole test: worker threads build their own service
     with patch("courriel.sync.gmail.build") as mock_build:
         mock_build.return_value = mock_service
         client = GmailClient(mock_credentials)
-        return client
+        yield client
 
 
 class TestListLabels:
@@ -131,6 +132,25 @@ class TestListMessages:
         # Check that list was called with query parameter
         mock_service.users().messages().list.assert_called()
 
+    def test_pages_share_parameters(self, gmail_client, mock_service):
+        """Each page repeats the filters and adds the previous page's token."""
+        list_method = mock_service.users().messages().list
+        list_method.reset_mock()
+        list_method().execute.side_effect = [
+            {"messages": [{"id": "msg1"}], "nextPageToken": "page2"},
+            {"messages": [{"id": "msg2"}]},
+        ]
+
+        message_ids = gmail_client.list_messages(label_id="INBOX", query="q")
+
+        assert message_ids == ["msg1", "msg2"]
+        first, second = list_method.call_args_list[1:]
+        assert "pageToken" not in first.kwargs
+        assert second.kwargs["pageToken"] == "page2"
+        assert second.kwargs["labelIds"] == ["INBOX"]
+        assert second.kwargs["q"] == "q"
+        assert second.kwargs["fields"] == "messages/id,nextPageToken"
+
 
 class TestGetMessage:
     """Tests for get_message method."""
@@ -191,6 +211,203 @@ class TestGetMessage:
         assert result["raw"] == sample
 
 
+class TestGetMessages:
+    """Tests for get_messages method."""
+
+    @staticmethod
+    def _batch_returning(responses: dict):
+        """Fake new_batch_http_request() answering from a dict by request ID."""
+
+        def new_batch_http_request(callback):
+            batch = MagicMock()
+            ids = []
+            batch.add.side_effect = lambda request, request_id: ids.append(request_id)
+
+            def execute():
+                for request_id in ids:
+                    response = responses[request_id]
+                    if isinstance(response, Exception):
+                        callback(request_id, None, response)
+                    else:
+                        callback(request_id, response, None)
+
+            batch.execute.side_effect = execute
+            return batch
+
+        return new_batch_http_request
+
+    def test_yields_messages_in_order(self, gmail_client, mock_service):
+        """get_messages yields decoded messages in request order."""
+        responses = {
+            f"msg{i}": {
+                "id": f"msg{i}",
+                "threadId": "t",
+                "historyId": str(i),
+                "raw": base64.urlsafe_b64encode(f"body {i}".encode()).decode(),
+            }
+            for i in range(3)
+        }
+        mock_service.new_batch_http_request.side_effect = self._batch_returning(
+            responses
+        )
+
+        results = list(gmail_client.get_messages(["msg2", "msg0", "msg1"]))
+
+        assert [mid for mid, _ in results] == ["msg2", "msg0", "msg1"]
+        assert results[0][1]["raw"] == b"body 2"
+        get_kwargs = mock_service.users().messages().get.call_args.kwargs
+        assert get_kwargs["format"] == "raw"
+        assert get_kwargs["fields"] == "id,threadId,labelIds,historyId,raw"
+
+    def test_drops_encoded_payload(self, gmail_client, mock_service):
+        """The base64 payload isn't kept once the message is decoded."""
+        response = {
+            "id": "m1",
+            "threadId": "t",
+            "historyId": "1",
+            "raw": base64.urlsafe_b64encode(b"body").decode(),
+        }
+        mock_service.new_batch_http_request.side_effect = self._batch_returning(
+            {"m1": response}
+        )
+
+        results = dict(gmail_client.get_messages(["m1"]))
+
+        assert results["m1"]["raw"] == b"body"
+        assert "raw" not in response
+
+    def test_reports_per_message_errors(self, gmail_client, mock_service):
+        """A failed request is yielded as its exception; others still succeed."""
+        responses = {
+            "ok": {"id": "ok", "threadId": "t", "historyId": "1", "raw": ""},
+            "bad": ValueError("not found"),
+        }
+        mock_service.new_batch_http_request.side_effect = self._batch_returning(
+            responses
+        )
+
+        results = dict(gmail_client.get_messages(["ok", "bad"]))
+
+        assert results["ok"]["id"] == "ok"
+        assert isinstance(results["bad"], ValueError)
+
+    def test_splits_into_batches(self, gmail_client, mock_service):
+        """Large requests are split into several batch calls."""
+        ids = [f"m{i}" for i in range(120)]
+        responses = {
+            mid: {"id": mid, "threadId": "t", "historyId": "1", "raw": ""}
+            for mid in ids
+        }
+        mock_service.new_batch_http_request.side_effect = self._batch_returning(
+            responses
+        )
+
+        results = list(gmail_client.get_messages(ids))
+
+        assert len(results) == 120
+        assert mock_service.new_batch_http_request.call_count == 3
+
+    def test_pipelined_batches_keep_order(self, gmail_client, mock_service):
+        """With several batches in flight, results still come back in order."""
+        ids = [f"m{i}" for i in range(260)]
+        responses = {
+            mid: {"id": mid, "threadId": "t", "historyId": "1", "raw": ""}
+            for mid in ids
+        }
+        mock_service.new_batch_http_request.side_effect = self._batch_returning(
+            responses
+        )
+
+        results = list(gmail_client.get_messages(ids))
+
+        assert [mid for mid, _ in results] == ids
+        assert mock_service.new_batch_http_request.call_count == 6
+
+    def test_reuses_prefetch_threads(self, gmail_client, mock_service):
+        """Prefetch workers (and their connections) persist across calls."""
+        ids = [f"m{i}" for i in range(60)]
+        responses = {
+            mid: {"id": mid, "threadId": "t", "historyId": "1", "raw": ""}
+            for mid in ids
+        }
+        mock_service.new_batch_http_request.side_effect = self._batch_returning(
+            responses
+        )
+
+        list(gmail_client.get_messages(ids))
+        pool = gmail_client._prefetch_pool
+        list(gmail_client.get_messages(ids))
+
+        assert pool is not None
+        assert gmail_client._prefetch_pool is pool
+
+    def test_retries_rate_limited_requests(self, gmail_client, mock_service):
+        """Requests rejected with 429 are re-sent in a later batch."""
+        from courriel.sync.gmail import HttpError
+
+        rate_limited = HttpError(MagicMock(status=429), b"Too many requests")
+        ok = {"id": "m1", "threadId": "t", "historyId": "1", "raw": ""}
+        attempts = [{"m1": rate_limited}, {"m1": ok}]
+        mock_service.new_batch_http_request.side_effect = lambda callback: (
+            self._batch_returning(attempts.pop(0))(callback)
+        )
+
+        with patch("courriel.sync.gmail.time.sleep") as mock_sleep:
+            results = dict(gmail_client.get_messages(["m1"]))
+
+        assert results["m1"]["id"] == "m1"
+        mock_sleep.assert_called_once()
+
+    def test_retries_server_errors_only(self, gmail_client, mock_service):
+        """5xx failures are re-sent; other errors are reported right away."""
+        from courriel.sync.gmail import HttpError
+
+        unavailable = HttpError(MagicMock(status=503), b"Backend error")
+        not_found = HttpError(MagicMock(status=404), b"Not found")
+        ok = {"id": "m1", "threadId": "t", "historyId": "1", "raw": ""}
+        attempts = [{"m1": unavailable, "m2": not_found}, {"m1": ok}]
+        mock_service.new_batch_http_request.side_effect = lambda callback: (
+            self._batch_returning(attempts.pop(0))(callback)
+        )
+
+        with patch("courriel.sync.gmail.time.sleep"):
+            results = dict(gmail_client.get_messages(["m1", "m2"]))
+
+        assert results["m1"]["id"] == "m1"
+        assert results["m2"] is not_found
+        assert attempts == []
+
+
+class TestCreateDraft:
+    """Tests for create_draft method."""
+
+    def test_returns_draft_id(self, gmail_client, mock_service):
+        """The message is sent base64url-encoded and only the ID requested."""
+        mock_service.users().drafts().create().execute.return_value = {"id": "r1"}
+        mime = MagicMock()
+        mime.as_bytes.return_value = b"Subject: hi\r\n\r\nbody"
+
+        assert gmail_client.create_draft(mime) == "r1"
+
+        kwargs = mock_service.users().drafts().create.call_args.kwargs
+        assert kwargs["fields"] == "id"
+        raw = kwargs["body"]["message"]["raw"]
+        assert base64.urlsafe_b64decode(raw) == b"Subject: hi\r\n\r\nbody"
+
+
+class TestGetHistoryId:
+    """Tests for get_history_id method."""
+
+    def test_returns_profile_history_id(self, gmail_client, mock_service):
+        """The history ID comes from the profile, the only field requested."""
+        mock_service.users().getProfile().execute.return_value = {"historyId": 4321}
+
+        assert gmail_client.get_history_id() == "4321"
+
+        kwargs = mock_service.users().getProfile.call_args.kwargs
+        assert kwargs == {"userId": "me", "fields": "historyId"}
+
+
 class TestListHistory:
     """Tests for list_history method."""
 
@@ -298,13 +515,12 @@ class TestGetCredentials:
         with (
             patch("courriel.sync.gmail._load_token", return_value=mock_creds),
             patch("courriel.sync.gmail._save_token") as mock_save,
-            patch("courriel.sync.gmail.Request") as mock_request,
+            patch("courriel.sync.gmail._REFRESH_REQUEST") as mock_request,
         ):
             result = get_credentials("test")
 
-            # Should have called refresh with a Request object
-            mock_creds.refresh.assert_called_once()
-            mock_request.assert_called_once()
+            # Should have refreshed using the shared Request transport
+            mock_creds.refresh.assert_called_once_with(mock_request)
             # Should have saved the refreshed token with account name
             mock_save.assert_called_once_with(mock_creds, "test")
             assert result is mock_creds
@@ -330,7 +546,7 @@ class TestGetCredentials:
 
         with (
             patch("courriel.sync.gmail._load_token", return_value=mock_creds),
-            patch("courriel.sync.gmail.Request"),
+            patch("courriel.sync.gmail._REFRESH_REQUEST"),
         ):
             result = get_credentials("test")
 
@@ -3,23 +3,18 @@
 Tests the History API integration and sync mode selection.
 """
 
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from courriel.storage.maildir import MaildirStorage
-from courriel.sync.engine import SyncEngine
+from courriel.sync.engine import SyncEngine, SyncResult
 from courriel.sync.gmail import HttpError
 from courriel.sync.state import SyncState
 
 
-@pytest.fixture
-def gmail_client() -> MagicMock:
-    """Create a mock Gmail client."""
-    return MagicMock()
-
-
 @pytest.fixture
 def maildir(tmp_path: Path) -> MaildirStorage:
     """Create a real Maildir storage with tmp directory."""
@@ -184,6 +179,40 @@ class TestIncrementalSync:
         assert result.downloaded == 1
         assert gmail_client.get_message.call_count == 1
 
+    def test_lists_label_histories_concurrently(
+        self, engine: SyncEngine, gmail_client: MagicMock, tmp_path: Path
+    ):
+        """With max_workers, each label's history is listed and kept per label."""
+        histories = {
+            "INBOX": {
+                "history": [{"messagesAdded": [{"message": {"id": "msg1"}}]}],
+                "historyId": "101",
+            },
+            "SENT": {
+                "history": [{"messagesAdded": [{"message": {"id": "msg2"}}]}],
+                "historyId": "105",
+            },
+        }
+        with patch("courriel.sync.state.SYNC_STATE_DIR", tmp_path / "sync-state"):
+            engine._state.save("100", ["INBOX", "SENT"])
+
+            gmail_client.list_history.side_effect = lambda start_history_id, label_id: (
+                histories[label_id]
+            )
+            gmail_client.get_message.side_effect = lambda mid: {
+                "id": mid,
+                "labelIds": ["INBOX"],
+                "raw": b"Message",
+            }
+
+            result = engine.incremental_sync(["INBOX", "SENT"], max_workers=2)
+
+            assert engine._state.get_history_id("INBOX") == "101"
+            assert engine._state.get_history_id("SENT") == "105"
+
+        assert result.downloaded == 2
+        assert gmail_client.list_history.call_count == 2
+
     def test_falls_back_to_full_sync_on_404(
         self, engine: SyncEngine, gmail_client: MagicMock, tmp_path: Path
     ):
@@ -211,6 +240,25 @@ class TestIncrementalSync:
         gmail_client.list_messages.assert_called()
         assert result.downloaded == 1
 
+    def test_fallback_scans_maildir_once(
+        self, engine: SyncEngine, gmail_client: MagicMock, tmp_path: Path
+    ):
+        """The full sync fallback reuses the index scan already started."""
+        with (
+            patch("courriel.sync.state.SYNC_STATE_DIR", tmp_path / "sync-state"),
+            patch.object(engine._maildir, "load_index") as mock_load_index,
+        ):
+            engine._state.save("old_expired_id", ["INBOX"])
+            gmail_client.list_history.side_effect = HttpError(
+                MagicMock(status=404), b"Not Found"
+            )
+            gmail_client.list_messages.return_value = []
+
+            engine.incremental_sync(["INBOX"])
+            engine._index_scan.join()
+
+        mock_load_index.assert_called_once()
+
     def test_updates_history_id_after_sync(
         self, engine: SyncEngine, gmail_client: MagicMock, tmp_path: Path
     ):
@@ -328,3 +376,93 @@ class TestIncrementalSync:
         assert result.errors == 1
         assert "msg1" in result.error_details[0]
         assert "Network error" in result.error_details[0]
+
+    def test_full_syncs_labels_without_history_id(
+        self, engine: SyncEngine, gmail_client: MagicMock, tmp_path: Path
+    ):
+        """A label never synced before is listed in full; others use history."""
+        with patch("courriel.sync.state.SYNC_STATE_DIR", tmp_path / "sync-state"):
+            engine._state.save("100", ["INBOX"])
+
+            gmail_client.list_history.return_value = {
+                "history": [],
+                "historyId": "120",
+            }
+            gmail_client.list_messages.return_value = ["sent1"]
+            gmail_client.get_message.return_value = {
+                "id": "sent1",
+                "labelIds": ["SENT"],
+                "historyId": "110",
+                "raw": b"Sent message",
+            }
+
+            result = engine.incremental_sync(["INBOX", "SENT"])
+
+            assert engine._state.get_history_id("INBOX") == "120"
+            # Resumes from the mailbox's history ID, not the message's
+            assert engine._state.get_history_id("SENT") == "1000"
+
+        gmail_client.list_history.assert_called_once()
+        assert gmail_client.list_messages.call_args.kwargs["label_id"] == "SENT"
+        assert result.downloaded == 1
+
+    def test_unsynced_labels_sync_concurrently(
+        self, engine: SyncEngine, gmail_client: MagicMock, tmp_path: Path
+    ):
+        """Labels needing a full sync are listed in parallel with max_workers."""
+        # Each label waits for the other, so a sequential loop would time out
+        barrier = threading.Barrier(2, timeout=5)
+
+        def sync_label(label, *args, **kwargs):
+            barrier.wait()
+            return SyncResult(downloaded=1)
+
+        with (
+            patch("courriel.sync.state.SYNC_STATE_DIR", tmp_path / "sync-state"),
+            patch.object(engine, "sync_label", side_effect=sync_label) as mock_sync,
+        ):
+            engine._state.save("100", ["INBOX"])
+            gmail_client.list_history.return_value = {
+                "history": [],
+                "historyId": "120",
+            }
+
+            result = engine.incremental_sync(["INBOX", "SENT", "DRAFT"], max_workers=2)
+
+            assert engine._state.get_history_id("DRAFT") == "1000"
+
+        assert sorted(c.args[0] for c in mock_sync.call_args_list) == [
+            "DRAFT",
+            "SENT",
+        ]
+        assert result.downloaded == 2
+
+    def test_old_label_resumes_without_expired_history(
+        self, engine: SyncEngine, gmail_client: MagicMock, tmp_path: Path
+    ):
+        """A label whose newest message is old doesn't 404 on the next run."""
+
+        def list_history(start_history_id, label_id=None):
+            # Gmail only keeps about a week of history
+            if int(start_history_id) < 900:
+                raise HttpError(MagicMock(status=404), b"Not Found")
+            return {"history": [], "historyId": "1010"}
+
+        gmail_client.list_history.side_effect = list_history
+        gmail_client.list_messages.return_value = ["old1"]
+        gmail_client.get_message.return_value = {
+            "id": "old1",
+            "labelIds": ["SENT"],
+            "historyId": "5",
+            "raw": b"Old message",
+        }
+
+        with patch("courriel.sync.state.SYNC_STATE_DIR", tmp_path / "sync-state"):
+            engine.full_sync(["SENT"])
+            gmail_client.list_messages.reset_mock()
+
+            engine.incremental_sync(["SENT"])
+
+            assert engine._state.get_history_id("SENT") == "1010"
+
+        gmail_client.list_messages.assert_not_called()
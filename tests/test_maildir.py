@@ -43,6 +43,17 @@ class TestEnsureFolder:
 
         assert (storage.base_path / "INBOX" / "cur").is_dir()
 
+    def test_creates_folder_once(self, storage: MaildirStorage):
+        """Writing many messages creates each folder only once."""
+        with patch.object(Path, "mkdir", autospec=True, wraps=Path.mkdir) as mkdir:
+            storage.write_message("INBOX", b"x", ["INBOX"], "msg0")
+            first_calls = mkdir.call_count
+            storage.write_message("INBOX", b"x", ["INBOX"], "msg1")
+            storage.write_message("INBOX", b"x", ["INBOX"], "msg2")
+
+        assert first_calls > 0
+        assert mkdir.call_count == first_calls
+
 
 class TestLabelToFolder:
     """Tests for label_to_folder method."""
@@ -101,6 +112,12 @@ class TestGetPrimaryFolder:
         labels = ["UNREAD", "STARRED"]
         assert storage.get_primary_folder(labels) == "Archive"
 
+    def test_label_order_matters(self, storage: MaildirStorage):
+        """Cached results distinguish label orders (first user label wins)."""
+        assert storage.get_primary_folder(["A", "B"]) == "Labels/A"
+        assert storage.get_primary_folder(["B", "A"]) == "Labels/B"
+        assert storage.get_primary_folder(["A", "B"]) == "Labels/A"
+
 
 class TestLabelsToFlags:
     """Tests for labels_to_flags method."""
@@ -166,6 +183,14 @@ class TestGenerateFilename:
 
         assert "testhost" in filename
 
+    def test_escapes_hostname(self, storage: MaildirStorage):
+        """Slashes and colons in the hostname are escaped per the Maildir spec."""
+        with patch("courriel.storage.maildir.socket.gethostname", return_value="a/b:c"):
+            storage2 = MaildirStorage(storage.base_path)
+            filename = storage2.generate_filename("msg1", "S")
+
+        assert filename.endswith(r".a\057b\072c:2,S")
+
     def test_empty_flags(self, storage: MaildirStorage):
         """Handles empty flags."""
         filename = storage.generate_filename("msg1", "")
@@ -211,6 +236,34 @@ class TestWriteMessage:
         tmp_files = list((storage.base_path / "INBOX" / "tmp").iterdir())
         assert len(tmp_files) == 0
 
+    def test_private_file_mode(self, storage: MaildirStorage):
+        """Messages are readable by the owner only."""
+        path = storage.write_message("INBOX", b"Test message", ["INBOX"], "msg1")
+
+        assert path.stat().st_mode & 0o777 == 0o600
+
+    def test_fsync_only_when_enabled(self, storage: MaildirStorage):
+        """Messages are fsynced only if the storage was created with fsync."""
+        durable = MaildirStorage(storage.base_path, fsync=True)
+
+        with patch("courriel.storage.maildir.os.fsync") as mock_fsync:
+            storage.write_message("INBOX", b"x", ["INBOX"], "msg1")
+            mock_fsync.assert_not_called()
+            durable.write_message("INBOX", b"x", ["INBOX"], "msg2")
+            mock_fsync.assert_called_once()
+
+    def test_never_overwrites_tmp_file(self, storage: MaildirStorage):
+        """An existing tmp/ file with the same name is left alone."""
+        folder = storage.ensure_folder("INBOX")
+        with patch("courriel.storage.maildir.time.time", return_value=1704067200):
+            filename = storage.generate_filename("msg1", "S")
+            (folder / "tmp" / filename).write_bytes(b"other delivery")
+
+            with pytest.raises(FileExistsError):
+                storage.write_message("INBOX", b"x", ["INBOX"], "msg1")
+
+        assert (folder / "tmp" / filename).read_bytes() == b"other delivery"
+
     def test_creates_folder_if_missing(self, storage: MaildirStorage):
         """write_message creates folder if it doesn't exist."""
         message = b"Test message"
@@ -261,6 +314,73 @@ class TestMessageExists:
         assert storage.message_exists("msgX") is False
 
 
+class TestIndexScan:
+    """Tests for which files the message index scan picks up."""
+
+    def test_collects_ids_from_all_folders(self, storage: MaildirStorage):
+        """IDs come from cur/ and new/ of every folder, not tmp/."""
+        storage.write_message("INBOX", b"a", ["INBOX"], "read1")
+        storage.write_message("INBOX", b"b", ["INBOX", "UNREAD"], "unread1")
+        storage.write_message("Labels/Work", b"c", ["Work"], "work1")
+        tmp_file = storage.base_path / "INBOX" / "tmp" / "123.msgX.host:2,S"
+        tmp_file.write_bytes(b"test")
+        fresh = MaildirStorage(storage.base_path)
+
+        assert all(fresh.message_exists(mid) for mid in ("read1", "unread1", "work1"))
+        assert fresh.message_exists("msgX") is False
+
+    def test_label_named_like_subdir(self, storage: MaildirStorage):
+        """A user label called "new" is still searched as a folder."""
+        storage.write_message("Labels/new", b"a", ["new"], "msg1")
+
+        assert MaildirStorage(storage.base_path).message_exists("msg1") is True
+
+    def test_missing_base_path(self, tmp_path: Path):
+        """A Maildir that doesn't exist yet holds no messages."""
+        storage = MaildirStorage(tmp_path / "missing")
+
+        assert storage.message_exists("msg1") is False
+
+
+class TestMessageIndex:
+    """Tests for the message ID index behind the lookups."""
+
+    def test_scans_once(self, storage: MaildirStorage):
+        """Repeated lookups reuse one scan; new writes are still seen."""
+        storage.write_message("INBOX", b"a", ["INBOX"], "msg1")
+
+        with patch.object(
+            storage, "_iter_message_entries", wraps=storage._iter_message_entries
+        ) as mock_scan:
+            assert storage.message_exists("msg1") is True
+            assert storage.message_exists("other") is False
+            storage.write_message("INBOX", b"b", ["INBOX"], "msg2")
+            assert storage.message_exists("msg2") is True
+
+        mock_scan.assert_called_once()
+
+    def test_load_index_scans_up_front(self, storage: MaildirStorage):
+        """After load_index(), lookups don't scan again."""
+        storage.write_message("INBOX", b"a", ["INBOX"], "msg1")
+        fresh = MaildirStorage(storage.base_path)
+        fresh.load_index()
+
+        with patch.object(fresh, "_iter_message_entries") as mock_scan:
+            assert fresh.message_exists("msg1") is True
+
+        mock_scan.assert_not_called()
+
+    def test_finds_renamed_message(self, storage: MaildirStorage):
+        """A message renamed after the scan (e.g. new flags) is found again."""
+        path = storage.write_message("INBOX", b"a", ["INBOX", "UNREAD"], "msg1")
+        assert storage.get_message_path("msg1") == path
+
+        renamed = path.parent.parent / "cur" / (path.name + "S")
+        path.rename(renamed)
+
+        assert storage.get_message_path("msg1") == renamed
+
+
 class TestGetMessagePath:
     """Tests for get_message_path method."""
 
@@ -4,6 +4,7 @@ Tests both the parsing module (courriel.read.read_message) and the CLI
 command (courriel read <path>).
 """
 
+import base64
 from pathlib import Path
 
 import pytest
@@ -139,7 +140,19 @@ class TestReadMessage:
         att = msg.attachments[0]
         assert att["filename"] == "report.pdf"
         assert att["content_type"] == "application/pdf"
-        assert att["size"] > 0
+        assert att["size"] == 17
+
+    def test_large_attachment_size(self, tmp_path: Path):
+        """Base64 attachment sizes match the decoded length exactly."""
+        data = bytes(range(256)) * 40 + b"x"
+        raw = MULTIPART_EMAIL.replace(
+            b"SlZCRVJpMHhMamNLJWVvZgo=\n", base64.encodebytes(data)
+        )
+        path = tmp_path / "large_msg"
+        path.write_bytes(raw)
+
+        msg = read_message(path)
+        assert msg.attachments[0]["size"] == len(data)
 
     def test_html_only_email(self, html_only_email_file: Path):
         msg = read_message(html_only_email_file)
@@ -153,10 +166,41 @@ class TestReadMessage:
         assert msg.date.month == 1
         assert msg.date.day == 15
 
+    def test_malformed_date_falls_back_to_epoch(self, tmp_path: Path):
+        """An unparseable Date header yields the Unix epoch."""
+        path = tmp_path / "bad_date"
+        path.write_bytes(PLAIN_EMAIL.replace(b"Mon, 15 Jan 2024", b"sometime"))
+
+        msg = read_message(path)
+        assert msg.date.year == 1970
+
     def test_file_not_found(self, tmp_path: Path):
         with pytest.raises(FileNotFoundError):
             read_message(tmp_path / "nonexistent")
 
+    def test_headers_only(self, multipart_email_file: Path):
+        """headers_only parses headers and leaves the body unread."""
+        msg = read_message(multipart_email_file, headers_only=True)
+        assert msg.from_addr == "Alice Smith <alice@example.com>"
+        assert msg.subject == "Multipart with attachment"
+        assert msg.message_id == "<multi789@example.com>"
+        assert msg.body_plain is None
+        assert msg.body_html is None
+        assert msg.attachments == []
+
+    def test_headers_only_across_chunks(self, tmp_path: Path):
+        """The header/body boundary is found when it straddles two reads."""
+        from courriel.read import _HEADER_CHUNK_SIZE
+
+        padding = "x" * (_HEADER_CHUNK_SIZE - len("X-Pad: \r\nSubject: Hi\r\n") - 1)
+        raw = f"X-Pad: {padding}\r\nSubject: Hi\r\n\r\nBody: not a header\r\n"
+        path = tmp_path / "crlf_msg"
+        path.write_bytes(raw.encode())
+
+        msg = read_message(path, headers_only=True)
+        assert msg.subject == "Hi"
+        assert msg.body_plain is None
+
     def test_to_dict(self, plain_email_file: Path):
         msg = read_message(plain_email_file)
         d = msg.to_dict()
@@ -205,11 +249,27 @@ class TestReadCLI:
         assert "Message-ID: <abc123@example.com>" in result.output
         assert "Hello Bob" in result.output
 
+    def test_raw_output_is_byte_exact(self, runner: CliRunner, tmp_path: Path):
+        """Raw output copies the file unchanged, even if it isn't valid UTF-8."""
+        message = PLAIN_EMAIL.replace(b"test message.", b"caf\xe9 au lait.")
+        path = tmp_path / "latin1"
+        path.write_bytes(message)
+
+        result = runner.invoke(app, ["read", "--output", "raw", str(path)])
+
+        assert result.exit_code == 0
+        assert result.stdout_bytes == message
+
     def test_file_not_found(self, runner: CliRunner):
         result = runner.invoke(app, ["read", "/nonexistent/path/to/email"])
         assert result.exit_code == 1
         assert "File not found" in result.output
 
+    def test_directory_is_not_a_file(self, runner: CliRunner, tmp_path: Path):
+        result = runner.invoke(app, ["read", str(tmp_path)])
+        assert result.exit_code == 1
+        assert "Not a file" in result.output
+
     def test_invalid_output_format(self, runner: CliRunner, plain_email_file: Path):
         result = runner.invoke(app, ["read", "--output", "csv", str(plain_email_file)])
         assert result.exit_code == 1
@@ -231,3 +291,49 @@ class TestReadCLI:
         assert result.exit_code == 0
         assert "report.pdf" in result.output
         assert "application/pdf" in result.output
+
+
+class TestStripHtml:
+    """Tests for the HTML-to-text fallback used by text output."""
+
+    def test_drops_style_and_script_blocks(self):
+        """Style and script contents never reach the output."""
+        from courriel.cli.commands.read import _strip_html
+
+        html = "<style>p {color: red}</style><SCRIPT>alert(1)</SCRIPT><p>Hello</p>"
+        assert _strip_html(html) == "Hello"
+
+    def test_block_tags_become_newlines(self):
+        """<br> and closing block tags break lines; blank runs collapse."""
+        from courriel.cli.commands.read import _strip_html
+
+        html = "<p>Hi<br/>there</p>\n\n\n\n<div>a</div><b>b</b>"
+        assert _strip_html(html) == "Hi\nthere\n\na\nb"
+
+    def test_decodes_entities(self):
+        """HTML entities are decoded in the text output."""
+        from courriel.cli.commands.read import _strip_html
+
+        assert _strip_html("<p>Tom &amp; Jerry&nbsp;&lt;3</p>") == "Tom & Jerry\xa0<3"
+
+
+class TestParseAddressList:
+    """Tests for splitting address headers."""
+
+    def test_quoted_comma_stays_one_address(self):
+        """A comma inside a quoted display name doesn't split the address."""
+        from courriel.read import _parse_address_list
+
+        header = '"Doe, Jane" <jane@example.com>, bob@example.com'
+        assert _parse_address_list(header) == [
+            '"Doe, Jane" <jane@example.com>',
+            "bob@example.com",
+        ]
+
+    def test_keeps_decoded_names(self):
+        """Non-ASCII names are kept readable and empty entries dropped."""
+        from courriel.read import _parse_address_list
+
+        header = "Zoé <zoe@example.com>,, undisclosed-recipients:;"
+        assert _parse_address_list(header) == ["Zoé <zoe@example.com>"]
+        assert _parse_address_list("") == []
@@ -0,0 +1,297 @@
+"""Tests for the notmuch search wrapper.
+
+subprocess.run is mocked, so notmuch doesn't need to be installed.
+"""
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from courriel.search import NotmuchError, search_local
+
+
+def _message(msg_id: str, day: int, replies: list | None = None) -> list:
+    """Build a notmuch show [message, replies] pair."""
+    message = {
+        "id": msg_id,
+        "filename": [f"/mail/personal/INBOX/cur/{msg_id}"],
+        "tags": ["inbox"],
+        "headers": {
+            "From": "Alice <alice@example.com>",
+            "To": "bob@example.com",
+            "Subject": f"Subject {msg_id}",
+            "Date": f"Mon, {day:02d} Jan 2024 10:00:00 +0000",
+        },
+        "body": [{"content-type": "text/plain", "content": f"Body of {msg_id}"}],
+    }
+    return [message, replies or []]
+
+
+def _completed(stdout) -> MagicMock:
+    """Fake CompletedProcess with JSON stdout."""
+    return MagicMock(returncode=0, stdout=json.dumps(stdout).encode(), stderr=b"")
+
+
+@pytest.fixture
+def notmuch():
+    """Patch subprocess.run and the availability check."""
+    with (
+        patch("courriel.search.local.check_notmuch_available"),
+        patch("courriel.search.local.subprocess.run") as mock_run,
+    ):
+        yield mock_run
+
+
+class TestSearchLocal:
+    """Tests for search_local()."""
+
+    def test_keeps_search_order(self, notmuch):
+        """Results follow the newest-first ID order, not show's thread order."""
+        threads = [
+            [_message("old", 1, replies=[_message("reply", 3)])],
+            [_message("new", 5)],
+        ]
+        notmuch.side_effect = [
+            _completed(["new", "reply", "old"]),
+            _completed(threads),
+        ]
+
+        results = list(search_local("x", Path("/mail/personal"), "personal"))
+
+        assert [r.id for r in results] == ["new", "reply", "old"]
+        assert results[0].file == "/mail/personal/INBOX/cur/new"
+        assert results[0].snippet == "Body of new"
+
+    def test_show_only_matched_messages(self, notmuch):
+        """notmuch show is asked for the matched messages, quoted by ID."""
+        notmuch.side_effect = [
+            _completed(["a@example.com"]),
+            _completed([[[None, [_message("a@example.com", 1)]]]]),
+        ]
+
+        results = list(search_local("x", Path("/mail/personal"), "personal"))
+
+        args = notmuch.call_args_list[1].args[0]
+        assert "--entire-thread=false" in args
+        assert args[-1] == 'id:"a@example.com"'
+        assert [r.id for r in results] == ["a@example.com"]
+
+    def test_without_body(self, notmuch):
+        """with_body=False asks notmuch not to output bodies."""
+        message, replies = _message("a", 1)
+        del message["body"]
+        notmuch.side_effect = [_completed(["a"]), _completed([[[message, replies]]])]
+
+        results = list(
+            search_local("x", Path("/mail/personal"), "personal", with_body=False)
+        )
+
+        assert "--body=false" in notmuch.call_args_list[1].args[0]
+        assert results[0].snippet == ""
+        assert results[0].attachments == []
+
+    def test_batches_large_result_sets(self, notmuch):
+        """IDs are split across several notmuch show calls."""
+        ids = [f"m{i}" for i in range(150)]
+        notmuch.side_effect = [
+            _completed(ids),
+            _completed([[_message(mid, 1)] for mid in ids[:100]]),
+            _completed([[_message(mid, 1)] for mid in ids[100:]]),
+        ]
+
+        results = list(search_local("x", Path("/mail/personal"), "personal", limit=150))
+
+        assert notmuch.call_count == 3
+        assert [r.id for r in results] == ids
+
+    def test_parses_dates(self, notmuch):
+        """Dates keep their offset; an unparseable Date doesn't fail the search."""
+        good, _ = _message("good", 15)
+        good["headers"]["Date"] = "Mon, 15 Jan 2024 10:00:00 -0500"
+        bad, _ = _message("bad", 1)
+        bad["headers"]["Date"] = "not a date"
+        notmuch.side_effect = [
+            _completed(["good", "bad"]),
+            _completed([[[good, []]], [[bad, []]]]),
+        ]
+
+        results = list(search_local("x", Path("/mail/personal"), "personal"))
+
+        assert results[0].date.isoformat() == "2024-01-15T10:00:00-05:00"
+        assert results[1].date is not None
+
+    def test_reads_utf8_bytes(self, notmuch):
+        """notmuch output is parsed as UTF-8 bytes."""
+        message, replies = _message("a", 1)
+        message["headers"]["Subject"] = "Café ☕"
+        notmuch.side_effect = [
+            _completed(["a"]),
+            MagicMock(
+                returncode=0,
+                stdout=json.dumps([[[message, replies]]], ensure_ascii=False).encode(),
+                stderr=b"",
+            ),
+        ]
+
+        results = list(search_local("x", Path("/mail/personal"), "personal"))
+
+        assert "text" not in notmuch.call_args_list[1].kwargs
+        assert results[0].subject == "Café ☕"
+
+    def test_no_matches_skips_show(self, notmuch):
+        """An empty search doesn't run notmuch show."""
+        notmuch.return_value = _completed([])
+
+        assert list(search_local("x", Path("/mail/personal"), "personal")) == []
+        notmuch.assert_called_once()
+
+    def test_show_failure_raises(self, notmuch):
+        """A failing notmuch show is reported as NotmuchError."""
+        notmuch.side_effect = [
+            _completed(["a"]),
+            MagicMock(returncode=1, stdout=b"", stderr=b"boom"),
+        ]
+
+        with pytest.raises(NotmuchError, match="boom"):
+            search_local("x", Path("/mail/personal"), "personal")
+
+
+class TestCheckNotmuchAvailable:
+    """Tests for check_notmuch_available()."""
+
+    @pytest.fixture(autouse=True)
+    def unchecked(self):
+        """Start each test as if notmuch hadn't been checked yet."""
+        with (
+            patch("courriel.search.local._notmuch_checked", False),
+            patch("courriel.search.local._notmuch_bin", "notmuch"),
+        ):
+            yield
+
+    def test_checks_once(self):
+        """After a successful check, notmuch isn't spawned again."""
+        from courriel.search.local import check_notmuch_available
+
+        with (
+            patch("courriel.search.local.shutil.which", return_value="/bin/notmuch"),
+            patch(
+                "courriel.search.local.subprocess.run",
+                return_value=MagicMock(returncode=0, stderr=""),
+            ) as mock_run,
+        ):
+            check_notmuch_available()
+            check_notmuch_available()
+
+        mock_run.assert_called_once()
+
+    def test_searches_with_resolved_path(self):
+        """Searches spawn the binary found by the check, not a bare name."""
+        with (
+            patch(
+                "courriel.search.local.shutil.which", return_value="/opt/bin/notmuch"
+            ) as mock_which,
+            patch(
+                "courriel.search.local.subprocess.run",
+                return_value=MagicMock(returncode=0, stdout=b"[]", stderr=""),
+            ) as mock_run,
+        ):
+            search_local("x", Path("/mail/personal"), "personal")
+            search_local("y", Path("/mail/personal"), "personal")
+
+        mock_which.assert_called_once()
+        assert all(c.args[0][0] == "/opt/bin/notmuch" for c in mock_run.call_args_list)
+
+    def test_failure_is_not_cached(self):
+        """A missing database is reported again on the next call."""
+        from courriel.search import NotmuchDatabaseError
+        from courriel.search.local import check_notmuch_available
+
+        with (
+            patch("courriel.search.local.shutil.which", return_value="/bin/notmuch"),
+            patch(
+                "courriel.search.local.subprocess.run",
+                return_value=MagicMock(returncode=1, stderr="No database found"),
+            ) as mock_run,
+        ):
+            for _ in range(2):
+                with pytest.raises(NotmuchDatabaseError):
+                    check_notmuch_available()
+
+        assert mock_run.call_count == 2
+
+
+class TestStripHtml:
+    """Tests for the HTML stripping used for snippets."""
+
+    def test_drops_hidden_blocks_and_decodes_entities(self):
+        """Script/style contents are dropped and all entities decoded."""
+        from courriel.search.local import _create_snippet, _strip_html
+
+        html = (
+            "<STYLE type='text/css'>p {}</style><p>Tom &amp; Jerry&nbsp;&lt;3"
+            " caf&eacute; &#8212;</p><script>alert(1)</SCRIPT >end"
+        )
+
+        assert _create_snippet(_strip_html(html)) == "Tom & Jerry <3 café — end"
+
+
+class TestCreateSnippet:
+    """Tests for snippet truncation."""
+
+    def test_long_text_matches_full_normalization(self):
+        """Normalizing only a prefix gives the same snippet as the whole text."""
+        from courriel.search.local import _create_snippet
+
+        texts = [
+            "word " * 100_000,
+            "\n" * 1000 + "late  start " * 50,
+            "x" * 5000,
+            "short\t text",
+        ]
+
+        for text in texts:
+            full = " ".join(text.split())
+            expected = _create_snippet(full)
+            assert _create_snippet(text) == expected
+
+
+class TestExtractBodyAndAttachments:
+    """Tests for snippet and attachment extraction from notmuch bodies."""
+
+    BODY = [
+        {
+            "content-type": "multipart/mixed",
+            "content": [
+                {
+                    "content-type": "multipart/alternative",
+                    "content": [
+                        {"content-type": "text/plain", "content": "Plain  text"},
+                        {"content-type": "text/html", "content": "<p>HTML</p>"},
+                    ],
+                },
+                {"content-type": "application/pdf", "filename": "a.pdf"},
+                {"content-type": "image/png", "filename": "b.png"},
+            ],
+        }
+    ]
+
+    def test_prefers_plain_text(self):
+        """Nested plain text wins and HTML is never stripped."""
+        from courriel.search.local import _extract_body_and_attachments
+
+        with patch("courriel.search.local._strip_html") as mock_strip:
+            snippet, attachments = _extract_body_and_attachments(self.BODY)
+
+        assert snippet == "Plain text"
+        assert attachments == ["a.pdf", "b.png"]
+        mock_strip.assert_not_called()
+
+    def test_falls_back_to_html(self):
+        """Without plain text, the stripped HTML is used."""
+        from courriel.search.local import _extract_body_and_attachments
+
+        body = [{"content-type": "text/html", "content": "<p>Only&nbsp;HTML</p>"}]
+
+        assert _extract_body_and_attachments(body) == ("Only HTML", [])
@@ -3,12 +3,14 @@
 Tests SyncState for state persistence and SyncEngine for full sync.
 """
 
+import os
 from datetime import date, datetime, timezone
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from courriel import fastjson
 from courriel.storage.maildir import MaildirStorage
 from courriel.sync.engine import SyncEngine, SyncResult
 from courriel.sync.state import SyncState
@@ -49,6 +51,48 @@ class TestSyncState:
         assert loaded["synced_labels"] == ["INBOX", "SENT"]
         assert "last_sync" in loaded
 
+    def test_save_replaces_file_atomically(self, state: SyncState, state_dir: Path):
+        """save() leaves only the owner-readable state file, no temp file."""
+        with patch("courriel.sync.state.SYNC_STATE_DIR", state_dir):
+            state.save("1", ["INBOX"])
+            state.save("2", ["INBOX"])
+
+        assert [p.name for p in state_dir.iterdir()] == ["test-account.json"]
+        assert state.state_file.stat().st_mode & 0o777 == 0o600
+
+    def test_creates_state_dir_once(self, state: SyncState, tmp_path: Path):
+        """Repeated saves create and chmod the state directory only once."""
+        state_dir = tmp_path / "new-state-dir"
+        with (
+            patch("courriel.sync.state.SYNC_STATE_DIR", state_dir),
+            patch.object(Path, "chmod", autospec=True, wraps=Path.chmod) as chmod,
+        ):
+            state.save("1", ["INBOX"])
+            state.save("2", ["INBOX"])
+
+        assert state_dir.is_dir()
+        assert chmod.call_count == 1
+
+    def test_load_reuses_unchanged_file(self, state: SyncState, state_dir: Path):
+        """load() parses the file again only after it changes on disk."""
+        with patch("courriel.sync.state.SYNC_STATE_DIR", state_dir):
+            state.save("1", ["INBOX"])
+
+            with patch(
+                "courriel.sync.state.fastjson.loads", wraps=fastjson.loads
+            ) as mock_loads:
+                assert state.load()["history_id"] == "1"
+            mock_loads.assert_not_called()
+
+            # Another process (here: instance) updates the file
+            SyncState("test-account").save("22", ["INBOX"])
+
+            with patch(
+                "courriel.sync.state.fastjson.loads", wraps=fastjson.loads
+            ) as mock_loads:
+                assert state.load()["history_id"] == "22"
+            mock_loads.assert_called_once()
+
     def test_get_history_id_returns_saved_value(
         self, state: SyncState, state_dir: Path
     ):
@@ -83,6 +127,28 @@ class TestSyncState:
         assert not state.state_file.exists()
         assert state.get_history_id() is None
 
+    def test_per_label_history_ids(self, state: SyncState, state_dir: Path):
+        """Each label resumes from its own ID; other labels' IDs are kept."""
+        with patch("courriel.sync.state.SYNC_STATE_DIR", state_dir):
+            state.save("200", ["INBOX", "SENT"], {"INBOX": "200", "SENT": "150"})
+            state.save("300", ["INBOX"], {"INBOX": "300"})
+
+            state2 = SyncState("test-account")
+
+            assert state2.get_history_id() == "300"
+            assert state2.get_history_id("INBOX") == "300"
+            assert state2.get_history_id("SENT") == "150"
+            assert state2.get_history_id("DRAFT") is None
+
+    def test_reads_state_without_label_ids(self, state: SyncState, state_dir: Path):
+        """Older state files apply history_id to each synced label."""
+        (state_dir / "test-account.json").write_text(
+            '{"history_id": "42", "synced_labels": ["INBOX"]}'
+        )
+
+        assert state.get_history_id("INBOX") == "42"
+        assert state.get_history_id("SENT") is None
+
     def test_handles_corrupted_state_file(self, state: SyncState, state_dir: Path):
         """load() handles corrupted state file gracefully."""
         with patch("courriel.sync.state.SYNC_STATE_DIR", state_dir):
@@ -120,12 +186,6 @@ class TestSyncResult:
 class TestSyncEngine:
     """Tests for SyncEngine class."""
 
-    @pytest.fixture
-    def gmail_client(self) -> MagicMock:
-        """Create a mock Gmail client."""
-        client = MagicMock()
-        return client
-
     @pytest.fixture
     def maildir(self, tmp_path: Path) -> MaildirStorage:
         """Create a real Maildir storage with tmp directory."""
@@ -225,7 +285,8 @@ class TestSyncEngine:
     def test_full_sync_saves_history_id(
         self, engine: SyncEngine, gmail_client: MagicMock, tmp_path: Path
     ):
-        """full_sync() saves highest historyId for incremental sync."""
+        """full_sync() saves the mailbox's historyId from before listing."""
+        gmail_client.get_history_id.return_value = "500"
         gmail_client.list_messages.return_value = ["msg1", "msg2"]
         gmail_client.get_message.side_effect = [
             {
@@ -245,8 +306,22 @@ class TestSyncEngine:
         with patch("courriel.sync.state.SYNC_STATE_DIR", tmp_path / "sync-state"):
             engine.full_sync(["INBOX"], max_messages=10)
             history_id = engine._state.get_history_id()
+            inbox_history_id = engine._state.get_history_id("INBOX")
+
+        assert history_id == "500"
+        assert inbox_history_id == "500"
+
+    def test_full_sync_saves_history_id_without_downloads(
+        self, engine: SyncEngine, gmail_client: MagicMock, tmp_path: Path
+    ):
+        """full_sync() saves state even when every message is already stored."""
+        gmail_client.list_messages.return_value = []
 
-        assert history_id == "200"
+        with patch("courriel.sync.state.SYNC_STATE_DIR", tmp_path / "sync-state"):
+            engine.full_sync(["INBOX"], max_messages=10)
+            history_id = engine._state.get_history_id("INBOX")
+
+        assert history_id == "1000"
 
     def test_full_sync_handles_api_errors(
         self, engine: SyncEngine, gmail_client: MagicMock
@@ -335,3 +410,67 @@ class TestSyncEngine:
         assert result.downloaded == 2
         assert maildir.message_exists("inbox1")
         assert maildir.message_exists("sent1")
+
+    def test_index_scan_error_reported_once(
+        self,
+        engine: SyncEngine,
+        gmail_client: MagicMock,
+        maildir: MaildirStorage,
+        tmp_path: Path,
+    ):
+        """An unreadable folder raises on the sync thread only, not the scan's."""
+        maildir.write_message("INBOX", b"Subject: a\r\n\r\nBody", ["INBOX"], "old")
+        locked = maildir.base_path / "INBOX" / "cur"
+        locked.chmod(0)
+        real_scandir = os.scandir
+
+        def scandir(path):
+            # Root can read the folder regardless of its mode
+            if Path(path) == locked:
+                raise PermissionError(13, "Permission denied", str(path))
+            return real_scandir(path)
+
+        gmail_client.list_messages.return_value = ["msg1"]
+        try:
+            with (
+                patch("courriel.sync.state.SYNC_STATE_DIR", tmp_path / "sync-state"),
+                patch("courriel.storage.maildir.os.scandir", side_effect=scandir),
+                # Prints "Exception in thread ..." for errors a thread leaks
+                patch("threading.excepthook") as mock_excepthook,
+            ):
+                with pytest.raises(PermissionError):
+                    engine.full_sync(["INBOX"], max_messages=10)
+                engine._index_scan.join()
+        finally:
+            locked.chmod(0o700)
+
+        mock_excepthook.assert_not_called()
+
+    def test_full_sync_concurrent_labels(
+        self,
+        engine: SyncEngine,
+        gmail_client: MagicMock,
+        maildir: MaildirStorage,
+        tmp_path: Path,
+    ):
+        """Labels synced concurrently download a shared message only once."""
+        listings = {"INBOX": ["shared", "inbox1"], None: ["shared", "all1"]}
+        gmail_client.list_messages.side_effect = lambda label_id, query, max_results: (
+            listings[label_id]
+        )
+        gmail_client.get_message.side_effect = lambda message_id: {
+            "id": message_id,
+            "labelIds": ["INBOX"],
+            "historyId": "100",
+            "raw": f"Subject: {message_id}\r\n\r\nBody".encode(),
+        }
+
+        with patch("courriel.sync.state.SYNC_STATE_DIR", tmp_path / "sync-state"):
+            result = engine.full_sync(["INBOX", "ALL"], max_messages=10, max_workers=2)
+            history_id = engine._state.get_history_id()
+
+        assert result.downloaded == 3
+        assert result.skipped == 1
+        assert gmail_client.get_message.call_count == 3
+        assert all(maildir.message_exists(mid) for mid in ("shared", "inbox1", "all1"))
+        assert history_id == "1000"